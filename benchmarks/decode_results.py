@@ -0,0 +1,91 @@
+"""
+Decoding throughput of search and results payloads: adaptix Retort
+(MostClient.retort) vs precompiled decoders (most.decoders), plain and
+with pause_gc=True as search(), list_audios() and fetch_results() use them.
+
+    python benchmarks/decode_results.py --objects 2000 --columns 10 --subcolumns 8
+"""
+import argparse
+import random
+import time
+from typing import List
+
+from most.api import MostClient
+from most.decoders import decode
+from most.types import Item, Result, StoredAudioData, StoredTextData
+
+
+def make_columns(columns: int, subcolumns: int) -> list:
+    return [{"name": "Колонка %d" % c,
+             "subcolumns": [{"name": "Подколонка %d" % s,
+                             "score": random.randint(0, 5),
+                             "description": "Оператор назвал своё имя и компанию"}
+                            for s in range(subcolumns)]}
+            for c in range(columns)]
+
+
+def make_search_payload(objects: int, columns: int, subcolumns: int) -> list:
+    return [{"id": "%024x" % i,
+             "url": "https://cdn.the-most.ai/audio/%024x.mp3" % i,
+             "data": {"manager": "Иван Иванов", "duration": 61.5, "client_phone": "+70000000000",
+                      "tags": "sales", "branch": random.randint(1, 50)},
+             "results": {"most-model": make_columns(columns, subcolumns)}}
+            for i in range(objects)]
+
+
+def make_result_payload(objects: int, columns: int, subcolumns: int) -> list:
+    return [{"id": "%024x" % i,
+             "text": "Здравствуйте, компания MOST, меня зовут Иван",
+             "url": "https://cdn.the-most.ai/audio/%024x.mp3" % i,
+             "results": make_columns(columns, subcolumns),
+             "created_at": 1700000000 + i,
+             "applied_at": "2024-01-01T10:00:00+00:00"}
+            for i in range(objects)]
+
+
+def make_items_payload(objects: int) -> list:
+    return [{"title": "Товар %d" % i, "pronunciation": "товар", "price": 1990,
+             "image_urls": ["https://cdn.the-most.ai/%d.png" % i],
+             "metadata": {"color": "red", "in_stock": True, "discount": None}, "id": "%024x" % i}
+            for i in range(objects)]
+
+
+def measure(decode, payload, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        decode(payload)
+        best = min(best, time.perf_counter() - started)
+    return len(payload) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--objects", type=int, default=2000)
+    parser.add_argument("--columns", type=int, default=10)
+    parser.add_argument("--subcolumns", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    retort = MostClient.retort
+    search_type = List[StoredAudioData | StoredTextData]
+    cases = [
+        ("search -> List[StoredAudioData]", make_search_payload(args.objects, args.columns, args.subcolumns),
+         lambda data: retort.load(data, search_type), search_type),
+        ("fetch_results -> Result", make_result_payload(args.objects, args.columns, args.subcolumns),
+         lambda data: retort.load(data, List[Result]), List[Result]),
+        ("catalog -> Item", make_items_payload(args.objects),
+         lambda data: [Item.from_dict(item) for item in data], List[Item]),
+    ]
+    print("%-34s %12s %12s %12s" % ("", "baseline", "decode()", "pause_gc"))
+    for name, payload, baseline, tp in cases:
+        assert baseline(payload) == decode(payload, tp)
+        before = measure(baseline, payload, args.repeat)
+        plain = measure(lambda data: decode(data, tp), payload, args.repeat)
+        paused = measure(lambda data: decode(data, tp, pause_gc=True), payload, args.repeat)
+        print("%-34s %12s %12s %12s  x%.1f / x%.1f" % (name, "{:,.0f}".format(before), "{:,.0f}".format(plain),
+                                                       "{:,.0f}".format(paused), plain / before, paused / before))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+HTTP/1.1 vs HTTP/2 fan-out of small requests through AsyncMostClient.
+
+Starts a local stub of the MOST API that speaks HTTP/1.1 and HTTP/2
+(prior knowledge, h2c), fires many concurrent get_tags calls and reports
+throughput and the number of sockets the client opened.
+
+    pip install most-client[http2]
+    python benchmarks/http2_fanout.py --requests 2000 --concurrency 200
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import h2.config
+import h2.connection
+import h2.events
+
+from most import AsyncMostClient, TransportConfig
+
+
+H2_PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+
+
+class StubServer(object):
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.connections = 0
+        self.requests = 0
+        self.server = None
+
+    def body(self, path: str) -> bytes:
+        self.requests += 1
+        if path.endswith("/access_token"):
+            return json.dumps("token").encode()
+        return json.dumps(["tag"]).encode()
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0, backlog=4096)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            head = await reader.readexactly(len(H2_PREFACE))
+            if head == H2_PREFACE:
+                await self.handle_h2(head, reader, writer)
+            else:
+                await self.handle_h1(head, reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_h1(self, buffer: bytes, reader, writer):
+        while True:
+            while b"\r\n\r\n" not in buffer:
+                chunk = await reader.read(65536)
+                if not chunk:
+                    return
+                buffer += chunk
+            head, buffer = buffer.split(b"\r\n\r\n", 1)
+            lines = head.decode("latin-1").split("\r\n")
+            path = lines[0].split(" ")[1]
+            headers = dict(line.lower().split(": ", 1) for line in lines[1:])
+            length = int(headers.get("content-length", 0))
+            while len(buffer) < length:
+                buffer += await reader.readexactly(length - len(buffer))
+            buffer = buffer[length:]
+
+            await asyncio.sleep(self.latency)
+            body = self.body(path)
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                         b"Content-Length: %d\r\n\r\n%s" % (len(body), body))
+            await writer.drain()
+
+    async def handle_h2(self, preface: bytes, reader, writer):
+        conn = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False,
+                                                                           header_encoding="utf-8"))
+        conn.initiate_connection()
+        paths = {}
+
+        async def respond(stream_id: int):
+            await asyncio.sleep(self.latency)
+            body = self.body(paths.pop(stream_id))
+            conn.send_headers(stream_id, [(":status", "200"),
+                                          ("content-type", "application/json"),
+                                          ("content-length", str(len(body)))])
+            conn.send_data(stream_id, body, end_stream=True)
+            writer.write(conn.data_to_send())
+
+        data = preface
+        while data:
+            for event in conn.receive_data(data):
+                if isinstance(event, h2.events.RequestReceived):
+                    paths[event.stream_id] = dict(event.headers)[":path"]
+                elif isinstance(event, h2.events.DataReceived):
+                    conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                elif isinstance(event, h2.events.StreamEnded):
+                    asyncio.create_task(respond(event.stream_id))
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    return
+            writer.write(conn.data_to_send())
+            await writer.drain()
+            data = await reader.read(65536)
+
+
+async def run(http2: bool, requests: int, concurrency: int, latency: float) -> dict:
+    server = StubServer(latency)
+    port = await server.start()
+    client = AsyncMostClient(client_id="bench_client",
+                             client_secret="bench_secret",
+                             base_url="http://127.0.0.1:%d/api/external" % port,
+                             transport=TransportConfig(http2=http2, http1=not http2))
+    client.access_token = "token"
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def get_tags():
+        async with semaphore:
+            await client.get_tags("67239029570a08554fc1f5a6")
+
+    try:
+        started = time.perf_counter()
+        await asyncio.gather(*[get_tags() for _ in range(requests)])
+        elapsed = time.perf_counter() - started
+    finally:
+        await client.session.aclose()
+        await server.stop()
+    return {"protocol": "HTTP/2" if http2 else "HTTP/1.1",
+            "requests": requests,
+            "seconds": elapsed,
+            "rps": requests / elapsed,
+            "sockets": server.connections}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200,
+                        help="requests in flight at once")
+    parser.add_argument("--latency", type=float, default=0.01,
+                        help="simulated server latency per request, seconds")
+    args = parser.parse_args()
+
+    for http2 in (False, True):
+        result = asyncio.run(run(http2, args.requests, args.concurrency, args.latency))
+        print("{protocol:>8}: {requests} requests in {seconds:.2f}s, "
+              "{rps:,.0f} req/s, {sockets} sockets".format(**result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Cold-start cost of the package: wall time of a fresh interpreter running
+each statement, best of --repeat runs, minus the bare interpreter start.
+
+    python benchmarks/import_time.py --repeat 10
+    python benchmarks/import_time.py --top 15   # slowest modules by -X importtime
+"""
+import argparse
+import subprocess
+import sys
+import time
+
+STATEMENTS = [
+    "import most",
+    "from most import CommunicationRequest",
+    "from most import MostClient",
+    "from most import MostClient; MostClient.retort",
+    "from most import MostSearcher, SearchParams",
+    "from most import Badge",
+]
+
+
+def run(statement: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def slowest_modules(statement: str, top: int):
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                          check=True, capture_output=True, text=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--top", type=int, default=0)
+    args = parser.parse_args()
+
+    baseline = run("pass", args.repeat)
+    print("interpreter start: %6.1f ms" % (baseline * 1000))
+    for statement in STATEMENTS:
+        print("%-48s %6.1f ms" % (statement, (run(statement, args.repeat) - baseline) * 1000))
+
+    if args.top:
+        for statement in ("import most", "from most import MostClient"):
+            print("\nslowest modules of %r:" % statement)
+            for cumulative, name in slowest_modules(statement, args.top):
+                print("  %8.1f ms  %s" % (cumulative / 1000, name))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Memory per scored call: slotted result types (most.types) vs the same
+dataclasses with a per-instance __dict__.
+
+    python benchmarks/memory_results.py --results 20000 --columns 10 --subcolumns 8
+"""
+import argparse
+import dataclasses
+import gc
+import tracemalloc
+from typing import List
+
+from most.types import ColumnResult, DialogSegment, Result, StoredAudioData, SubcolumnResult
+
+
+def with_dict(cls):
+    """
+    The same dataclass without __slots__, as the types were defined before.
+    """
+    fields = [(f.name, f.type, f) for f in dataclasses.fields(cls)]
+    return dataclasses.make_dataclass(cls.__name__, fields)
+
+
+def build(types, results: int, columns: int, subcolumns: int) -> List:
+    stored_cls, column_cls, subcolumn_cls, result_cls, segment_cls = types
+    stored = []
+    for i in range(results):
+        column_results = [column_cls(name="Колонка %d" % c,
+                                     subcolumns=[subcolumn_cls(name="Подколонка %d" % s,
+                                                               score=s % 5,
+                                                               description="")
+                                                 for s in range(subcolumns)])
+                          for c in range(columns)]
+        stored.append(stored_cls(id="%024x" % i,
+                                 url="https://cdn.the-most.ai/audio/%024x.mp3" % i,
+                                 data={"manager": "Иван Иванов", "duration": 61},
+                                 results={"most-model": column_results}))
+        stored.append(result_cls(id="%024x" % i, results=column_results))
+        stored.append([segment_cls(start_time_ms=t * 1000, end_time_ms=t * 1000 + 900,
+                                   text="Здравствуйте", speaker="Оператор")
+                       for t in range(20)])
+    return stored
+
+
+def measure(types, args) -> float:
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    data = build(types, args.results, args.columns, args.subcolumns)
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del data
+    return used / args.results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--results", type=int, default=20000)
+    parser.add_argument("--columns", type=int, default=10)
+    parser.add_argument("--subcolumns", type=int, default=8)
+    args = parser.parse_args()
+
+    slotted = (StoredAudioData, ColumnResult, SubcolumnResult, Result, DialogSegment)
+    before = measure(tuple(with_dict(cls) for cls in slotted), args)
+    after = measure(slotted, args)
+    print("per scored call (stored data + result + 20 dialog segments):")
+    print("  __dict__: %8.0f bytes" % before)
+    print("  slotted:  %8.0f bytes  (-%.0f%%)" % (after, 100 * (1 - after / before)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+ScoreCalculation.modify_many() (copy-on-write and in place) and
+modify_matrix() over --results results against the previous per-call
+implementation (mapping dict rebuilt on every call, subcolumns remapped
+in place).
+
+    python benchmarks/score_modification.py --results 50000 --columns 10 --subcolumns 5
+"""
+import argparse
+import copy
+import gc
+import random
+import time
+from dataclasses import replace
+
+from most.score_calculation import ScoreCalculation
+from most.types import ColumnResult, Result, ScriptScoreMapping, SubcolumnResult
+
+
+def previous_modify(calc: ScoreCalculation, result: Result) -> Result:
+    score_mapping = {
+        (sm.column, sm.subcolumn, sm.from_score): sm.to_score
+        for sm in calc.score_mapping
+    }
+    result = replace(result)
+    for column_result in result.results:
+        for subcolumn_result in column_result.subcolumns:
+            subcolumn_result.score = score_mapping.get((column_result.name,
+                                                        subcolumn_result.name,
+                                                        subcolumn_result.score),
+                                                       subcolumn_result.score)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--results", type=int, default=50000)
+    parser.add_argument("--columns", type=int, default=10)
+    parser.add_argument("--subcolumns", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    names = [("column-%d" % c, "subcolumn-%d" % s) for c in range(args.columns) for s in range(args.subcolumns)]
+    calc = ScoreCalculation(score_mapping=[ScriptScoreMapping(column=column, subcolumn=subcolumn,
+                                                              from_score=score, to_score=score * 20)
+                                           for column, subcolumn in names for score in range(6)])
+    results = [Result(id=str(i),
+                      results=[ColumnResult(name="column-%d" % c,
+                                            subcolumns=[SubcolumnResult(name="subcolumn-%d" % s,
+                                                                        score=rng.randint(0, 5))
+                                                        for s in range(args.subcolumns)])
+                               for c in range(args.columns)])
+               for i in range(args.results)]
+
+    copies = copy.deepcopy(results)
+    gc.collect()
+    gc.freeze()
+    start = time.perf_counter()
+    modified = []
+    for result in copies:
+        modified.append(previous_modify(calc, result))
+    print("per-call modify():        %.2fs" % (time.perf_counter() - start))
+
+    start = time.perf_counter()
+    modified = calc.modify_many(results)
+    print("modify_many():           %.2fs" % (time.perf_counter() - start))
+
+    copies = copy.deepcopy(results)
+    start = time.perf_counter()
+    modified = calc.modify_many(copies, copy=False)
+    print("modify_many(copy=False): %.2fs" % (time.perf_counter() - start))
+
+    matrix = [[subcolumn.score for column in result.results for subcolumn in column.subcolumns]
+              for result in results]
+    start = time.perf_counter()
+    calc.modify_matrix(names, matrix)
+    print("modify_matrix():         %.2fs" % (time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()
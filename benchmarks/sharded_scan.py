@@ -0,0 +1,76 @@
+"""
+Full export time with one sequential cursor (aiter_search) vs sharded
+concurrent cursors (ascan) against an in-process server that answers
+each search request after --latency seconds.
+
+    python benchmarks/sharded_scan.py --objects 20000 --page-size 100 --latency 0.05 --shards 1 4 8 16
+"""
+import argparse
+import asyncio
+import json
+import operator
+import time
+
+import httpx
+
+from most.async_api import AsyncMostClient
+from most.async_searcher import AsyncMostSearcher
+
+OPERATORS = {"greater_than": operator.gt, "not_less_than": operator.ge, "less_than": operator.lt}
+
+
+def make_searcher(ids, latency: float) -> AsyncMostSearcher:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        filter = json.loads(request.url.params["filter"])
+        limit = int(request.url.params["limit"])
+        bounds = [(OPERATORS[key], value) for cond in filter["must"] if cond["type"] == "IDCondition"
+                  for key, value in cond.items() if key in OPERATORS and value is not None]
+        page = []
+        for i in ids:
+            if all(op(i, value) for op, value in bounds):
+                page.append({"id": i, "url": "https://cdn.test.ai/%s.mp3" % i})
+                if len(page) == limit:
+                    break
+        await asyncio.sleep(latency)
+        return httpx.Response(200, json=page)
+
+    client = AsyncMostClient(client_id="bench", client_secret="bench",
+                             base_url="https://api.test.ai/api/external",
+                             http_client=httpx.AsyncClient(base_url="https://api.test.ai/api/external",
+                                                           transport=httpx.MockTransport(handler)))
+    client.access_token = "bench"
+    return AsyncMostSearcher(client, "audio")
+
+
+async def export(searcher: AsyncMostSearcher, shards: int, page_size: int) -> int:
+    if shards == 1:
+        items = searcher.aiter_search(page_size=page_size, raw=True)
+    else:
+        items = searcher.ascan(shards=shards, page_size=page_size, raw=True)
+    return sum([1 async for _ in items])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--objects", type=int, default=20000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    # one object per minute over the last two weeks
+    started_at = int(time.time()) - 60 * args.objects
+    ids = ["%08x%016x" % (started_at + 60 * i, i) for i in range(args.objects)]
+    searcher = make_searcher(ids, args.latency)
+
+    for shards in args.shards:
+        started = time.perf_counter()
+        count = asyncio.run(export(searcher, shards, args.page_size))
+        elapsed = time.perf_counter() - started
+        assert count == len(ids), count
+        print("%2d shard(s): %6.2f s  %8.0f obj/s" % (shards, elapsed, count / elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,118 @@
-from .api import MostClient
-from .async_api import AsyncMostClient
-from .trainer_api import Trainer
-from .async_trainer_api import AsyncTrainer
-from .async_searcher import AsyncMostSearcher
-from .searcher import MostSearcher
-from .search_types import SearchParams, IDCondition, ChannelsCondition, DurationCondition, ResultsCondition, StoredInfoCondition, TagsCondition, URLCondition, ExistsResultsCondition, AggregatedResultsCondition
-from .glossary import Glossary
-from .async_glossary import AsyncGlossary
-from .catalog import Catalog
-from .async_catalog import AsyncCatalog
-from .async_teleprompter import AsyncTeleprompter
-from .teleprompter import Teleprompter
-from .badge import Badge
-from .async_badge import AsyncBadge
-from .types import (
-    GlossaryNGram,
-    Item,
-    UpdateResult,
-    CommunicationRequest,
-    CommunicationBatchRequest,
-    CommunicationBatchResponse,
-    CommunicationResponse,
-    CreateChainFromCommunicationsRequest,
-    CreateChainFromCommunicationsResponse,
-    DeleteChainResponse,
-    GetCommunicationMostIdResponse,
-    ProcessCommunicationByIdResponse,
-)
+"""
+Submodules are imported on first attribute access, so ``import most``
+does not pull in httpx, adaptix, pydub or cryptography until a client,
+searcher or badge is actually used.
+"""
+import importlib
+import importlib.util
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .api import MostClient
+    from .async_api import AsyncMostClient
+    from .trainer_api import Trainer
+    from .async_trainer_api import AsyncTrainer
+    from .async_searcher import AsyncMostSearcher
+    from .searcher import MostSearcher
+    from .search_types import SearchParams, IDCondition, ChannelsCondition, DurationCondition, ResultsCondition, StoredInfoCondition, TagsCondition, URLCondition, ExistsResultsCondition, AggregatedResultsCondition
+    from .glossary import Glossary
+    from .async_glossary import AsyncGlossary
+    from .catalog import Catalog
+    from .async_catalog import AsyncCatalog
+    from .async_teleprompter import AsyncTeleprompter
+    from .teleprompter import Teleprompter
+    from .badge import Badge
+    from .transport import RetryPolicy, TransportConfig
+    from .concurrency import AdaptiveConcurrencyLimiter
+    from .rate_limit import RateLimiter, TokenBucket
+    from .circuit_breaker import CircuitBreaker, CircuitOpenError
+    from .search_cache import SearchCache
+    from .model_cache import ModelMetadataCache
+    from .local_search import LocalFilter
+    from .score_matrix import ScoreMatrix
+    from .local_aggregation import GroupAggregate, LocalAggregator
+    from .async_badge import AsyncBadge
+    from .types import (
+        GlossaryNGram,
+        Item,
+        UpdateResult,
+        CommunicationRequest,
+        CommunicationBatchRequest,
+        CommunicationBatchResponse,
+        CommunicationResponse,
+        CreateChainFromCommunicationsRequest,
+        CreateChainFromCommunicationsResponse,
+        DeleteChainResponse,
+        GetCommunicationMostIdResponse,
+        ProcessCommunicationByIdResponse,
+    )
+
+_LAZY = {
+    "MostClient": ".api",
+    "AsyncMostClient": ".async_api",
+    "Trainer": ".trainer_api",
+    "AsyncTrainer": ".async_trainer_api",
+    "AsyncMostSearcher": ".async_searcher",
+    "MostSearcher": ".searcher",
+    "SearchParams": ".search_types",
+    "IDCondition": ".search_types",
+    "ChannelsCondition": ".search_types",
+    "DurationCondition": ".search_types",
+    "ResultsCondition": ".search_types",
+    "StoredInfoCondition": ".search_types",
+    "TagsCondition": ".search_types",
+    "URLCondition": ".search_types",
+    "ExistsResultsCondition": ".search_types",
+    "AggregatedResultsCondition": ".search_types",
+    "Glossary": ".glossary",
+    "AsyncGlossary": ".async_glossary",
+    "Catalog": ".catalog",
+    "AsyncCatalog": ".async_catalog",
+    "AsyncTeleprompter": ".async_teleprompter",
+    "Teleprompter": ".teleprompter",
+    "Badge": ".badge",
+    "RetryPolicy": ".transport",
+    "TransportConfig": ".transport",
+    "AdaptiveConcurrencyLimiter": ".concurrency",
+    "RateLimiter": ".rate_limit",
+    "TokenBucket": ".rate_limit",
+    "CircuitBreaker": ".circuit_breaker",
+    "CircuitOpenError": ".circuit_breaker",
+    "SearchCache": ".search_cache",
+    "ModelMetadataCache": ".model_cache",
+    "LocalFilter": ".local_search",
+    "ScoreMatrix": ".score_matrix",
+    "GroupAggregate": ".local_aggregation",
+    "LocalAggregator": ".local_aggregation",
+    "AsyncBadge": ".async_badge",
+    "GlossaryNGram": ".types",
+    "Item": ".types",
+    "UpdateResult": ".types",
+    "CommunicationRequest": ".types",
+    "CommunicationBatchRequest": ".types",
+    "CommunicationBatchResponse": ".types",
+    "CommunicationResponse": ".types",
+    "CreateChainFromCommunicationsRequest": ".types",
+    "CreateChainFromCommunicationsResponse": ".types",
+    "DeleteChainResponse": ".types",
+    "GetCommunicationMostIdResponse": ".types",
+    "ProcessCommunicationByIdResponse": ".types",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        # most.types, most.api, ... without importing them explicitly first
+        if not name.startswith("_") and importlib.util.find_spec("%s.%s" % (__name__, name)) is not None:
+            return importlib.import_module("%s.%s" % (__name__, name))
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
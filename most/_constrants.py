@@ -4,4 +4,11 @@ import httpx
 DEFAULT_TIMEOUT = httpx.Timeout(timeout=600.0, connect=5.0)
 DEFAULT_MAX_RETRIES = 2
 DEFAULT_RETRY_DELAY = 5
-DEFAULT_CONNECTION_LIMITS = httpx.Limits(max_connections=1000, max_keepalive_connections=100)
+DEFAULT_MAX_STATUS_RETRIES = 5
+DEFAULT_MAX_RETRY_DELAY = 60.0
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_CONNECTION_LIMITS = httpx.Limits(max_connections=1000,
+                                         max_keepalive_connections=100,
+                                         keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY)
+DEFAULT_TOKEN_RENEW_BEFORE = 120.0
+DEFAULT_TOKEN_MIN_VALIDITY = 30.0
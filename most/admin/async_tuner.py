@@ -1,6 +1,7 @@
 from typing import Literal
 
 from ..async_api import AsyncMostClient
+from ..json_backend import response_json
 
 
 class AsyncTuner(object):
@@ -26,7 +27,7 @@ class AsyncTuner(object):
         )
 
         resp.raise_for_status()
-        resp = resp.json()
+        resp = response_json(resp)
         return resp
 
     async def list_transcribers(self):
@@ -37,7 +38,7 @@ class AsyncTuner(object):
             }
         )
         resp.raise_for_status()
-        return resp.json()
+        return response_json(resp)
 
     async def list_llms(self):
         resp = await self.client.get(
@@ -47,7 +48,7 @@ class AsyncTuner(object):
             }
         )
         resp.raise_for_status()
-        return resp.json()
+        return response_json(resp)
 
     async def list_clients(self):
         resp = await self.client.get(
@@ -58,7 +59,7 @@ class AsyncTuner(object):
         )
         resp.raise_for_status()
         return [AsyncMostClient(**credentials)
-                for credentials in resp.json()]
+                for credentials in response_json(resp)]
 
     async def list_production_clients(self):
         resp = await self.client.get(
@@ -69,7 +70,7 @@ class AsyncTuner(object):
         )
         resp.raise_for_status()
         return [AsyncMostClient(**credentials)
-                for credentials in resp.json()]
+                for credentials in response_json(resp)]
 
     async def submit(self,
                      column: str,
@@ -93,7 +94,7 @@ class AsyncTuner(object):
         )
 
         resp.raise_for_status()
-        return resp.json()
+        return response_json(resp)
 
     async def clone_model(self,
                           model_name: str,
@@ -112,7 +113,7 @@ class AsyncTuner(object):
         )
 
         resp.raise_for_status()
-        resp = resp.json()
+        resp = response_json(resp)
         if "model" not in resp:
             raise Exception(f"Failed to clone model: {resp['message']}")
         return self.client.with_model(resp["model"])
@@ -126,7 +127,7 @@ class AsyncTuner(object):
         )
 
         resp.raise_for_status()
-        return resp.json()
+        return response_json(resp)
 
     async def get_cost(self, data_id: str,
                        data_source: Literal["text", "audio"] = "audio"):
@@ -136,4 +137,4 @@ class AsyncTuner(object):
                 "X-API-KEY": f"{self.username}:{self.password}"
             }
         )
-        return resp.json()
+        return response_json(resp)
@@ -1,6 +1,7 @@
 from typing import Literal
 
 from ..api import MostClient
+from ..json_backend import response_json
 
 
 class Tuner(object):
@@ -26,7 +27,7 @@ class Tuner(object):
         )
 
         resp.raise_for_status()
-        resp = resp.json()
+        resp = response_json(resp)
         return resp
 
     def list_transcribers(self):
@@ -37,7 +38,7 @@ class Tuner(object):
             }
         )
         resp.raise_for_status()
-        return resp.json()
+        return response_json(resp)
 
     def list_llms(self):
         resp = self.client.get(
@@ -47,7 +48,7 @@ class Tuner(object):
             }
         )
         resp.raise_for_status()
-        return resp.json()
+        return response_json(resp)
 
     def list_clients(self):
         resp = self.client.get(
@@ -58,7 +59,7 @@ class Tuner(object):
         )
         resp.raise_for_status()
         return [MostClient(**credentials)
-                for credentials in resp.json()]
+                for credentials in response_json(resp)]
 
     def list_production_clients(self):
         resp = self.client.get(
@@ -69,7 +70,7 @@ class Tuner(object):
         )
         resp.raise_for_status()
         return [MostClient(**credentials)
-                for credentials in resp.json()]
+                for credentials in response_json(resp)]
 
     def submit(self,
                column: str,
@@ -92,7 +93,7 @@ class Tuner(object):
         )
 
         resp.raise_for_status()
-        return resp.json()
+        return response_json(resp)
 
     def clone_model(self,
                     model_name: str,
@@ -111,7 +112,7 @@ class Tuner(object):
         )
 
         resp.raise_for_status()
-        resp = resp.json()
+        resp = response_json(resp)
         if "model" not in resp:
             raise Exception(f"Failed to clone model: {resp['message']}")
         return self.client.with_model(resp["model"])
@@ -125,7 +126,7 @@ class Tuner(object):
         )
 
         resp.raise_for_status()
-        return resp.json()
+        return response_json(resp)
 
     def get_cost(self, data_id: str,
                  data_source: Literal["text", "audio"] = "audio"):
@@ -135,4 +136,4 @@ class Tuner(object):
                 "X-API-KEY": f"{self.username}:{self.password}"
             }
         )
-        return resp.json()
+        return response_json(resp)
@@ -1,15 +1,23 @@
+import copy
 import io
 import os
+import time
 import uuid
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Literal, Any
-import json5
+from typing import TYPE_CHECKING, Dict, List, Optional, Union, Literal, Any
 import httpx
-from adaptix import Retort, loader
-from pydub import AudioSegment
-from most._constrants import DEFAULT_MAX_RETRIES, DEFAULT_RETRY_DELAY, DEFAULT_TIMEOUT
+from most._constrants import DEFAULT_CONNECTION_LIMITS, DEFAULT_MAX_RETRIES, DEFAULT_RETRY_DELAY, DEFAULT_TIMEOUT
+from most.auth import AccessToken
+from most.circuit_breaker import CircuitBreaker
+from most.decoders import LazyRetort, decode
+from most.json_backend import encode_json_body, response_json
+from most.model_cache import ModelMetadataCache
+from most.rate_limit import RateLimiter
 from most.score_calculation import ScoreCalculation
+from most.search_cache import SearchCache, invalidates_search_cache
+from most.transport import LazySession, RetryPolicy, TransportConfig, raise_for_api_error, raise_for_etl_error
 from most.types import (
     Audio,
     DialogResult,
@@ -26,15 +34,14 @@ from most.types import (
     DeleteChainResponse,
     GetCommunicationMostIdResponse,
 )
+from most.views import view
+
+if TYPE_CHECKING:
+    from pydub import AudioSegment
 
 
 class MostClient(object):
-    retort = Retort(recipe=[
-        loader(int, lambda x: x if isinstance(x, int) else int(x)),
-        loader(float, lambda x: x if isinstance(x, float) else float(x)),
-        loader(Union[str, int, float], lambda x: int(x) if isinstance(x, int) else float(x) if isinstance(x, float) else str(x)),
-        loader(datetime, lambda x: datetime.fromtimestamp(x).astimezone(tz=timezone.utc) if isinstance(x, (int, float)) else datetime.fromisoformat(x)),
-    ],)
+    retort = LazyRetort()
 
     def __init__(self,
                  client_id=None,
@@ -45,7 +52,16 @@ class MostClient(object):
                  etl_base_url: str | httpx.URL | None = None,
                  timeout: Union[float, httpx.Timeout] = DEFAULT_TIMEOUT,
                  max_retries: int = DEFAULT_MAX_RETRIES,
-                 # retry_delay: float = DEFAULT_RETRY_DELAY,
+                 limits: httpx.Limits = DEFAULT_CONNECTION_LIMITS,
+                 retry_delay: float = DEFAULT_RETRY_DELAY,
+                 http2: bool = False,
+                 transport: Optional[TransportConfig] = None,
+                 token_ttl: Optional[float] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 search_cache: Optional[SearchCache] = None,
+                 model_cache: Optional[ModelMetadataCache] = None,
+                 raw: bool = False,
                  http_client: httpx.Client | None = None):
         super(MostClient, self).__init__()
         self.client_id = client_id
@@ -61,8 +77,6 @@ class MostClient(object):
                 self.client_id = input("Please enter your client ID: ")
                 self.client_secret = input("Please enter your client secret: ")
                 self.save_credentials()
-        else:
-            self.save_credentials()
 
         if base_url is None:
             base_url = os.environ.get("MOST_BASE_URL")
@@ -74,24 +88,30 @@ class MostClient(object):
         if etl_base_url is None:
             etl_base_url = f"https://etl.the-most.ai"
 
+        self.base_url = base_url
         self.etl_base_url = etl_base_url
 
-        if http_client is None:
-            http_client = httpx.Client(base_url=base_url,
-                                       timeout=timeout,
-                                       follow_redirects=True,
-                                       transport=httpx.HTTPTransport(retries=max_retries))
-        # self.max_retries = max_retries
-        # self.retry_delay = retry_delay
-        self.session = http_client
-        self.access_token = None
+        if transport is None:
+            transport = TransportConfig(timeout=timeout,
+                                        limits=limits,
+                                        max_retries=max_retries,
+                                        retry=RetryPolicy(delay=retry_delay),
+                                        http2=http2)
+        self.transport = transport
+
+        self._session = LazySession(partial(self.transport.build_client, base_url),
+                                    session=http_client)
+        self._token = AccessToken(ttl=token_ttl)
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.search_cache = search_cache
+        self.model_cache = model_cache if model_cache is not None else ModelMetadataCache()
+        self.raw = raw
         self.model_id = model_id
         self.model_alias = None if self.model_id is None or is_valid_objectid(self.model_id[len("most-"):]) else self.model_id
         self.released = None
         self.score_modifier = None
 
-        self.refresh_access_token()
-
     @property
     def cache_path(self):
         path = Path.home() / ".most"
@@ -103,24 +123,28 @@ class MostClient(object):
         if not path.exists():
             return {}
         else:
+            import json5
             return json5.loads(path.read_text())
 
     def save_credentials(self):
+        import json5
         path = self.cache_path / "credentials.json"
         path.write_text(json5.dumps({
             "client_id": self.client_id,
             "client_secret": self.client_secret,
         }))
 
+    @property
+    def session(self) -> httpx.Client:
+        return self._session.get()
+
+    @session.setter
+    def session(self, session: httpx.Client):
+        self._session.set(session)
+
     def clone(self):
-        client = MostClient(client_id=self.client_id,
-                            client_secret=self.client_secret,
-                            model_id=self.model_id,
-                            etl_base_url=self.etl_base_url)
-        client.access_token = self.access_token
-        client.session = self.session
-        client.score_modifier = self.score_modifier
-        return client
+        # a shallow copy shares session, token and transport with the parent
+        return copy.copy(self)
 
     def with_model(self,
                    model_id: Optional[str] = None,
@@ -141,111 +165,150 @@ class MostClient(object):
         client.score_modifier = None
         return client
 
-    def refresh_access_token(self):
-        resp = self.session.post("/access_token",
-                                 json={"client_id": self.client_id,
-                                        "client_secret": self.client_secret},
-                                 timeout=None)
-        access_token = resp.json()
-        self.access_token = access_token
+    @property
+    def access_token(self) -> Optional[str]:
+        return self._token.value
 
-    def get(self, url, **kwargs):
-        if self.access_token is None:
+    @access_token.setter
+    def access_token(self, value: Optional[str]):
+        self._token.value = value
+
+    def refresh_access_token(self, stale_token: Optional[str] = None):
+        """
+        Refreshes the token shared with all clones. Pass the token a failed
+        request was sent with as stale_token: if another caller has already
+        replaced it, that new token is reused instead of fetching one more.
+        """
+        if stale_token is None:
+            stale_token = self.access_token
+        return self._token.refresh(self._fetch_access_token,
+                                   stale_token=stale_token)
+
+    def _fetch_access_token(self) -> str:
+        credentials = {"client_id": self.client_id,
+                       "client_secret": self.client_secret}
+        if self.circuit_breaker is None:
+            resp = self.session.post("/access_token", json=credentials, timeout=None)
+        else:
+            # a host that is down should not be hammered by token renewals either
+            with self.circuit_breaker.guard("/access_token", self.base_url) as call:
+                resp = self.session.post("/access_token", json=credentials, timeout=None)
+                call.record(resp)
+        return response_json(resp)
+
+    def request(self, method: str, url,
+                idempotent: Optional[bool] = None,
+                **kwargs) -> httpx.Response:
+        """
+        Sends an authorized request through the shared session.
+        A token close to expiry is renewed before the request goes out,
+        so bodies are not sent twice; on 401 the token is refreshed
+        and the request resent once. Throttled idempotent requests are
+        retried according to transport.retry; pass idempotent=True for
+        a POST that is safe to repeat.
+        Error statuses are returned as is, callers decide how to raise.
+        """
+        kwargs = encode_json_body(kwargs)
+        retry = self.transport.retry
+        resp = self._send_authorized(method, url, **kwargs)
+        attempt = 0
+        while retry.should_retry(method, resp, attempt, idempotent=idempotent):
+            time.sleep(retry.get_delay(attempt, resp))
+            attempt += 1
+            resp = self._send_authorized(method, url, **kwargs)
+        return resp
+
+    def _send_authorized(self, method: str, url, **kwargs) -> httpx.Response:
+        if self._token.needs_refresh():
             self.refresh_access_token()
-        headers = kwargs.pop("headers", {})
-        headers.update({"Authorization": "Bearer %s" % self.access_token})
-        resp = self.session.get(url,
-                                headers=headers,
-                                timeout=None,
-                                **kwargs)
+        elif self._token.should_renew():
+            self._token.renew_in_background(self.refresh_access_token)
+        headers = kwargs.pop("headers", None) or {}
+        access_token = self.access_token
+        resp = self._send(method, url,
+                          headers={**headers, "Authorization": "Bearer %s" % access_token},
+                          **kwargs)
         if resp.status_code == 401:
-            self.refresh_access_token()
-            return self.get(url,
-                            headers=headers,
-                            **kwargs)
-        if resp.status_code >= 400:
-            raise RuntimeError(resp.json()['message'] if resp.headers.get("Content-Type") == "application/json" else resp.content)
+            self.refresh_access_token(stale_token=access_token)
+            resp = self._send(method, url,
+                              headers={**headers, "Authorization": "Bearer %s" % self.access_token},
+                              **kwargs)
+        return resp
+
+    def _send(self, method: str, url, **kwargs) -> httpx.Response:
+        send = getattr(self.session, method.lower())
+        if self._session.built:
+            # a user-supplied http_client keeps its own timeout
+            kwargs.setdefault("timeout", self.transport.timeout)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(url)
+        if self.circuit_breaker is None:
+            return send(url, **kwargs)
+        with self.circuit_breaker.guard(url, self.base_url) as call:
+            resp = send(url, **kwargs)
+            call.record(resp)
+            return resp
+
+    def get(self, url, **kwargs):
+        resp = self.request("GET", url, **kwargs)
+        raise_for_api_error(resp, fallback=resp.content)
         return resp
 
     def put(self, url, **kwargs):
-        if self.access_token is None:
-            self.refresh_access_token()
-        headers = kwargs.pop("headers", {})
-        headers.update({"Authorization": "Bearer %s" % self.access_token})
-        resp = self.session.put(url,
-                                headers=headers,
-                                timeout=None,
-                                **kwargs)
-        if resp.status_code == 401:
-            self.refresh_access_token()
-            return self.put(url,
-                            headers=headers,
-                            **kwargs)
-        if resp.status_code >= 400:
-            raise RuntimeError(resp.json()['message'] if resp.headers.get("Content-Type") == "application/json" else resp.content)
+        resp = self.request("PUT", url, **kwargs)
+        raise_for_api_error(resp, fallback=resp.content)
         return resp
 
     def delete(self, url, **kwargs):
-        if self.access_token is None:
-            self.refresh_access_token()
-        headers = kwargs.pop("headers", {})
-        headers.update({"Authorization": "Bearer %s" % self.access_token})
-        resp = self.session.delete(url,
-                                   headers=headers,
-                                   timeout=None,
-                                   **kwargs)
-        if resp.status_code == 401:
-            self.refresh_access_token()
-            return self.delete(url,
-                               headers=headers,
-                               **kwargs)
-        if resp.status_code >= 400:
-            raise RuntimeError(resp.json()['message'] if resp.headers.get("Content-Type") == "application/json" else "Something went wrong.")
+        resp = self.request("DELETE", url, **kwargs)
+        raise_for_api_error(resp)
         return resp
 
     def post(self, url,
              data=None,
              json=None,
              **kwargs):
-        if self.access_token is None:
-            self.refresh_access_token()
-        headers = kwargs.pop("headers", {})
-        headers.update({"Authorization": "Bearer %s" % self.access_token})
-        headers.update(kwargs.get("headers", {}))
-        resp = self.session.post(url,
-                                 data=data,
-                                 json=json,
-                                 headers=headers,
-                                 timeout=None,
-                                 **kwargs)
-        if resp.status_code == 401:
-            self.refresh_access_token()
-            return self.post(url,
-                             data=data,
-                             json=json,
-                             headers=headers,
-                             **kwargs)
-        if resp.status_code >= 400:
-            raise RuntimeError(resp.json()['message'] if resp.headers.get("Content-Type") == "application/json" else "Something went wrong.")
+        resp = self.request("POST", url,
+                            data=data,
+                            json=json,
+                            **kwargs)
+        raise_for_api_error(resp)
         return resp
 
+    def load_response(self, resp: httpx.Response, tp, raw: Optional[bool] = None,
+                      pause_gc: bool = False):
+        """
+        Decodes the JSON body of resp into tp. With raw=True returns
+        a read-only lazy view instead (see most.views): fields are
+        decoded on access. raw=None falls back to the client's raw flag.
+        pause_gc is passed to decode() for bulk responses.
+        """
+        data = response_json(resp)
+        if self.raw if raw is None else raw:
+            return view(data, tp)
+        return decode(data, tp, pause_gc=pause_gc)
+
+    @invalidates_search_cache
     def upload_text(self, text: str) -> Text:
         resp = self.post(f"/{self.client_id}/upload_text",
                          json={"text": text})
-        return self.retort.load(resp.json(), Text)
+        return decode(response_json(resp), Text)
 
+    @invalidates_search_cache
     def upload_dialog(self, dialog: Dialog) -> Text:
         resp = self.post(f"/{self.client_id}/upload_dialog",
                          json={"dialog": dialog.to_dict()})
-        return self.retort.load(resp.json(), Text)
+        return decode(response_json(resp), Text)
 
+    @invalidates_search_cache
     def upload_audio(self, audio_path) -> Audio:
         with open(audio_path, 'rb') as f:
             resp = self.post(f"/{self.client_id}/upload",
                              files={"audio_file": f})
-        return self.retort.load(resp.json(), Audio)
+        return decode(response_json(resp), Audio)
 
-    def upload_audio_segment(self, audio: AudioSegment,
+    @invalidates_search_cache
+    def upload_audio_segment(self, audio: "AudioSegment",
                              audio_name: Optional[str] = None) -> Audio:
         f = io.BytesIO()
         audio.export(f, format="mp3")
@@ -254,83 +317,101 @@ class MostClient(object):
             audio_name = uuid.uuid4().hex + ".mp3"
         resp = self.post(f"/{self.client_id}/upload",
                          files={"audio_file": (audio_name, f, 'audio/mp3')})
-        return self.retort.load(resp.json(), Audio)
+        return decode(response_json(resp), Audio)
 
+    @invalidates_search_cache
     def upload_audio_url(self, audio_url) -> Audio:
         resp = self.post(f"/{self.client_id}/upload_url",
                          json={"audio_url": audio_url})
-        return self.retort.load(resp.json(), Audio)
+        return decode(response_json(resp), Audio)
 
+    @invalidates_search_cache
     def remove_tags(self, data_id, tags: Union[str, List[str]],
                     data_source: Literal["text", "audio"] = "audio"):
         if not isinstance(tags, list):
             tags = [tags]
         resp = self.delete(f"/{self.client_id}/{data_source}/{data_id}/tags",
                            params={"tags": tags})
-        return resp.json()
+        return response_json(resp)
 
+    @invalidates_search_cache
     def add_tags(self, data_id, tags: Union[str, List[str]],
                  data_source: Literal["text", "audio"] = "audio"):
         if not isinstance(tags, list):
             tags = [tags]
         resp = self.put(f"/{self.client_id}/{data_source}/{data_id}/tags",
                         params={"tags": tags})
-        return resp.json()
+        return response_json(resp)
 
     def get_tags(self, data_id,
                  data_source: Literal["text", "audio"] = "audio"):
         resp = self.get(f"/{self.client_id}/{data_source}/{data_id}/tags")
-        return resp.json()
+        return response_json(resp)
 
     def list_audios(self,
                     offset: int = 0,
                     limit: int = 10,
-                    query: Optional[Dict[str, str]] = None) -> List[Audio]:
+                    query: Optional[Dict[str, str]] = None,
+                    raw: Optional[bool] = None) -> List[Audio]:
         if query is None:
             query = {}
         resp = self.get(f"/{self.client_id}/list?offset={offset}&limit={limit}",
                         params=query)
-        audio_list = resp.json()
-        return self.retort.load(audio_list, List[Audio])
+        return self.load_response(resp, List[Audio], raw, pause_gc=True)
 
     def list_texts(self,
                    offset: int = 0,
-                   limit: int = 10) -> List[Text]:
+                   limit: int = 10,
+                   raw: Optional[bool] = None) -> List[Text]:
         resp = self.get(f"/{self.client_id}/list_texts?offset={offset}&limit={limit}")
-        texts_list = resp.json()
-        return self.retort.load(texts_list, List[Text])
+        return self.load_response(resp, List[Text], raw, pause_gc=True)
+
+    def _model_metadata(self, kind: str, model_id: Optional[str], url: str, load):
+        """
+        Model metadata through model_cache: served while fresh, then
+        revalidated by ETag.
+        """
+        key = (self.client_id, model_id, kind)
+        entry = self.model_cache.get(key)
+        if entry is not None and self.model_cache.is_fresh(entry):
+            return entry.value
+        resp = self.get(url, headers=self.model_cache.request_headers(entry))
+        if resp.status_code == 304 and entry is not None:
+            return self.model_cache.revalidated(key, entry)
+        return self.model_cache.put(key, load(response_json(resp)), resp.headers.get("ETag"))
 
     def get_model_info(self):
         if not is_valid_id(self.model_id):
             raise RuntimeError("Please choose valid model to apply. [try list_models()]")
 
-        resp = self.get(f"/{self.client_id}/model/{self.model_id}/info")
-        return self.retort.load(resp.json(), ModelInfo)
+        return self._model_metadata("info", self.model_id, f"/{self.client_id}/model/{self.model_id}/info",
+                                    lambda data: decode(data, ModelInfo))
 
     def get_model_script(self) -> Script:
         if not is_valid_id(self.model_id):
             raise RuntimeError("Please choose valid model to apply. [try list_models()]")
 
-        resp = self.get(f"/{self.client_id}/model/{self.model_id}/script")
-        return self.retort.load(resp.json(), Script)
+        return self._model_metadata("script", self.model_id, f"/{self.client_id}/model/{self.model_id}/script",
+                                    lambda data: decode(data, Script))
 
     def get_score_modifier(self):
         if self.score_modifier is None:
             if not is_valid_id(self.model_id):
                 raise RuntimeError("Please choose valid model to apply. [try list_models()]")
 
-            resp = self.get(f"/{self.client_id}/model/{self.model_id}/score_mapping")
-            score_mapping = self.retort.load(resp.json(), List[ScriptScoreMapping])
-            self.score_modifier = ScoreCalculation(score_mapping)
+            self.score_modifier = self._model_metadata(
+                "score_mapping", self.model_id, f"/{self.client_id}/model/{self.model_id}/score_mapping",
+                lambda data: ScoreCalculation(decode(data, List[ScriptScoreMapping])))
         return self.score_modifier
 
     def list_models(self):
-        resp = self.get("/list_models")
+        models = self._model_metadata("models", None, "/list_models", lambda data: data)
         return [self.with_model(model['model'],
                                 alias=model.get("alias"),
                                 released=model.get("released"))
-                for model in resp.json()]
+                for model in models]
 
+    @invalidates_search_cache
     def apply(self, audio_id,
               modify_scores: bool = False,
               overwrite: bool = False,
@@ -344,11 +425,12 @@ class MostClient(object):
         resp = self.post(f"/{self.client_id}/audio/{audio_id}/model/{self.model_id}/apply",
                          params={"overwrite": overwrite,
                                  "job_id": job_id})
-        result = self.retort.load(resp.json(), Result)
+        result = decode(response_json(resp), Result)
         if modify_scores:
             result = self.get_score_modifier().modify(result)
         return result
 
+    @invalidates_search_cache
     def apply_on_text(self, text_id,
                       modify_scores: bool = False,
                       overwrite: bool = False,
@@ -362,7 +444,7 @@ class MostClient(object):
         resp = self.post(f"/{self.client_id}/text/{text_id}/model/{self.model_id}/apply",
                          params={"overwrite": overwrite,
                                  "job_id": job_id})
-        result = self.retort.load(resp.json(), Result)
+        result = decode(response_json(resp), Result)
         if modify_scores:
             result = self.get_score_modifier().modify(result)
         return result
@@ -377,7 +459,7 @@ class MostClient(object):
 
         resp = self.post(f"/{self.client_id}/audio/{audio_id}/model/{self.model_id}/transcribe_async",
                          params={"overwrite": overwrite})
-        return self.retort.load(resp.json(), DialogResult)
+        return decode(response_json(resp), DialogResult)
 
     def apply_later(self, audio_id,
                     modify_scores: bool = False,
@@ -392,7 +474,7 @@ class MostClient(object):
         resp = self.post(f"/{self.client_id}/audio/{audio_id}/model/{self.model_id}/apply_async",
                          params={"overwrite": overwrite,
                                  "job_id": job_id})
-        result = self.retort.load(resp.json(), Result)
+        result = decode(response_json(resp), Result)
         if modify_scores:
             result = self.get_score_modifier().modify(result)
         return result
@@ -410,7 +492,7 @@ class MostClient(object):
         resp = self.post(f"/{self.client_id}/text/{text_id}/model/{self.model_id}/apply_async",
                          params={"overwrite": overwrite,
                                  "job_id": job_id})
-        result = self.retort.load(resp.json(), Result)
+        result = decode(response_json(resp), Result)
         if modify_scores:
             result = self.get_score_modifier().modify(result)
         return result
@@ -423,12 +505,14 @@ class MostClient(object):
         if not is_valid_id(data_id):
             raise RuntimeError("Please use valid data_id. [try audio.id / text.id from list_audios() / list_texts()]")
 
-        resp = self.post(f"/{self.client_id}/{data_source}/{data_id}/model/{self.model_id}/apply_status")
-        return self.retort.load(resp.json(), JobStatus)
+        resp = self.post(f"/{self.client_id}/{data_source}/{data_id}/model/{self.model_id}/apply_status",
+                         idempotent=True)
+        return decode(response_json(resp), JobStatus)
 
     def fetch_results(self, data_id,
                       modify_scores: bool = False,
-                      data_source: Literal["text", "audio"] = "audio") -> Result:
+                      data_source: Literal["text", "audio"] = "audio",
+                      raw: Optional[bool] = None) -> Result:
         if not is_valid_id(self.model_id):
             raise RuntimeError("Please choose valid model to apply. [try list_models()]")
 
@@ -436,11 +520,12 @@ class MostClient(object):
             raise RuntimeError("Please use valid data_id. [try audio.id / text.id from list_audios() / list_texts()]")
 
         resp = self.get(f"/{self.client_id}/{data_source}/{data_id}/model/{self.model_id}/results")
-        result = self.retort.load(resp.json(), Result)
-        if modify_scores:
-            result = self.get_score_modifier().modify(result)
-        return result
+        if not modify_scores:
+            return self.load_response(resp, Result, raw, pause_gc=True)
+        # modify() copies a decoded Result, views are read-only: raw is ignored here
+        return self.get_score_modifier().modify(decode(response_json(resp), Result, pause_gc=True))
 
+    @invalidates_search_cache
     def update_results(self, data_id, updates: List[UpdateResult],
                        scores_modified: bool = False,
                        data_source: Literal["text", "audio"] = "audio"):
@@ -456,14 +541,15 @@ class MostClient(object):
 
         resp = self.put(f"/{self.client_id}/{data_source}/{data_id}/model/{self.model_id}/results",
                         json={"updates": [update.to_dict() for update in updates]},)
-        result = self.retort.load(resp.json(), Result)
+        result = decode(response_json(resp), Result)
         if scores_modified:
             result = self.get_score_modifier().modify(result)
         return result
 
     def fetch_text(self, data_id: str,
                    data_source: Literal["text", "audio"] = "audio",
-                   transcribator_name: Optional[Literal["GroundTruth"]] = None) -> Result:
+                   transcribator_name: Optional[Literal["GroundTruth"]] = None,
+                   raw: Optional[bool] = None) -> Result:
 
         if not is_valid_id(data_id):
             raise RuntimeError("Please use valid data_id. [try audio.id / text.id from list_audios() / list_texts()]")
@@ -475,11 +561,12 @@ class MostClient(object):
                 raise RuntimeError("Please choose valid model to apply. [try list_models()]")
             resp = self.get(f"/{self.client_id}/{data_source}/{data_id}/model/{self.model_id}/text")
 
-        return self.retort.load(resp.json(), Result)
+        return self.load_response(resp, Result, raw)
 
     def fetch_dialog(self, data_id,
                      data_source: Literal["text", "audio"] = "audio",
-                     transcribator_name: Optional[Literal["GroundTruth"]] = None) -> DialogResult:
+                     transcribator_name: Optional[Literal["GroundTruth"]] = None,
+                     raw: Optional[bool] = None) -> DialogResult:
         if not is_valid_id(data_id):
             raise RuntimeError("Please use valid data_id. [try audio.id / text.id from list_audios() / list_texts()]")
 
@@ -490,8 +577,9 @@ class MostClient(object):
                 raise RuntimeError("Please choose valid model to apply. [try list_models()]")
             resp = self.get(f"/{self.client_id}/{data_source}/{data_id}/model/{self.model_id}/dialog")
 
-        return self.retort.load(resp.json(), DialogResult)
+        return self.load_response(resp, DialogResult, raw)
 
+    @invalidates_search_cache
     def update_dialog(self,
                       data_id,
                       dialog: Dialog,
@@ -515,7 +603,7 @@ class MostClient(object):
         resp = self.put(pathname,
                         json={"dialog": dialog.to_dict()})
 
-        return self.retort.load(resp.json(), DialogResult)
+        return decode(response_json(resp), DialogResult)
 
     def recreate_dialog_from_raw_text(self,
                                       text_id) -> DialogResult:
@@ -523,7 +611,7 @@ class MostClient(object):
             raise RuntimeError("Please use valid text_id. [try text.id from list_texts()]")
 
         resp = self.post(f"/{self.client_id}/text/{text_id}/restore_dialog_from_text")
-        return self.retort.load(resp.json(), DialogResult)
+        return decode(response_json(resp), DialogResult)
 
     def assign_text_speakers(self, text_id: str) -> Dict[str, str]:
         """
@@ -547,7 +635,7 @@ class MostClient(object):
         resp = self.post(
             f"/{self.client_id}/text/{text_id}/assign_speakers"
         )
-        return resp.json().get("speakers_mapping", {})
+        return response_json(resp).get("speakers_mapping", {})
 
     def export(self, audio_ids: List[str],
                aggregated_by: Optional[str] = None,
@@ -566,6 +654,7 @@ class MostClient(object):
                                 'modify_scores': modify_scores})
         return resp.url
 
+    @invalidates_search_cache
     def store_info(self,
                    audio_id: str,
                    data: Dict[str, Union[str, int, float]]) -> StoredAudioData:
@@ -576,8 +665,9 @@ class MostClient(object):
                          json={
                              "data": data,
                          })
-        return self.retort.load(resp.json(), StoredAudioData)
+        return decode(response_json(resp), StoredAudioData)
 
+    @invalidates_search_cache
     def store_text_info(self,
                         text_id: str,
                         data: Dict[str, Union[str, int, float]]) -> StoredTextData:
@@ -588,22 +678,22 @@ class MostClient(object):
                          json={
                              "data": data,
                          })
-        return self.retort.load(resp.json(), StoredTextData)
+        return decode(response_json(resp), StoredTextData)
 
-    def fetch_info(self, audio_id: str) -> StoredAudioData:
+    def fetch_info(self, audio_id: str, raw: Optional[bool] = None) -> StoredAudioData:
         if not is_valid_id(audio_id):
             raise RuntimeError("Please use valid audio_id. [try audio.id from list_audios()]")
 
         resp = self.get(f"/{self.client_id}/audio/{audio_id}/info")
-        return self.retort.load(resp.json(), StoredAudioData)
+        return self.load_response(resp, StoredAudioData, raw)
 
 
-    def fetch_text_info(self, text_id: str) -> StoredTextData:
+    def fetch_text_info(self, text_id: str, raw: Optional[bool] = None) -> StoredTextData:
         if not is_valid_id(text_id):
             raise RuntimeError("Please use valid text_id. [try text.id from list_texts()]")
 
         resp = self.get(f"/{self.client_id}/text/{text_id}/info")
-        return self.retort.load(resp.json(), StoredTextData)
+        return self.load_response(resp, StoredTextData, raw)
 
     def __call__(self, audio_path: Path,
                  modify_scores: bool = False) -> Result:
@@ -630,6 +720,7 @@ class MostClient(object):
         if resp.status_code >= 400:
             raise RuntimeError("Audio url is not accessable")
 
+        from pydub import AudioSegment
         audio = AudioSegment.from_file(io.BytesIO(resp.content),
                                        format=format)
         return audio
@@ -646,7 +737,7 @@ class MostClient(object):
                                 "limit": limit})
         if resp.status_code >= 400:
             raise RuntimeError("Audio can't be indexed")
-        return resp.json()
+        return response_json(resp)
 
     def get_usage(self,
                   start_dt: datetime,
@@ -655,7 +746,7 @@ class MostClient(object):
                         params={'start_dt': start_dt.astimezone(timezone.utc).isoformat(),
                                 'end_dt': end_dt.astimezone(timezone.utc).isoformat()})
         resp.raise_for_status()
-        return self.retort.load(resp.json(), Usage)
+        return decode(response_json(resp), Usage)
 
     def ask(self, question,
             audio_ids: List[str],
@@ -672,17 +763,19 @@ class MostClient(object):
                              "text_ids": text_ids,
                              "audio_ids": audio_ids,
                          })
-        return resp.json()
+        return response_json(resp)
 
+    @invalidates_search_cache
     def delete_audio(self, audio_id: str):
         resp = self.delete(f"/{self.client_id}/audio/{audio_id}/delete")
         resp.raise_for_status()
-        return resp.json()
+        return response_json(resp)
 
+    @invalidates_search_cache
     def delete_text(self, text_id: str):
         resp = self.delete(f"/{self.client_id}/text/{text_id}/delete")
         resp.raise_for_status()
-        return resp.json()
+        return response_json(resp)
 
     def anonymize(self, text: str) -> str:
         resp = self.post(f"https://api-anon.the-most.ai/anonymize",
@@ -690,7 +783,7 @@ class MostClient(object):
                              "text": text,
                          })
         resp.raise_for_status()
-        data = resp.json()
+        data = response_json(resp)
         if "text" not in data:
             raise RuntimeError("Anonymization failed")
         return data["text"]
@@ -711,14 +804,11 @@ class MostClient(object):
         Returns:
             CommunicationBatchResponse с результатами загрузки
         """
-        if self.access_token is None:
-            self.refresh_access_token()
-
         # Преобразуем словари в CommunicationRequest объекты, если нужно
         validated_communications: List[CommunicationRequest] = []
         for comm in communications:
             if isinstance(comm, dict):
-                validated_communications.append(self.retort.load(comm, CommunicationRequest))
+                validated_communications.append(decode(comm, CommunicationRequest))
             elif isinstance(comm, CommunicationRequest):
                 validated_communications.append(comm)
             else:
@@ -729,51 +819,14 @@ class MostClient(object):
             overwrite=overwrite
         )
 
-        headers = {"Authorization": f"Bearer {self.access_token}"}
         url = f"{self.etl_base_url}/api/v1/communications"
-        resp = self.session.post(
-            url,
-            json=request_data.to_dict(),
-            headers=headers,
-            timeout=None
-        )
-
-        if resp.status_code == 401:
-            self.refresh_access_token()
-            headers = {"Authorization": f"Bearer {self.access_token}"}
-            resp = self.session.post(
-                url,
-                json=request_data.to_dict(),
-                headers=headers,
-                timeout=None
-            )
-
-        if resp.status_code >= 400:
-            if resp.headers.get("Content-Type") == "application/json":
-                error_data = resp.json()
-                if "detail" in error_data:
-                    # ValidationError format
-                    detail = error_data["detail"]
-                    if isinstance(detail, list) and len(detail) > 0:
-                        error_msg = "; ".join([f"{err.get('loc', [])}: {err.get('msg', '')}" for err in detail])
-                    else:
-                        error_msg = str(detail)
-                    
-                    # Проверяем, является ли это ошибкой регистрации клиента
-                    error_msg_lower = error_msg.lower()
-                    if "не зарегистрирован" in error_msg_lower or "not registered" in error_msg_lower:
-                        raise RuntimeError(error_msg)
-                    else:
-                        raise RuntimeError(f"Validation error: {error_msg}")
-                elif "message" in error_data:
-                    raise RuntimeError(error_data["message"])
-                else:
-                    raise RuntimeError(f"Error: {error_data}")
-            else:
-                error_msg = resp.content.decode() if resp.content else "Something went wrong."
-                raise RuntimeError(error_msg)
+        # повторная отправка безопасна: дубликаты пропускаются / перезаписываются
+        resp = self.request("POST", url,
+                            json=request_data.to_dict(),
+                            idempotent=True)
+        raise_for_etl_error(resp, detail_prefix="Validation error: ")
 
-        return self.retort.load(resp.json(), CommunicationBatchResponse)
+        return decode(response_json(resp), CommunicationBatchResponse)
 
     def process_communication_by_id(
         self,
@@ -785,50 +838,14 @@ class MostClient(object):
         Перед отправкой на ETL проверяется принадлежность коммуникации клиенту
         через MOST API. Доп. аргументы попадают в call_info.
         """
-        if self.access_token is None:
-            self.refresh_access_token()
-
         body = {"most_communication_id": most_communication_id, **call_info}
 
-        headers = {"Authorization": f"Bearer {self.access_token}"}
         url = f"{self.etl_base_url}/api/v1/process_communication_by_id"
-        resp = self.session.post(url, json=body, headers=headers, timeout=None)
+        resp = self.request("POST", url, json=body)
+        raise_for_etl_error(resp)
 
-        if resp.status_code == 401:
-            self.refresh_access_token()
-            headers = {"Authorization": f"Bearer {self.access_token}"}
-            resp = self.session.post(url, json=body, headers=headers, timeout=None)
-
-        if resp.status_code >= 400:
-            if resp.headers.get("Content-Type") == "application/json":
-                try:
-                    error_data = resp.json()
-                    if "detail" in error_data:
-                        detail = error_data["detail"]
-                        if isinstance(detail, list) and len(detail) > 0:
-                            error_msg = "; ".join(
-                                [
-                                    f"{err.get('loc', [])}: {err.get('msg', '')}"
-                                    for err in detail
-                                ]
-                            )
-                        else:
-                            error_msg = str(detail)
-                        raise RuntimeError(error_msg)
-                    if "message" in error_data:
-                        raise RuntimeError(error_data["message"])
-                    raise RuntimeError(f"Error: {error_data}")
-                except RuntimeError:
-                    raise
-                except Exception:
-                    pass
-            error_msg = (
-                resp.content.decode() if resp.content else f"HTTP {resp.status_code}"
-            )
-            raise RuntimeError(error_msg)
-
-        data = resp.json()
-        return self.retort.load(data, ProcessCommunicationByIdResponse)
+        data = response_json(resp)
+        return decode(data, ProcessCommunicationByIdResponse)
 
     def create_chain_from_communications(
         self,
@@ -843,87 +860,25 @@ class MostClient(object):
         Идемпотентно: при том же наборе и порядке возвращает существующую цепочку.
         transcribe_sync=True — синхронная транскрибация (быстрее), False — асинхронная с опросом.
         """
-        if self.access_token is None:
-            self.refresh_access_token()
-
         body: Dict[str, Any] = {"most_communication_ids": most_communication_ids}
         if transcribe_sync is not None:
             body["transcribe_sync"] = transcribe_sync
-        headers = {"Authorization": f"Bearer {self.access_token}"}
         url = f"{self.etl_base_url}/api/v1/acreate_chain_from_communications"
-        resp = self.session.post(url, json=body, headers=headers, timeout=None)
+        resp = self.request("POST", url, json=body, idempotent=True)
+        raise_for_etl_error(resp)
 
-        if resp.status_code == 401:
-            self.refresh_access_token()
-            headers = {"Authorization": f"Bearer {self.access_token}"}
-            resp = self.session.post(url, json=body, headers=headers, timeout=None)
-
-        if resp.status_code >= 400:
-            if resp.headers.get("Content-Type") == "application/json":
-                try:
-                    error_data = resp.json()
-                    if "detail" in error_data:
-                        detail = error_data["detail"]
-                        if isinstance(detail, list) and len(detail) > 0:
-                            error_msg = "; ".join(
-                                [
-                                    f"{err.get('loc', [])}: {err.get('msg', '')}"
-                                    for err in detail
-                                ]
-                            )
-                        else:
-                            error_msg = str(detail)
-                        raise RuntimeError(error_msg)
-                    if "message" in error_data:
-                        raise RuntimeError(error_data["message"])
-                    raise RuntimeError(f"Error: {error_data}")
-                except RuntimeError:
-                    raise
-                except Exception:
-                    pass
-            error_msg = (
-                resp.content.decode() if resp.content else f"HTTP {resp.status_code}"
-            )
-            raise RuntimeError(error_msg)
-
-        return self.retort.load(resp.json(), CreateChainFromCommunicationsResponse)
+        return decode(response_json(resp), CreateChainFromCommunicationsResponse)
 
     def delete_chain(self, chain_id: int) -> DeleteChainResponse:
         """
         Удаляет цепочку: удаляет коммуникацию в MOST (если была загружена)
         и запись цепочки в БД ETL. 404 если цепочка не найдена или не принадлежит клиенту.
         """
-        if self.access_token is None:
-            self.refresh_access_token()
-
-        headers = {"Authorization": f"Bearer {self.access_token}"}
         url = f"{self.etl_base_url}/api/v1/chains/{chain_id}"
-        resp = self.session.delete(url, headers=headers, timeout=None)
-
-        if resp.status_code == 401:
-            self.refresh_access_token()
-            headers = {"Authorization": f"Bearer {self.access_token}"}
-            resp = self.session.delete(url, headers=headers, timeout=None)
+        resp = self.request("DELETE", url)
+        raise_for_etl_error(resp)
 
-        if resp.status_code >= 400:
-            if resp.headers.get("Content-Type") == "application/json":
-                try:
-                    error_data = resp.json()
-                    if "detail" in error_data:
-                        raise RuntimeError(str(error_data["detail"]))
-                    if "message" in error_data:
-                        raise RuntimeError(error_data["message"])
-                    raise RuntimeError(f"Error: {error_data}")
-                except RuntimeError:
-                    raise
-                except Exception:
-                    pass
-            error_msg = (
-                resp.content.decode() if resp.content else f"HTTP {resp.status_code}"
-            )
-            raise RuntimeError(error_msg)
-
-        return self.retort.load(resp.json(), DeleteChainResponse)
+        return decode(response_json(resp), DeleteChainResponse)
 
     def get_communication_most_id(
         self, communication_id: int
@@ -932,34 +887,8 @@ class MostClient(object):
         По внутреннему id коммуникации возвращает most_communication_id.
         Ошибка 404 если коммуникации нет или она не принадлежит клиенту.
         """
-        if self.access_token is None:
-            self.refresh_access_token()
-
-        headers = {"Authorization": f"Bearer {self.access_token}"}
         url = f"{self.etl_base_url}/api/v1/communications/{communication_id}/most_communication_id"
-        resp = self.session.get(url, headers=headers, timeout=None)
-
-        if resp.status_code == 401:
-            self.refresh_access_token()
-            headers = {"Authorization": f"Bearer {self.access_token}"}
-            resp = self.session.get(url, headers=headers, timeout=None)
-
-        if resp.status_code >= 400:
-            if resp.headers.get("Content-Type") == "application/json":
-                try:
-                    error_data = resp.json()
-                    if "detail" in error_data:
-                        raise RuntimeError(str(error_data["detail"]))
-                    if "message" in error_data:
-                        raise RuntimeError(error_data["message"])
-                    raise RuntimeError(f"Error: {error_data}")
-                except RuntimeError:
-                    raise
-                except Exception:
-                    pass
-            error_msg = (
-                resp.content.decode() if resp.content else f"HTTP {resp.status_code}"
-            )
-            raise RuntimeError(error_msg)
+        resp = self.request("GET", url)
+        raise_for_etl_error(resp)
 
-        return self.retort.load(resp.json(), GetCommunicationMostIdResponse)
+        return decode(response_json(resp), GetCommunicationMostIdResponse)
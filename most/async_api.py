@@ -1,15 +1,24 @@
+import asyncio
+import copy
 import io
 import os
 import uuid
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Literal
+from typing import TYPE_CHECKING, Dict, List, Optional, Union, Literal
 import httpx
-import json5
-from adaptix import Retort, loader
-from pydub import AudioSegment
-from most._constrants import DEFAULT_MAX_RETRIES, DEFAULT_TIMEOUT
+from most._constrants import DEFAULT_CONNECTION_LIMITS, DEFAULT_MAX_RETRIES, DEFAULT_RETRY_DELAY, DEFAULT_TIMEOUT
+from most.auth import AccessToken
+from most.circuit_breaker import CircuitBreaker
+from most.concurrency import AdaptiveConcurrencyLimiter
+from most.decoders import LazyRetort, decode
+from most.json_backend import encode_json_body, response_json
+from most.model_cache import ModelMetadataCache
+from most.rate_limit import RateLimiter
 from most.score_calculation import ScoreCalculation
+from most.search_cache import SearchCache, invalidates_search_cache
+from most.transport import LazySession, RetryPolicy, TransportConfig, raise_for_api_error
 from most.types import (
     Audio,
     DialogResult,
@@ -21,19 +30,14 @@ from most.types import (
     Text,
     is_valid_id, ScriptScoreMapping, Dialog, Usage, ModelInfo, UpdateResult, is_valid_objectid,
 )
+from most.views import view
+
+if TYPE_CHECKING:
+    from pydub import AudioSegment
 
 
 class AsyncMostClient(object):
-    retort = Retort(recipe=[
-        loader(int,
-               lambda x: x if isinstance(x, int) else int(x)),
-        loader(float,
-               lambda x: x if isinstance(x, float) else float(x)),
-        loader(Union[str, int, float],
-               lambda x: int(x) if isinstance(x, int) else float(x) if isinstance(x, float) else str(x)),
-        loader(datetime,
-               lambda x: datetime.fromtimestamp(x).astimezone(tz=timezone.utc) if isinstance(x, (int, float)) else datetime.fromisoformat(x)),
-    ])
+    retort = LazyRetort()
 
     def __init__(self,
                  client_id=None,
@@ -43,7 +47,17 @@ class AsyncMostClient(object):
                  base_url: str | httpx.URL | None = None,
                  timeout: Union[float, httpx.Timeout] = DEFAULT_TIMEOUT,
                  max_retries: int = DEFAULT_MAX_RETRIES,
-                 # retry_delay: float = 0,
+                 limits: httpx.Limits = DEFAULT_CONNECTION_LIMITS,
+                 retry_delay: float = DEFAULT_RETRY_DELAY,
+                 http2: bool = False,
+                 transport: Optional[TransportConfig] = None,
+                 token_ttl: Optional[float] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 search_cache: Optional[SearchCache] = None,
+                 model_cache: Optional[ModelMetadataCache] = None,
+                 raw: bool = False,
+                 concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
                  http_client: httpx.AsyncClient | None = None,
                  debug: bool = False,):
         super(AsyncMostClient, self).__init__()
@@ -60,23 +74,30 @@ class AsyncMostClient(object):
                 self.client_id = input("Please enter your client ID: ")
                 self.client_secret = input("Please enter your client secret: ")
                 self.save_credentials()
-        else:
-            self.save_credentials()
 
         if base_url is None:
             base_url = os.environ.get("MOST_BASE_URL")
         if base_url is None:
             base_url = f"https://api.the-most.ai/api/external"
-
-        if http_client is None:
-            http_client = httpx.AsyncClient(base_url=base_url,
-                                            timeout=timeout,
-                                            follow_redirects=True,
-                                            transport=httpx.AsyncHTTPTransport(retries=max_retries))
-        # self.max_retries = max_retries
-        # self.retry_delay = retry_delay
-        self.session = http_client
-        self.access_token = None
+        self.base_url = base_url
+
+        if transport is None:
+            transport = TransportConfig(timeout=timeout,
+                                        limits=limits,
+                                        max_retries=max_retries,
+                                        retry=RetryPolicy(delay=retry_delay),
+                                        http2=http2)
+        self.transport = transport
+
+        self._session = LazySession(partial(self.transport.build_async_client, base_url),
+                                    session=http_client)
+        self._token = AccessToken(ttl=token_ttl)
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.search_cache = search_cache
+        self.model_cache = model_cache if model_cache is not None else ModelMetadataCache()
+        self.raw = raw
+        self.concurrency_limiter = concurrency_limiter
 
         self.model_id = model_id
         self.model_alias = None if self.model_id is None or is_valid_objectid(self.model_id[len("most-"):]) else self.model_id
@@ -87,7 +108,8 @@ class AsyncMostClient(object):
 
     async def __aenter__(self):
         await self.session.__aenter__()
-        await self.refresh_access_token()
+        if self._token.needs_refresh():
+            await self.refresh_access_token()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -104,23 +126,28 @@ class AsyncMostClient(object):
         if not path.exists():
             return {}
         else:
+            import json5
             return json5.loads(path.read_text())
 
     def save_credentials(self):
+        import json5
         path = self.cache_path / "credentials.json"
         path.write_text(json5.dumps({
             "client_id": self.client_id,
             "client_secret": self.client_secret,
         }))
 
+    @property
+    def session(self) -> httpx.AsyncClient:
+        return self._session.get()
+
+    @session.setter
+    def session(self, session: httpx.AsyncClient):
+        self._session.set(session)
+
     def clone(self):
-        client = AsyncMostClient(client_id=self.client_id,
-                                 client_secret=self.client_secret,
-                                 model_id=self.model_id)
-        client.access_token = self.access_token
-        client.session = self.session
-        client.score_modifier = self.score_modifier
-        return client
+        # a shallow copy shares session, token and transport with the parent
+        return copy.copy(self)
 
     def with_model(self,
                    model_id: Optional[str] = None,
@@ -141,105 +168,146 @@ class AsyncMostClient(object):
         client.score_modifier = None
         return client
 
-    async def refresh_access_token(self):
-        resp = await self.session.post("/access_token",
-                                       json={"client_id": self.client_id,
-                                             "client_secret": self.client_secret})
-        access_token = resp.json()
-        self.access_token = access_token
+    @property
+    def access_token(self) -> Optional[str]:
+        return self._token.value
 
-    async def get(self, url, **kwargs):
-        if self.access_token is None:
+    @access_token.setter
+    def access_token(self, value: Optional[str]):
+        self._token.value = value
+
+    async def refresh_access_token(self, stale_token: Optional[str] = None):
+        """
+        Refreshes the token shared with all clones. Pass the token a failed
+        request was sent with as stale_token: if another caller has already
+        replaced it, that new token is reused instead of fetching one more.
+        """
+        if stale_token is None:
+            stale_token = self.access_token
+        return await self._token.arefresh(self._fetch_access_token,
+                                          stale_token=stale_token)
+
+    async def _fetch_access_token(self) -> str:
+        credentials = {"client_id": self.client_id,
+                       "client_secret": self.client_secret}
+        if self.circuit_breaker is None:
+            resp = await self.session.post("/access_token", json=credentials)
+        else:
+            # a host that is down should not be hammered by token renewals either
+            with self.circuit_breaker.guard("/access_token", self.base_url) as call:
+                resp = await self.session.post("/access_token", json=credentials)
+                call.record(resp)
+        return response_json(resp)
+
+    async def request(self, method: str, url,
+                      idempotent: Optional[bool] = None,
+                      **kwargs) -> httpx.Response:
+        """
+        Sends an authorized request through the shared session.
+        A token close to expiry is renewed before the request goes out,
+        so bodies are not sent twice; on 401 the token is refreshed
+        and the request resent once. Throttled idempotent requests are
+        retried according to transport.retry; pass idempotent=True for
+        a POST that is safe to repeat.
+        Error statuses are returned as is, callers decide how to raise.
+        """
+        kwargs = encode_json_body(kwargs)
+        retry = self.transport.retry
+        resp = await self._send_authorized(method, url, **kwargs)
+        attempt = 0
+        while retry.should_retry(method, resp, attempt, idempotent=idempotent):
+            await asyncio.sleep(retry.get_delay(attempt, resp))
+            attempt += 1
+            resp = await self._send_authorized(method, url, **kwargs)
+        return resp
+
+    async def _send_authorized(self, method: str, url, **kwargs) -> httpx.Response:
+        if self._token.needs_refresh():
             await self.refresh_access_token()
-        headers = kwargs.pop("headers", {})
-        headers.update({"Authorization": "Bearer %s" % self.access_token})
-        resp = await self.session.get(url,
-                                      headers=headers,
-                                      timeout=None,
-                                      **kwargs)
+        elif self._token.should_renew():
+            self._token.arenew_in_background(self._fetch_access_token)
+        headers = kwargs.pop("headers", None) or {}
+        access_token = self.access_token
+        resp = await self._send(method, url,
+                                headers={**headers, "Authorization": "Bearer %s" % access_token},
+                                **kwargs)
         if resp.status_code == 401:
-            await self.refresh_access_token()
-            return await self.get(url,
-                                  headers=headers,
-                                  **kwargs)
+            await self.refresh_access_token(stale_token=access_token)
+            resp = await self._send(method, url,
+                                    headers={**headers, "Authorization": "Bearer %s" % self.access_token},
+                                    **kwargs)
+        return resp
 
-        if resp.status_code >= 400:
-            raise RuntimeError(resp.json()['message'] if resp.headers.get("Content-Type") == "application/json" else "Something went wrong.")
-        resp.raise_for_status()
+    async def _send(self, method: str, url, **kwargs) -> httpx.Response:
+        send = getattr(self.session, method.lower())
+        if self._session.built:
+            # a user-supplied http_client keeps its own timeout
+            kwargs.setdefault("timeout", self.transport.timeout)
+        if self.rate_limiter is not None:
+            await self.rate_limiter.aacquire(url)
+        if self.circuit_breaker is None:
+            return await self._send_limited(send, method, url, **kwargs)
+        with self.circuit_breaker.guard(url, self.base_url) as call:
+            resp = await self._send_limited(send, method, url, **kwargs)
+            call.record(resp)
+            return resp
+
+    async def _send_limited(self, send, method: str, url, **kwargs) -> httpx.Response:
+        if self.concurrency_limiter is None:
+            return await send(url, **kwargs)
+        async with self.concurrency_limiter.slot(method, url) as slot:
+            resp = await send(url, **kwargs)
+            slot.record(resp)
+            return resp
+
+    async def get(self, url, **kwargs):
+        resp = await self.request("GET", url, **kwargs)
+        raise_for_api_error(resp)
         return resp
 
     async def put(self, url, **kwargs):
-        if self.access_token is None:
-            await self.refresh_access_token()
-        headers = kwargs.pop("headers", {})
-        headers.update({"Authorization": "Bearer %s" % self.access_token})
-        resp = await self.session.put(url,
-                                      headers=headers,
-                                      timeout=None,
-                                      **kwargs)
-        if resp.status_code == 401:
-            await self.refresh_access_token()
-            return await self.put(url,
-                                  headers=headers,
-                                  **kwargs)
-        if resp.status_code >= 400:
-            raise RuntimeError(resp.json()['message'] if resp.headers.get("Content-Type") == "application/json" else "Something went wrong.")
+        resp = await self.request("PUT", url, **kwargs)
+        raise_for_api_error(resp)
         return resp
 
     async def delete(self, url, **kwargs):
-        if self.access_token is None:
-            await self.refresh_access_token()
-        headers = kwargs.pop("headers", {})
-        headers.update({"Authorization": "Bearer %s" % self.access_token})
-        resp = await self.session.delete(url,
-                                         headers=headers,
-                                         timeout=None,
-                                         **kwargs)
-        if resp.status_code == 401:
-            await self.refresh_access_token()
-            return await self.delete(url,
-                                     headers=headers,
-                                     **kwargs)
-        if resp.status_code >= 400:
-            raise RuntimeError(resp.json()['message'] if resp.headers.get("Content-Type") == "application/json" else "Something went wrong.")
+        resp = await self.request("DELETE", url, **kwargs)
+        raise_for_api_error(resp)
         return resp
 
     async def post(self, url,
                    data=None,
                    json=None,
                    **kwargs):
-        if self.access_token is None:
-            await self.refresh_access_token()
-        headers = kwargs.pop("headers", {})
-        headers.update({"Authorization": "Bearer %s" % self.access_token})
-        headers.update(kwargs.get("headers", {}))
-        resp = await self.session.post(url,
-                                       data=data,
-                                       json=json,
-                                       headers=headers,
-                                       timeout=None,
-                                       **kwargs)
-        if resp.status_code == 401:
-            await self.refresh_access_token()
-            return await self.post(url,
-                                   data=data,
-                                   json=json,
-                                   headers=headers,
-                                   **kwargs)
-        resp.raise_for_status()
-        if resp.status_code >= 400:
-            print(resp.content)
-            raise RuntimeError(resp.json()['message'] if resp.headers.get(
-                "Content-Type") == "application/json" else "Something went wrong.")
+        resp = await self.request("POST", url,
+                                  data=data,
+                                  json=json,
+                                  **kwargs)
+        raise_for_api_error(resp)
         return resp
 
+    def load_response(self, resp: httpx.Response, tp, raw: Optional[bool] = None,
+                      pause_gc: bool = False):
+        """
+        Decodes the JSON body of resp into tp. With raw=True returns
+        a read-only lazy view instead (see most.views): fields are
+        decoded on access. raw=None falls back to the client's raw flag.
+        pause_gc is passed to decode() for bulk responses.
+        """
+        data = response_json(resp)
+        if self.raw if raw is None else raw:
+            return view(data, tp)
+        return decode(data, tp, pause_gc=pause_gc)
+
+    @invalidates_search_cache
     async def upload_audio(self, audio_path) -> Audio:
         with open(audio_path, mode='rb') as f:
             resp = await self.post(f"/{self.client_id}/upload",
                                    files={"audio_file": f})
-        return self.retort.load(resp.json(), Audio)
+        return decode(response_json(resp), Audio)
 
-    async def upload_audio_segment(self, audio: AudioSegment,
+    @invalidates_search_cache
+    async def upload_audio_segment(self, audio: "AudioSegment",
                                    audio_name: Optional[str] = None) -> Audio:
         f = io.BytesIO()
         audio.export(f, format="mp3")
@@ -248,93 +316,113 @@ class AsyncMostClient(object):
             audio_name = uuid.uuid4().hex + ".mp3"
         resp = await self.post(f"/{self.client_id}/upload",
                                files={"audio_file": (audio_name, f, 'audio/mp3')})
-        return self.retort.load(resp.json(), Audio)
+        return decode(response_json(resp), Audio)
 
+    @invalidates_search_cache
     async def upload_text(self, text: str) -> Text:
         resp = await self.post(f"/{self.client_id}/upload_text",
                                json={"text": text})
-        return self.retort.load(resp.json(), Text)
+        return decode(response_json(resp), Text)
 
+    @invalidates_search_cache
     async def upload_dialog(self, dialog: Dialog) -> Text:
         resp = await self.post(f"/{self.client_id}/upload_dialog",
                                json={"dialog": dialog.to_dict()})
-        return self.retort.load(resp.json(), Text)
+        return decode(response_json(resp), Text)
 
+    @invalidates_search_cache
     async def upload_audio_url(self, audio_url) -> Audio:
         resp = await self.post(f"/{self.client_id}/upload_url",
                                json={"audio_url": audio_url})
-        return self.retort.load(resp.json(), Audio)
+        return decode(response_json(resp), Audio)
 
+    @invalidates_search_cache
     async def remove_tags(self, data_id, tags: Union[str, List[str]],
                           data_source: Literal["text", "audio"] = "audio"):
         if not isinstance(tags, list):
             tags = [tags]
         resp = await self.delete(f"/{self.client_id}/{data_source}/{data_id}/tags",
                                  params={"tags": tags})
-        return resp.json()
+        return response_json(resp)
 
+    @invalidates_search_cache
     async def add_tags(self, data_id, tags: Union[str, List[str]],
                        data_source: Literal["text", "audio"] = "audio"):
         if not isinstance(tags, list):
             tags = [tags]
         resp = await self.put(f"/{self.client_id}/{data_source}/{data_id}/tags",
                                params={"tags": tags})
-        return resp.json()
+        return response_json(resp)
 
     async def get_tags(self, data_id,
                        data_source: Literal["text", "audio"] = "audio"):
         resp = await self.get(f"/{self.client_id}/{data_source}/{data_id}/tags")
-        return resp.json()
+        return response_json(resp)
 
     async def list_audios(self,
                           offset: int = 0,
                           limit: int = 10,
-                          query: Optional[Dict[str, str]] = None) -> List[Audio]:
+                          query: Optional[Dict[str, str]] = None,
+                          raw: Optional[bool] = None) -> List[Audio]:
         if query is None:
             query = {}
         resp = await self.get(f"/{self.client_id}/list?offset={offset}&limit={limit}",
                               params=query)
-        audio_list = resp.json()
-        return self.retort.load(audio_list, List[Audio])
+        return self.load_response(resp, List[Audio], raw, pause_gc=True)
 
     async def list_texts(self,
                          offset: int = 0,
-                         limit: int = 10) -> List[Text]:
+                         limit: int = 10,
+                         raw: Optional[bool] = None) -> List[Text]:
         resp = await self.get(f"/{self.client_id}/list_texts?offset={offset}&limit={limit}")
-        texts_list = resp.json()
-        return self.retort.load(texts_list, List[Text])
+        return self.load_response(resp, List[Text], raw, pause_gc=True)
+
+    async def _model_metadata(self, kind: str, model_id: Optional[str], url: str, load):
+        """
+        Model metadata through model_cache: served while fresh, then
+        revalidated by ETag.
+        """
+        key = (self.client_id, model_id, kind)
+        entry = self.model_cache.get(key)
+        if entry is not None and self.model_cache.is_fresh(entry):
+            return entry.value
+        resp = await self.get(url, headers=self.model_cache.request_headers(entry))
+        if resp.status_code == 304 and entry is not None:
+            return self.model_cache.revalidated(key, entry)
+        return self.model_cache.put(key, load(response_json(resp)), resp.headers.get("ETag"))
 
     async def get_model_script(self) -> Script:
         if not is_valid_id(self.model_id):
             raise RuntimeError("Please choose valid model to apply. [try list_models()]")
 
-        resp = await self.get(f"/{self.client_id}/model/{self.model_id}/script")
-        return self.retort.load(resp.json(), Script)
+        return await self._model_metadata("script", self.model_id, f"/{self.client_id}/model/{self.model_id}/script",
+                                          lambda data: decode(data, Script))
 
     async def get_score_modifier(self):
         if self.score_modifier is None:
             if not is_valid_id(self.model_id):
                 raise RuntimeError("Please choose valid model to apply. [try list_models()]")
 
-            resp = await self.get(f"/{self.client_id}/model/{self.model_id}/score_mapping")
-            score_mapping = self.retort.load(resp.json(), List[ScriptScoreMapping])
-            self.score_modifier = ScoreCalculation(score_mapping)
+            self.score_modifier = await self._model_metadata(
+                "score_mapping", self.model_id, f"/{self.client_id}/model/{self.model_id}/score_mapping",
+                lambda data: ScoreCalculation(decode(data, List[ScriptScoreMapping])))
         return self.score_modifier
 
     async def list_models(self):
-        resp = await self.get("/list_models")
+        models = await self._model_metadata("models", None, "/list_models", lambda data: data)
         return [self.with_model(model['model'],
                                 released=model.get("released"),
                                 alias=model.get("alias"))
-                for model in resp.json()]
+                for model in models]
 
     async def get_model_info(self):
         if not is_valid_id(self.model_id):
             raise RuntimeError("Please choose valid model to apply. [try list_models()]")
 
-        resp = await self.get(f"/{self.client_id}/model/{self.model_id}/info")
-        return self.retort.load(resp.json(), ModelInfo)
+        return await self._model_metadata("info", self.model_id, f"/{self.client_id}/model/{self.model_id}/info",
+                                          lambda data: decode(data, ModelInfo))
 
+    @invalidates_search_cache
     async def apply(self, audio_id,
                     modify_scores: bool = False,
                     overwrite: bool = False,
@@ -348,12 +436,13 @@ class AsyncMostClient(object):
         resp = await self.post(f"/{self.client_id}/audio/{audio_id}/model/{self.model_id}/apply",
                                params={"overwrite": overwrite,
                                        "job_id": job_id})
-        result = self.retort.load(resp.json(), Result)
+        result = decode(response_json(resp), Result)
         if modify_scores:
             score_modifier = await self.get_score_modifier()
             result = score_modifier.modify(result)
         return result
 
+    @invalidates_search_cache
     async def apply_on_text(self, text_id,
                             modify_scores: bool = False,
                             overwrite: bool = False,
@@ -367,7 +456,7 @@ class AsyncMostClient(object):
         resp = await self.post(f"/{self.client_id}/text/{text_id}/model/{self.model_id}/apply",
                                params={"overwrite": overwrite,
                                        "job_id": job_id})
-        result = self.retort.load(resp.json(), Result)
+        result = decode(response_json(resp), Result)
         if modify_scores:
             score_modifier = await self.get_score_modifier()
             result = score_modifier.modify(result)
@@ -383,7 +472,7 @@ class AsyncMostClient(object):
 
         resp = await self.post(f"/{self.client_id}/audio/{audio_id}/model/{self.model_id}/transcribe_async",
                                params={"overwrite": overwrite})
-        return self.retort.load(resp.json(), DialogResult)
+        return decode(response_json(resp), DialogResult)
 
     async def apply_later(self, audio_id,
                           modify_scores: bool = False,
@@ -398,7 +487,7 @@ class AsyncMostClient(object):
         resp = await self.post(f"/{self.client_id}/audio/{audio_id}/model/{self.model_id}/apply_async",
                                params={"overwrite": overwrite,
                                        "job_id": job_id})
-        result = self.retort.load(resp.json(), Result)
+        result = decode(response_json(resp), Result)
         if modify_scores:
             score_modifier = await self.get_score_modifier()
             result = score_modifier.modify(result)
@@ -417,7 +506,7 @@ class AsyncMostClient(object):
         resp = await self.post(f"/{self.client_id}/text/{text_id}/model/{self.model_id}/apply_async",
                                params={"overwrite": overwrite,
                                        "job_id": job_id})
-        result = self.retort.load(resp.json(), Result)
+        result = decode(response_json(resp), Result)
         if modify_scores:
             score_modifier = await self.get_score_modifier()
             result = score_modifier.modify(result)
@@ -431,9 +520,11 @@ class AsyncMostClient(object):
         if not is_valid_id(data_id):
             raise RuntimeError("Please use valid data_id. [try audio.id / text.id from list_audios() / list_texts()]")
 
-        resp = await self.post(f"/{self.client_id}/{data_source}/{data_id}/model/{self.model_id}/apply_status")
-        return self.retort.load(resp.json(), JobStatus)
+        resp = await self.post(f"/{self.client_id}/{data_source}/{data_id}/model/{self.model_id}/apply_status",
+                               idempotent=True)
+        return decode(response_json(resp), JobStatus)
 
+    @invalidates_search_cache
     async def update_results(self, data_id, updates: List[UpdateResult],
                              scores_modified: bool = False,
                              data_source: Literal["text", "audio"] = "audio"):
@@ -450,14 +541,15 @@ class AsyncMostClient(object):
 
         resp = await self.put(f"/{self.client_id}/{data_source}/{data_id}/model/{self.model_id}/results",
                               json={"updates": [update.to_dict() for update in updates]},)
-        result = self.retort.load(resp.json(), Result)
+        result = decode(response_json(resp), Result)
         if scores_modified:
             result = score_modifier.modify(result)
         return result
 
     async def fetch_results(self, data_id: str,
                             modify_scores: bool = False,
-                            data_source: Literal["text", "audio"] = "audio") -> Result:
+                            data_source: Literal["text", "audio"] = "audio",
+                            raw: Optional[bool] = None) -> Result:
         if not is_valid_id(self.model_id):
             raise RuntimeError("Please choose valid model to apply. [try list_models()]")
 
@@ -465,15 +557,16 @@ class AsyncMostClient(object):
             raise RuntimeError("Please use valid data_id. [try audio.id / text.id from list_audios() / list_texts()]")
 
         resp = await self.get(f"/{self.client_id}/{data_source}/{data_id}/model/{self.model_id}/results")
-        result = self.retort.load(resp.json(), Result)
-        if modify_scores:
-            score_modifier = await self.get_score_modifier()
-            result = score_modifier.modify(result)
-        return result
+        if not modify_scores:
+            return self.load_response(resp, Result, raw, pause_gc=True)
+        # modify() copies a decoded Result, views are read-only: raw is ignored here
+        score_modifier = await self.get_score_modifier()
+        return score_modifier.modify(decode(response_json(resp), Result, pause_gc=True))
 
     async def fetch_text(self, data_id: str,
                          data_source: Literal["text", "audio"] = "audio",
-                         transcribator_name: Optional[Literal["GroundTruth"]] = None) -> Result:
+                         transcribator_name: Optional[Literal["GroundTruth"]] = None,
+                         raw: Optional[bool] = None) -> Result:
 
         if not is_valid_id(data_id):
             raise RuntimeError("Please use valid data_id. [try audio.id / text.id from list_audios() / list_texts()]")
@@ -485,11 +578,12 @@ class AsyncMostClient(object):
                 raise RuntimeError("Please choose valid model to apply. [try list_models()]")
             resp = await self.get(f"/{self.client_id}/{data_source}/{data_id}/model/{self.model_id}/text")
 
-        return self.retort.load(resp.json(), Result)
+        return self.load_response(resp, Result, raw)
 
     async def fetch_dialog(self, data_id,
                            data_source: Literal["text", "audio"] = "audio",
-                           transcribator_name: Optional[Literal["GroundTruth"]] = None) -> DialogResult:
+                           transcribator_name: Optional[Literal["GroundTruth"]] = None,
+                           raw: Optional[bool] = None) -> DialogResult:
         if not is_valid_id(data_id):
             raise RuntimeError("Please use valid data_id. [try audio.id / text.id from list_audios() / list_texts()]")
 
@@ -500,8 +594,9 @@ class AsyncMostClient(object):
                 raise RuntimeError("Please choose valid model to apply. [try list_models()]")
             resp = await self.get(f"/{self.client_id}/{data_source}/{data_id}/model/{self.model_id}/dialog")
 
-        return self.retort.load(resp.json(), DialogResult)
+        return self.load_response(resp, DialogResult, raw)
 
+    @invalidates_search_cache
     async def update_dialog(self,
                             data_id,
                             dialog: Dialog,
@@ -524,7 +619,7 @@ class AsyncMostClient(object):
         resp = await self.put(pathname,
                               json={"dialog": dialog.to_dict()})
 
-        return self.retort.load(resp.json(), DialogResult)
+        return decode(response_json(resp), DialogResult)
 
     async def recreate_dialog_from_raw_text(self,
                                             text_id) -> DialogResult:
@@ -532,7 +627,7 @@ class AsyncMostClient(object):
             raise RuntimeError("Please use valid text_id. [try text.id from list_texts()]")
 
         resp = await self.post(f"/{self.client_id}/text/{text_id}/restore_dialog_from_text")
-        return self.retort.load(resp.json(), DialogResult)
+        return decode(response_json(resp), DialogResult)
 
     async def assign_text_speakers(
         self, text_id: str
@@ -558,7 +653,7 @@ class AsyncMostClient(object):
         resp = await self.post(
             f"/{self.client_id}/text/{text_id}/assign_speakers"
         )
-        return resp.json().get("speakers_mapping", {})
+        return response_json(resp).get("speakers_mapping", {})
 
     async def export(self, audio_ids: List[str],
                      aggregated_by: Optional[str] = None,
@@ -577,6 +672,7 @@ class AsyncMostClient(object):
                                       "modify_scores": modify_scores})
         return resp.next_request.url
 
+    @invalidates_search_cache
     async def store_info(self,
                          audio_id: str,
                          data: Dict[str, Union[str, int, float]]) -> StoredAudioData:
@@ -586,14 +682,15 @@ class AsyncMostClient(object):
                                json={
                                    "data": data,
                                })
-        return self.retort.load(resp.json(), StoredAudioData)
+        return decode(response_json(resp), StoredAudioData)
 
-    async def fetch_info(self, audio_id: str) -> StoredAudioData:
+    async def fetch_info(self, audio_id: str, raw: Optional[bool] = None) -> StoredAudioData:
         if not is_valid_id(audio_id):
             raise RuntimeError("Please use valid audio_id. [try audio.id from list_audios()]")
         resp = await self.get(f"/{self.client_id}/audio/{audio_id}/info")
-        return self.retort.load(resp.json(), StoredAudioData)
+        return self.load_response(resp, StoredAudioData, raw)
 
+    @invalidates_search_cache
     async def store_text_info(self,
                               text_id: str,
                               data: Dict[str, Union[str, int, float]]) -> StoredTextData:
@@ -604,13 +701,13 @@ class AsyncMostClient(object):
                                json={
                                    "data": data,
                                })
-        return self.retort.load(resp.json(), StoredTextData)
+        return decode(response_json(resp), StoredTextData)
 
-    async def fetch_text_info(self, text_id: str) -> StoredTextData:
+    async def fetch_text_info(self, text_id: str, raw: Optional[bool] = None) -> StoredTextData:
         if not is_valid_id(text_id):
             raise RuntimeError("Please use valid text_id. [try text.id from list_texts()]")
         resp = await self.get(f"/{self.client_id}/text/{text_id}/info")
-        return self.retort.load(resp.json(), StoredTextData)
+        return self.load_response(resp, StoredTextData, raw)
 
     async def __call__(self, audio_path: Path,
                        modify_scores: bool = False) -> Result:
@@ -637,6 +734,7 @@ class AsyncMostClient(object):
         if resp.status_code >= 400:
             raise RuntimeError("Audio url is not accessable")
 
+        from pydub import AudioSegment
         audio = AudioSegment.from_file(io.BytesIO(resp.content),
                                        format=format)
         return audio
@@ -653,7 +751,7 @@ class AsyncMostClient(object):
                                       "limit": limit})
         if resp.status_code >= 400:
             raise RuntimeError("Audio can't be indexed")
-        return resp.json()
+        return response_json(resp)
 
     async def get_usage(self,
                         start_dt: datetime,
@@ -662,7 +760,7 @@ class AsyncMostClient(object):
                               params={'start_dt': start_dt.astimezone(timezone.utc).isoformat(),
                                       'end_dt': end_dt.astimezone(timezone.utc).isoformat()})
         resp.raise_for_status()
-        return self.retort.load(resp.json(), Usage)
+        return decode(response_json(resp), Usage)
 
     async def ask(self, question,
                   audio_ids: List[str],
@@ -679,17 +777,19 @@ class AsyncMostClient(object):
                                    "text_ids": text_ids,
                                    "audio_ids": audio_ids,
                                })
-        return resp.json()
+        return response_json(resp)
 
+    @invalidates_search_cache
     async def delete_audio(self, audio_id: str):
         resp = await self.delete(f"/{self.client_id}/audio/{audio_id}/delete")
         resp.raise_for_status()
-        return resp.json()
+        return response_json(resp)
 
+    @invalidates_search_cache
     async def delete_text(self, text_id: str):
         resp = await self.delete(f"/{self.client_id}/text/{text_id}/delete")
         resp.raise_for_status()
-        return resp.json()
+        return response_json(resp)
 
     async def anonymize(self, text: str) -> str:
         resp = await self.post(f"https://api-anon.the-most.ai/anonymize",
@@ -697,7 +797,7 @@ class AsyncMostClient(object):
                                    "text": text,
                                })
         resp.raise_for_status()
-        data = resp.json()
+        data = response_json(resp)
         if "text" not in data:
             raise RuntimeError("Anonymization failed")
         return data["text"]
@@ -1,6 +1,8 @@
 from typing import List, Optional
 
 from .async_api import AsyncMostClient
+from .decoders import decode
+from .json_backend import response_json
 from .types import Item
 
 
@@ -14,15 +16,11 @@ class AsyncCatalog(object):
             items = [items]
         resp = await self.client.post(f"/{self.client.client_id}/upload_items",
                                       json=[item.to_dict() for item in items])
-        # return self.client.retort.load(resp.json(), List[Item])
-        return [Item.from_dict(item)
-                for item in resp.json()]
+        return decode(response_json(resp), List[Item])
 
     async def list_items(self) -> List[Item]:
         resp = await self.client.get(f"/{self.client.client_id}/items")
-        # return self.client.retort.load(resp.json(), List[Item])
-        return [Item.from_dict(item)
-                for item in resp.json()]
+        return decode(response_json(resp), List[Item])
 
     async def delete_items(self, item_ids: List[str]):
         if not isinstance(item_ids, list):
@@ -60,9 +58,7 @@ class AsyncCatalog(object):
 
         resp = await self.client.get(f"/{self.client.client_id}/search_items",
                                      params=params)
-        # return self.client.retort.load(resp.json(), List[Item])
-        return [Item.from_dict(item)
-                for item in resp.json()]
+        return decode(response_json(resp), List[Item])
 
     async def search_items_by_photo(self, image_url: str,
 
@@ -87,6 +83,4 @@ class AsyncCatalog(object):
 
         resp = await self.client.get(f"/{self.client.client_id}/search_items_by_photo",
                                      params=params)
-        # return self.client.retort.load(resp.json(), List[Item])
-        return [Item.from_dict(item)
-                for item in resp.json()]
+        return decode(response_json(resp), List[Item])
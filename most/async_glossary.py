@@ -1,6 +1,8 @@
 from typing import List
 
 from .async_api import AsyncMostClient
+from .decoders import decode
+from .json_backend import response_json
 from .types import GlossaryNGram
 
 
@@ -14,11 +16,11 @@ class AsyncGlossary(object):
             ngrams = [ngrams]
         resp = await self.client.post(f"/{self.client.client_id}/upload_glossary",
                                       json=[ngram.to_dict() for ngram in ngrams])
-        return self.client.retort.load(resp.json(), List[GlossaryNGram])
+        return decode(response_json(resp), List[GlossaryNGram])
 
     async def list_ngrams(self) -> List[GlossaryNGram]:
         resp = await self.client.get(f"/{self.client.client_id}/glossary")
-        return self.client.retort.load(resp.json(), List[GlossaryNGram])
+        return decode(response_json(resp), List[GlossaryNGram])
 
     async def del_ngrams(self, ngram_ids: List[str] | str):
         if not isinstance(ngram_ids, list):
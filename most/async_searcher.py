@@ -1,7 +1,11 @@
-from typing import List, Literal, Optional
+import asyncio
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Literal, Optional
 from . import AsyncMostClient
-from .types import Audio, StoredAudioData, StoredTextData
-from .search_types import SearchParams
+from .json_backend import response_json
+from .searcher import next_cursor
+from .types import Audio, StoredAudioData, StoredTextData, objectid_datetime
+from .search_types import IDCondition, SearchParams, shard_by_id
 
 
 class AsyncMostSearcher(object):
@@ -14,14 +18,23 @@ class AsyncMostSearcher(object):
                     filter: Optional[SearchParams] = None):
         if filter is None:
             filter = SearchParams()
+        cache = self.client.search_cache
+        if cache is not None:
+            cache_key = cache.key(self.client.client_id, self.data_source, "count", filter)
+            count = cache.get(cache_key)
+            if count is not None:
+                return count
 
         resp = await self.client.get(f"/{self.client.client_id}/{self.data_source}/count",
                                      params={
-                                         "filter": filter.to_json(),
+                                         "filter": filter.canonical_json(),
                                      })
         if resp.status_code >= 400:
             raise RuntimeError("Audio can't be indexed")
-        return resp.json()
+        count = response_json(resp)
+        if cache is not None:
+            cache.set(cache_key, count)
+        return count
 
 
     async def distinct(self,
@@ -34,24 +47,34 @@ class AsyncMostSearcher(object):
         """
         if filter is None:
             filter = SearchParams()
+        cache = self.client.search_cache
+        if cache is not None:
+            cache_key = cache.key(self.client.client_id, self.data_source, "distinct", filter, key)
+            values = cache.get(cache_key)
+            if values is not None:
+                return list(values)
         resp = await self.client.get(f"/{self.client.client_id}/{self.data_source}/distinct",
-                               params={"filter": filter.to_json(),
+                               params={"filter": filter.canonical_json(),
                                        "key": key})
         if resp.status_code >= 400:
             raise RuntimeError("Key is not valid")
-        return resp.json()
+        values = response_json(resp)
+        if cache is not None:
+            cache.set(cache_key, list(values))
+        return values
 
     async def search(self,
                      filter: Optional[SearchParams] = None,
                      limit: int = 10,
                      include_data: bool = False,
                      include_results: Optional[List[str]] = None,
-                     jmespath_schema: Optional[str] = None) -> List[StoredAudioData | StoredTextData]:
+                     jmespath_schema: Optional[str] = None,
+                     raw: Optional[bool] = None) -> List[StoredAudioData | StoredTextData]:
         if filter is None:
             filter = SearchParams()
         resp = await self.client.get(f"/{self.client.client_id}/{self.data_source}/search",
                                      params={
-                                         "filter": filter.to_json(),
+                                         "filter": filter.canonical_json(),
                                          "limit": limit,
                                          "include_data": include_data,
                                          "include_results": include_results,
@@ -60,7 +83,159 @@ class AsyncMostSearcher(object):
         if resp.status_code >= 400:
             raise RuntimeError("Audio can't be indexed")
         if jmespath_schema is not None:
-            return resp.json()
+            return response_json(resp)
 
-        data_list = resp.json()
-        return self.client.retort.load(data_list, List[StoredAudioData | StoredTextData])
+        return self.client.load_response(resp, List[StoredAudioData | StoredTextData], raw,
+                                         pause_gc=True)
+
+    async def aiter_search(self,
+                           filter: Optional[SearchParams] = None,
+                           page_size: int = 100,
+                           include_data: bool = False,
+                           include_results: Optional[List[str]] = None,
+                           raw: Optional[bool] = None) -> AsyncIterator[StoredAudioData | StoredTextData]:
+        """
+        Iterates over all objects matching filter, page by page.
+        Pages are requested by id (IDCondition.greater_than the last id of
+        the previous page), the next page is fetched while the current one
+        is consumed, so at most two pages are in memory.
+        """
+        if filter is None:
+            filter = SearchParams()
+
+        async def fetch(after: Optional[str]):
+            page_filter = filter
+            if after is not None:
+                page_filter = filter.with_conditions([IDCondition(greater_than=after)])
+            return await self.search(filter=page_filter,
+                                     limit=page_size,
+                                     include_data=include_data,
+                                     include_results=include_results,
+                                     raw=raw)
+
+        next_page = None
+        try:
+            after = None
+            page = await fetch(after)
+            while page:
+                after = next_cursor(page, page_size, after)
+                next_page = asyncio.ensure_future(fetch(after)) if after is not None else None
+                for item in page:
+                    yield item
+                if next_page is None:
+                    return
+                page = await next_page
+        finally:
+            if next_page is not None and not next_page.done():
+                next_page.cancel()
+
+    async def ascan(self,
+                    filter: Optional[SearchParams] = None,
+                    shards: int = 8,
+                    page_size: int = 100,
+                    ordered: bool = False,
+                    since: Optional[datetime] = None,
+                    until: Optional[datetime] = None,
+                    include_data: bool = False,
+                    include_results: Optional[List[str]] = None,
+                    raw: Optional[bool] = None) -> AsyncIterator[StoredAudioData | StoredTextData]:
+        """
+        Same objects as aiter_search, with the id space split into shards
+        (see shard_by_id) that are paged concurrently.
+        :param since: creation time of the first object, looked up when None
+        :param until: defaults to now, later objects go to the last shard
+        :param ordered: yield objects ordered by id; shards are still
+            fetched concurrently, but only up to page_size objects ahead
+        """
+        if filter is None:
+            filter = SearchParams()
+        if since is None:
+            first = await self.search(filter=filter, limit=1, raw=True)
+            if not first:
+                return
+            since = objectid_datetime(first[0].id)
+        if until is None:
+            until = datetime.now(timezone.utc)
+
+        shard_filters = shard_by_id(filter, since, max(since, until), shards)
+        if ordered:
+            queues = [asyncio.Queue(maxsize=page_size) for _ in shard_filters]
+        else:
+            queues = [asyncio.Queue(maxsize=page_size * len(shard_filters))] * len(shard_filters)
+
+        async def produce(queue: asyncio.Queue, shard_filter: SearchParams):
+            try:
+                async for item in self.aiter_search(filter=shard_filter,
+                                                    page_size=page_size,
+                                                    include_data=include_data,
+                                                    include_results=include_results,
+                                                    raw=raw):
+                    await queue.put(item)
+            except Exception as e:
+                await queue.put(ShardFailed(e))
+            else:
+                await queue.put(SHARD_DONE)
+
+        tasks = [asyncio.ensure_future(produce(queue, shard_filter))
+                 for queue, shard_filter in zip(queues, shard_filters)]
+        try:
+            for queue in (queues if ordered else queues[:1]):
+                remaining = 1 if ordered else len(tasks)
+                while remaining:
+                    item = await queue.get()
+                    if item is SHARD_DONE:
+                        remaining -= 1
+                    elif isinstance(item, ShardFailed):
+                        raise item.error
+                    else:
+                        yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def facet_counts(self,
+                           base_filter: Optional[SearchParams],
+                           facets: Dict[str, list],
+                           max_concurrency: int = 8) -> Dict[str, int]:
+        """
+        Counts of base_filter narrowed by each facet's extra conditions,
+        e.g. {"sales": [TagsCondition(in_set=["sales"])], ...}.
+        At most max_concurrency counts run at once.
+        """
+        if base_filter is None:
+            base_filter = SearchParams()
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def count(conditions):
+            async with semaphore:
+                return await self.count(base_filter.with_conditions(conditions))
+
+        counts = await asyncio.gather(*[count(conditions) for conditions in facets.values()])
+        return dict(zip(facets, counts))
+
+    async def distinct_many(self,
+                            keys: List[str],
+                            filter: Optional[SearchParams] = None,
+                            max_concurrency: int = 8) -> Dict[str, List[str]]:
+        """
+        Distinct values of each key, at most max_concurrency requests at once.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def distinct(key):
+            async with semaphore:
+                return await self.distinct(key, filter)
+
+        values = await asyncio.gather(*[distinct(key) for key in keys])
+        return dict(zip(keys, values))
+
+
+SHARD_DONE = object()
+
+
+class ShardFailed(object):
+    __slots__ = ("error",)
+
+    def __init__(self, error: Exception):
+        self.error = error
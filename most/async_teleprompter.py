@@ -1,4 +1,5 @@
 from .async_api import AsyncMostClient
+from .json_backend import response_json
 
 
 class AsyncTeleprompter:
@@ -14,7 +15,7 @@ class AsyncTeleprompter:
                                      })
         if resp.status_code >= 400:
             raise RuntimeError("Audio can't be indexed")
-        return resp.json()
+        return response_json(resp)
 
     async def suggest(self, phrase: str):
         resp = await self.client.get(f"/teleprompter/{self.client.client_id}/prompt",
@@ -23,10 +24,10 @@ class AsyncTeleprompter:
                                      })
         if resp.status_code >= 400:
             raise RuntimeError("Audio can't be indexed")
-        return resp.json()
+        return response_json(resp)
 
     async def drop(self):
         resp = await self.client.post(f"/teleprompter/{self.client.client_id}/drop")
         if resp.status_code >= 400:
             raise RuntimeError("Audio can't be indexed")
-        return resp.json()
+        return response_json(resp)
@@ -1,6 +1,8 @@
 from typing import List
 
 from . import AsyncMostClient
+from .decoders import decode
+from .json_backend import response_json
 from .types import HumanFeedback
 
 
@@ -22,5 +24,5 @@ class AsyncTrainer(object):
 
     async def get_data_points(self) -> List[HumanFeedback]:
         resp = await self.client.get(f"/{self.client.client_id}/model/{self.client.model_id}/data")
-        audio_list = resp.json()
-        return self.client.retort.load(audio_list, List[HumanFeedback])
+        audio_list = response_json(resp)
+        return decode(audio_list, List[HumanFeedback])
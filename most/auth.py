@@ -0,0 +1,154 @@
+import asyncio
+import base64
+import json
+import threading
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from most._constrants import DEFAULT_TOKEN_MIN_VALIDITY, DEFAULT_TOKEN_RENEW_BEFORE
+
+
+def decode_token_expiry(token: Optional[str]) -> Optional[float]:
+    """
+    Returns the ``exp`` claim (unix time) of a JWT, or None if the token
+    is not a JWT. The signature is not verified, this is only a hint
+    for when to renew.
+    """
+    if not isinstance(token, str) or token.count(".") != 2:
+        return None
+    payload = token.split(".")[1]
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(claims, dict) or not isinstance(claims.get("exp"), (int, float)):
+        return None
+    return float(claims["exp"])
+
+
+class AccessToken(object):
+    """
+    Access token shared by a client and all of its clones.
+
+    Refreshes are single-flight: concurrent callers that saw the same
+    stale token wait for one request to /access_token and reuse its result.
+
+    Expiry is read from the token itself (JWT ``exp``) or, if ``ttl`` is
+    given, counted from the moment the token was received. Within
+    ``renew_before`` seconds of expiry the token is renewed in the
+    background; with less than ``min_validity`` seconds left requests
+    wait for the new token instead of being sent and rejected with 401.
+    """
+
+    def __init__(self,
+                 value: Optional[str] = None,
+                 ttl: Optional[float] = None,
+                 renew_before: float = DEFAULT_TOKEN_RENEW_BEFORE,
+                 min_validity: float = DEFAULT_TOKEN_MIN_VALIDITY):
+        self.ttl = ttl
+        self.renew_before = renew_before
+        self.min_validity = min_validity
+        self.expires_at: Optional[float] = None
+        self._value: Optional[str] = None
+        self._lock = threading.Lock()
+        self._renewing = False
+        self._pending: Optional[asyncio.Task] = None
+        self.value = value
+
+    @property
+    def value(self) -> Optional[str]:
+        return self._value
+
+    @value.setter
+    def value(self, value: Optional[str]):
+        self._value = value
+        self.expires_at = decode_token_expiry(value)
+        if self.expires_at is None and value is not None and self.ttl is not None:
+            self.expires_at = time.time() + self.ttl
+
+    def expires_in(self) -> Optional[float]:
+        if self.expires_at is None:
+            return None
+        return self.expires_at - time.time()
+
+    def needs_refresh(self) -> bool:
+        if self._value is None:
+            return True
+        expires_in = self.expires_in()
+        return expires_in is not None and expires_in <= self.min_validity
+
+    def should_renew(self) -> bool:
+        expires_in = self.expires_in()
+        return expires_in is not None and expires_in <= self.renew_before
+
+    def _is_stale(self, stale_token: Optional[str]) -> bool:
+        # stale_token is the token the caller has seen (e.g. the one a failed
+        # request was sent with); if the current value differs,
+        # somebody has already refreshed it
+        return self._value is None or self._value == stale_token
+
+    def refresh(self,
+                fetch: Callable[[], str],
+                stale_token: Optional[str]) -> str:
+        with self._lock:
+            if self._is_stale(stale_token):
+                self.value = fetch()
+            return self._value
+
+    def renew_in_background(self, refresh: Callable[[], Any]):
+        """
+        Runs ``refresh`` in a daemon thread, at most one at a time.
+        """
+        with self._lock:
+            if self._renewing:
+                return
+            self._renewing = True
+
+        def run():
+            try:
+                refresh()
+            except Exception:
+                # the request path falls back to a blocking refresh / 401 retry
+                pass
+            finally:
+                self._renewing = False
+
+        threading.Thread(target=run, name="most-token-renewal", daemon=True).start()
+
+    def _start_arefresh(self,
+                        fetch: Callable[[], Awaitable[str]],
+                        stale_token: Optional[str]) -> Optional[asyncio.Task]:
+        pending = self._pending
+        if pending is not None and not pending.done() and pending.get_loop() is asyncio.get_running_loop():
+            return pending
+        if not self._is_stale(stale_token):
+            return None
+        pending = asyncio.ensure_future(self._fetch(fetch))
+        self._pending = pending
+        return pending
+
+    async def arefresh(self,
+                       fetch: Callable[[], Awaitable[str]],
+                       stale_token: Optional[str]) -> str:
+        pending = self._start_arefresh(fetch, stale_token)
+        if pending is None:
+            return self._value
+        # shield: a cancelled waiter must not cancel the refresh for the others
+        return await asyncio.shield(pending)
+
+    def arenew_in_background(self, fetch: Callable[[], Awaitable[str]]):
+        """
+        Starts a refresh task without waiting for it.
+        """
+        pending = self._start_arefresh(fetch, self._value)
+        if pending is not None:
+            # consume the exception, the request path will retry on its own
+            pending.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+    async def _fetch(self, fetch: Callable[[], Awaitable[str]]) -> str:
+        try:
+            self.value = await fetch()
+            return self._value
+        finally:
+            if self._pending is asyncio.current_task():
+                self._pending = None
@@ -5,6 +5,7 @@ from typing import Union, Optional
 import httpx
 
 from ._constrants import DEFAULT_MAX_RETRIES, DEFAULT_TIMEOUT
+from .json_backend import response_json
 from .types import Audio
 from .utils import generate_ed25519_keypair, sign_ed25519
 
@@ -22,6 +23,7 @@ class Badge(object):
                  timeout: Union[float, httpx.Timeout] = DEFAULT_TIMEOUT,
                  max_retries: int = DEFAULT_MAX_RETRIES,
                  # retry_delay: float = DEFAULT_RETRY_DELAY,
+                 http2: bool = False,
                  http_client: httpx.Client | None = None):
         self.sn = sn
         self.private_key = private_key
@@ -35,7 +37,8 @@ class Badge(object):
             http_client = httpx.Client(base_url=base_url,
                                        timeout=timeout,
                                        follow_redirects=True,
-                                       transport=httpx.HTTPTransport(retries=max_retries))
+                                       transport=httpx.HTTPTransport(retries=max_retries,
+                                                                     http2=http2))
         # self.max_retries = max_retries
         # self.retry_delay = retry_delay
         self.session = http_client
@@ -53,7 +56,7 @@ class Badge(object):
         r = self.session.get(f"/badge/check",
                              params={"sn": self.sn})
         r.raise_for_status()
-        r = r.json()
+        r = response_json(r)
         status = r["status"]
         if status == "ok":
             self.badge_id = r["id"]
@@ -71,7 +74,7 @@ class Badge(object):
         )
 
         r.raise_for_status()
-        self.badge_id = r.json()["id"]
+        self.badge_id = response_json(r)["id"]
         return self.badge_id
 
     def login(self):
@@ -88,7 +91,7 @@ class Badge(object):
         )
 
         r.raise_for_status()
-        challenge = r.json()["challenge"]
+        challenge = response_json(r)["challenge"]
 
         signature = sign_ed25519(self.private_key, challenge)
 
@@ -101,7 +104,7 @@ class Badge(object):
         )
 
         r.raise_for_status()
-        self.token = r.json()["token"]
+        self.token = response_json(r)["token"]
 
     def upload_audio(self, audio_path,
                      start_dt: datetime,
@@ -117,4 +120,4 @@ class Badge(object):
                                      files={"audio_file": f},
                                      headers={"X-Badge-Token": f"Bearer {self.token}"})
             resp.raise_for_status()
-            return Audio(**resp.json())
+            return Audio(**response_json(resp))
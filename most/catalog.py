@@ -1,6 +1,8 @@
 from typing import List, Optional
 
 from .api import MostClient
+from .decoders import decode
+from .json_backend import response_json
 from .types import Item
 
 
@@ -14,15 +16,11 @@ class Catalog(object):
             items = [items]
         resp = self.client.post(f"/{self.client.client_id}/upload_items",
                                 json=[item.to_dict() for item in items])
-        # return self.client.retort.load(resp.json(), List[Item])
-        return [Item.from_dict(item)
-                for item in resp.json()]
+        return decode(response_json(resp), List[Item])
 
     def list_items(self) -> List[Item]:
         resp = self.client.get(f"/{self.client.client_id}/items")
-        # return self.client.retort.load(resp.json(), List[Item])
-        return [Item.from_dict(item)
-                for item in resp.json()]
+        return decode(response_json(resp), List[Item])
 
     def delete_items(self, item_ids: List[str]):
         if not isinstance(item_ids, list):
@@ -53,9 +51,7 @@ class Catalog(object):
 
                                    "limit": limit,
                                })
-        # return self.client.retort.load(resp.json(), List[Item])
-        return [Item.from_dict(item)
-                for item in resp.json()]
+        return decode(response_json(resp), List[Item])
 
     def search_items_by_photo(self, image_url: str) -> List[Item]:
         return []
@@ -0,0 +1,149 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+import httpx
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    def __init__(self, host: str, retry_in: float):
+        super().__init__("Circuit for %s is open after repeated failures, retry in %.1fs" % (host, retry_in))
+        self.host = host
+        self.retry_in = retry_in
+
+
+@dataclass
+class CircuitState:
+    state: str = CLOSED
+    failures: int = 0
+    opened_at: Optional[float] = None
+    probing: bool = False
+
+
+class CircuitBreaker(object):
+    """
+    Per-host circuit breaker shared by a client and its clones.
+
+    After ``failure_threshold`` consecutive failures (transport errors
+    and 5xx responses) the host's circuit opens and requests to it fail
+    fast with CircuitOpenError instead of waiting out the timeout.
+    After ``recovery_timeout`` seconds a single probe request is let
+    through (half-open): success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self,
+                 failure_threshold: int = 5,
+                 recovery_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.clock = clock
+        self.hosts: Dict[str, CircuitState] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "<CircuitBreaker(%s)>" % ", ".join("%s=%s" % (host, circuit.state)
+                                                  for host, circuit in self.hosts.items())
+
+    def state(self, host: str) -> str:
+        with self._lock:
+            circuit = self.hosts.get(host)
+            if circuit is None:
+                return CLOSED
+            if circuit.state == OPEN and self._retry_in(circuit) == 0:
+                return HALF_OPEN
+            return circuit.state
+
+    def report(self) -> Dict[str, dict]:
+        """
+        State of every host seen so far, e.g. for health checks and logs.
+        """
+        with self._lock:
+            return {host: {"state": circuit.state,
+                           "failures": circuit.failures,
+                           "retry_in": self._retry_in(circuit) if circuit.state == OPEN else 0.0}
+                    for host, circuit in self.hosts.items()}
+
+    def _retry_in(self, circuit: CircuitState) -> float:
+        return max(0.0, circuit.opened_at + self.recovery_timeout - self.clock())
+
+    def before_request(self, host: str):
+        with self._lock:
+            circuit = self.hosts.setdefault(host, CircuitState())
+            if circuit.state == CLOSED:
+                return
+            if circuit.state == OPEN:
+                retry_in = self._retry_in(circuit)
+                if retry_in > 0:
+                    raise CircuitOpenError(host, retry_in)
+                circuit.state = HALF_OPEN
+            # half-open: only one probe at a time
+            if circuit.probing:
+                raise CircuitOpenError(host, 0.0)
+            circuit.probing = True
+
+    def record_success(self, host: str):
+        with self._lock:
+            self.hosts[host] = CircuitState()
+
+    def record_failure(self, host: str):
+        with self._lock:
+            circuit = self.hosts.setdefault(host, CircuitState())
+            circuit.failures += 1
+            circuit.probing = False
+            if circuit.state == HALF_OPEN or circuit.failures >= self.failure_threshold:
+                circuit.state = OPEN
+                circuit.opened_at = self.clock()
+
+    def release(self, host: str):
+        with self._lock:
+            circuit = self.hosts.get(host)
+            if circuit is not None:
+                circuit.probing = False
+
+    def guard(self, url, base_url=None) -> "_CircuitCall":
+        return _CircuitCall(self, host_of(url, base_url))
+
+
+def host_of(url, base_url=None) -> str:
+    url = httpx.URL(str(url))
+    if base_url is not None and url.is_relative_url:
+        url = httpx.URL(str(base_url)).join(url)
+    return url.netloc.decode("ascii")
+
+
+def is_failure(status_code: int) -> bool:
+    return status_code >= 500
+
+
+class _CircuitCall(object):
+    def __init__(self, breaker: CircuitBreaker, host: str):
+        self.breaker = breaker
+        self.host = host
+        self.status_code: Optional[int] = None
+
+    def record(self, resp: httpx.Response):
+        self.status_code = resp.status_code
+
+    def __enter__(self):
+        self.breaker.before_request(self.host)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            failed = issubclass(exc_type, httpx.TransportError)
+        else:
+            failed = self.status_code is not None and is_failure(self.status_code)
+        if failed:
+            self.breaker.record_failure(self.host)
+        elif exc_type is None:
+            self.breaker.record_success(self.host)
+        else:
+            # not the host's fault (e.g. cancelled): just free the probe slot
+            self.breaker.release(self.host)
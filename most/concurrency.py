@@ -0,0 +1,127 @@
+import asyncio
+import re
+import time
+from typing import Dict, Hashable, Optional
+
+import httpx
+
+
+class AdaptiveConcurrencyLimiter(object):
+    """
+    AIMD (additive-increase/multiplicative-decrease) limit on the number
+    of in-flight requests of an AsyncMostClient and its clones.
+
+    Every successful response grows the limit by ``increase / limit``
+    (about +``increase`` per round of requests). A 429/5xx response,
+    a transport error, or a latency above ``latency_tolerance`` times the
+    best latency observed for the same route shrinks it by ``backoff``,
+    at most once per observed round-trip so a burst of failures counts
+    as one signal.
+    """
+
+    def __init__(self,
+                 initial_limit: float = 16,
+                 min_limit: float = 1,
+                 max_limit: float = 1000,
+                 increase: float = 1.0,
+                 backoff: float = 0.5,
+                 latency_tolerance: Optional[float] = 3.0):
+        self.limit = float(initial_limit)
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.increase = increase
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.in_flight = 0
+        self.min_latency: Dict[Hashable, float] = {}
+        self._last_decrease = 0.0
+        self._condition: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def __repr__(self):
+        return "<AdaptiveConcurrencyLimiter(limit=%.1f, in_flight=%d)>" % (self.limit, self.in_flight)
+
+    @property
+    def condition(self) -> asyncio.Condition:
+        # a Condition is bound to the loop it is first used in,
+        # the limiter outlives it when reused across asyncio.run() calls
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+        return self._condition
+
+    async def acquire(self):
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < max(int(self.limit), 1))
+            self.in_flight += 1
+
+    async def release(self, latency: float, overloaded: bool,
+                      route: Hashable = None):
+        self.observe(latency, overloaded, route)
+        async with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def observe(self, latency: float, overloaded: bool,
+                route: Hashable = None):
+        now = time.monotonic()
+        # the baseline comes from healthy responses only: an instant 429
+        # would make every normal response after it look slow
+        min_latency = self.min_latency.get(route)
+        if not overloaded:
+            if min_latency is None or latency < min_latency:
+                self.min_latency[route] = latency
+            elif self.latency_tolerance is not None:
+                overloaded = latency > min_latency * self.latency_tolerance
+
+        if overloaded:
+            # one decrease per round-trip: responses of the same round carry the same signal
+            if now - self._last_decrease >= latency:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self._last_decrease = now
+        else:
+            self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+
+    def slot(self, method: str = "GET", url=None) -> "_LimiterSlot":
+        return _LimiterSlot(self, route_of(method, url))
+
+
+def is_overloaded(status_code: int) -> bool:
+    return status_code == 429 or status_code >= 500
+
+
+_ID_RE = re.compile(r"(?<=/)(most-)?[0-9a-fA-F]{24}(?=/|$)")
+
+
+def route_of(method: str, url) -> str:
+    """
+    Route key for latency baselines: ids are masked, so that
+    /{client}/audio/{id}/model/{model}/apply is one route for all audios.
+    """
+    path = httpx.URL(str(url)).path if url is not None else ""
+    return method.upper() + " " + _ID_RE.sub("{id}", path)
+
+
+class _LimiterSlot(object):
+    def __init__(self, limiter: AdaptiveConcurrencyLimiter, route: Hashable):
+        self.limiter = limiter
+        self.route = route
+        self.status_code: Optional[int] = None
+        self.started = 0.0
+
+    def record(self, resp: httpx.Response):
+        self.status_code = resp.status_code
+
+    async def __aenter__(self):
+        await self.limiter.acquire()
+        self.started = time.monotonic()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        latency = time.monotonic() - self.started
+        if exc_type is not None:
+            overloaded = issubclass(exc_type, httpx.TransportError)
+        else:
+            overloaded = self.status_code is not None and is_overloaded(self.status_code)
+        await self.limiter.release(latency, overloaded, self.route)
@@ -0,0 +1,283 @@
+import dataclasses
+import gc
+import threading
+import types
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Literal, Union, get_args, get_origin, get_type_hints
+
+
+class DecodeError(ValueError):
+    pass
+
+
+def load_int(x):
+    return x if isinstance(x, int) else int(x)
+
+
+def load_float(x):
+    return x if isinstance(x, float) else float(x)
+
+
+def load_scalar(x):
+    return int(x) if isinstance(x, int) else float(x) if isinstance(x, float) else str(x)
+
+
+def load_datetime(x):
+    if isinstance(x, (int, float)):
+        return datetime.fromtimestamp(x).astimezone(tz=timezone.utc)
+    return datetime.fromisoformat(x)
+
+
+# loaders shared with MostClient.retort / AsyncMostClient.retort
+SCALAR_LOADERS: Dict[Any, Callable[[Any], Any]] = {
+    int: load_int,
+    float: load_float,
+    Union[str, int, float]: load_scalar,
+    datetime: load_datetime,
+}
+
+
+
+class LazyRetort(object):
+    """
+    ``retort`` class attribute of the clients: the adaptix Retort with
+    SCALAR_LOADERS is built on first access, so importing the clients
+    does not import adaptix. Responses are decoded with decode().
+    """
+    def __init__(self):
+        self._retort = None
+
+    def __get__(self, instance, owner):
+        if self._retort is None:
+            from adaptix import Retort, loader
+            self._retort = Retort(recipe=[
+                loader(tp, load) for tp, load in SCALAR_LOADERS.items()
+            ])
+        return self._retort
+
+
+_SIMPLE_TYPES = (str, int, float, bool, type(None))
+
+_decoders: Dict[Any, Callable[[Any], Any]] = {}
+
+
+def decoder_for(tp) -> Callable[[Any], Any]:
+    """
+    Decoder of JSON data into ``tp``, built once per type.
+
+    Produces the same objects as ``MostClient.retort.load(data, tp)`` for
+    the response types of the API. Each dataclass gets a generated
+    function with scalar fields checked inline and positional
+    construction, so no type is inspected at decode time.
+    """
+    try:
+        return _decoders[tp]
+    except KeyError:
+        pass
+    if dataclasses.is_dataclass(tp):
+        return _compile_dataclass(tp)
+    decoder = _decoders[tp] = _compile(tp)
+    return decoder
+
+
+def decode(data, tp, pause_gc: bool = False):
+    """
+    Decodes data into ``tp``. With pause_gc=True cyclic garbage collection
+    is paused while decoding: worth it for bulk responses (search, list
+    and results pages), where the allocated objects trigger full GC
+    passes, but it affects the whole process, so it is not the default.
+    """
+    decoder = decoder_for(tp)
+    if not pause_gc:
+        return decoder(data)
+    with _gc_paused():
+        return decoder(data)
+
+
+_gc_lock = threading.Lock()
+_gc_pauses = 0
+_gc_was_enabled = False
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Decoded responses are trees without reference cycles, but allocating
+    thousands of objects triggers full cyclic GC passes that take more
+    time than decoding itself. Collection is paused while any thread
+    decodes with pause_gc=True and restored to its previous state
+    afterwards.
+    """
+    global _gc_pauses, _gc_was_enabled
+    with _gc_lock:
+        if _gc_pauses == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pauses += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_pauses -= 1
+            if _gc_pauses == 0 and _gc_was_enabled:
+                gc.enable()
+
+
+def _compile(tp) -> Callable[[Any], Any]:
+    if tp in SCALAR_LOADERS:
+        return SCALAR_LOADERS[tp]
+    if tp is Any:
+        return _identity
+    if tp in (str, bool):
+        return _exact_type(tp)
+
+    origin, args = get_origin(tp), get_args(tp)
+    if origin in (Union, types.UnionType):
+        return _compile_union(tp, args)
+    if origin in (list, List):
+        return _compile_list(decoder_for(args[0]))
+    if origin in (dict, Dict):
+        return _compile_dict(decoder_for(args[1]))
+    if origin is Literal:
+        return _compile_literal(args)
+    raise TypeError("Can't build a decoder for %r" % (tp,))
+
+
+def _identity(x):
+    return x
+
+
+def _exact_type(tp):
+    def decode(x):
+        if type(x) is not tp:
+            raise DecodeError("Expected %s, got %r" % (tp.__name__, x))
+        return x
+    return decode
+
+
+def _compile_union(tp, args):
+    if len(args) == 2 and type(None) in args:
+        inner = decoder_for(args[0] if args[1] is type(None) else args[1])
+
+        def decode_optional(x):
+            return None if x is None else inner(x)
+        return decode_optional
+
+    if all(arg in _SIMPLE_TYPES for arg in args):
+        allowed = frozenset(args)
+
+        def decode_simple(x):
+            if type(x) not in allowed:
+                raise DecodeError("Expected %r, got %r" % (tp, x))
+            return x
+        return decode_simple
+
+    options = [decoder_for(arg) for arg in args]
+
+    def decode_union(x):
+        errors = []
+        for option in options:
+            try:
+                return option(x)
+            except (DecodeError, TypeError, ValueError) as e:
+                errors.append(e)
+        raise DecodeError("No variant of %r matched: %s" % (tp, errors))
+    return decode_union
+
+
+def _compile_list(item_decoder):
+    def decode_list(x):
+        if type(x) is not list:
+            raise DecodeError("Expected list, got %r" % (x,))
+        return list(map(item_decoder, x))
+    return decode_list
+
+
+def _compile_dict(value_decoder):
+    def decode_dict(x):
+        if type(x) is not dict:
+            raise DecodeError("Expected dict, got %r" % (x,))
+        return {key: value_decoder(value) for key, value in x.items()}
+    return decode_dict
+
+
+def _compile_literal(values):
+    allowed = frozenset(values)
+
+    def decode_literal(x):
+        if x not in allowed:
+            raise DecodeError("Expected one of %s, got %r" % (sorted(allowed), x))
+        return x
+    return decode_literal
+
+
+def _field_check(tp, var: str, dec: str) -> List[str]:
+    """
+    Source lines that validate/convert ``var`` of type ``tp`` in place.
+    Scalars are checked inline, everything else calls its decoder.
+    """
+    optional = False
+    if get_origin(tp) in (Union, types.UnionType) and type(None) in get_args(tp):
+        args = [arg for arg in get_args(tp) if arg is not type(None)]
+        if len(args) == 1:
+            optional, tp = True, args[0]
+    if tp is str or tp is bool:
+        line = "if type(%s) is not %s: raise DecodeError('Expected %s, got %%r' %% (%s,))" % (var, tp.__name__, tp.__name__, var)
+    elif tp is int or tp is float:
+        line = "if type(%s) is not %s: %s = load_%s(%s)" % (var, tp.__name__, var, tp.__name__, var)
+    elif tp is Any:
+        return []
+    else:
+        line = "%s = %s(%s)" % (var, dec, var)
+    if optional:
+        return ["if %s is not None:" % var, "    " + line]
+    return [line]
+
+
+def _compile_dataclass(cls):
+    # registered before its fields, so self-referencing types terminate
+    _decoders[cls] = lambda x: _decoders[cls](x)
+    try:
+        decoder = _decoders[cls] = _generate_dataclass_decoder(cls)
+    except Exception:
+        del _decoders[cls]
+        raise
+    return decoder
+
+
+def _generate_dataclass_decoder(cls):
+    hints = get_type_hints(cls)
+    namespace = {"cls": cls, "DecodeError": DecodeError, "MISSING": dataclasses.MISSING,
+                 "load_int": load_int, "load_float": load_float}
+    body = ["if type(x) is not dict:",
+            "    raise DecodeError('Expected %s object, got %%r' %% (x,))" % cls.__name__]
+    args = []
+    for i, f in enumerate(f for f in dataclasses.fields(cls) if f.init):
+        var, dec = "v%d" % i, "decode_%d" % i
+        namespace[dec] = decoder_for(hints[f.name])
+        check = _field_check(hints[f.name], var, dec)
+        if f.default is dataclasses.MISSING and f.default_factory is dataclasses.MISSING:
+            body += ["%s = x.get(%r, MISSING)" % (var, f.name),
+                     "if %s is MISSING:" % var,
+                     "    raise DecodeError(%r)" % ("%s: missing required field %r" % (cls.__name__, f.name))]
+            body += check
+        else:
+            if f.default is not dataclasses.MISSING:
+                namespace["default_%d" % i] = f.default
+                default = "default_%d" % i
+            else:
+                namespace["factory_%d" % i] = f.default_factory
+                default = "factory_%d()" % i
+            body += ["%s = x.get(%r, MISSING)" % (var, f.name),
+                     "if %s is MISSING:" % var,
+                     "    %s = %s" % (var, default)]
+            if check:
+                body += ["else:"] + ["    " + line for line in check]
+        args.append("%s=%s" % (f.name, var) if f.kw_only else var)
+    body.append("return cls(%s)" % ", ".join(args))
+
+    name = "decode_%s" % cls.__name__
+    source = "def %s(x):\n%s\n" % (name, "\n".join("    " + line for line in body))
+    exec(compile(source, "<decoder %s.%s>" % (cls.__module__, cls.__qualname__), "exec"), namespace)
+    return namespace[name]
@@ -0,0 +1,97 @@
+import json
+from typing import Any, Callable, NamedTuple, Optional
+
+import httpx
+
+
+class JSONBackend(NamedTuple):
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+def _stdlib_backend() -> JSONBackend:
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return JSONBackend("json", dumps, json.loads)
+
+
+def _orjson_backend() -> JSONBackend:
+    import orjson
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return JSONBackend("orjson", dumps, orjson.loads)
+
+
+def _msgspec_backend() -> JSONBackend:
+    import msgspec
+    return JSONBackend("msgspec", msgspec.json.Encoder().encode, msgspec.json.Decoder().decode)
+
+
+_BACKENDS = {
+    "orjson": _orjson_backend,
+    "msgspec": _msgspec_backend,
+    "json": _stdlib_backend,
+}
+
+
+def load_backend(name: Optional[str] = None) -> JSONBackend:
+    """
+    orjson or msgspec when installed, stdlib json otherwise.
+    """
+    if name is not None:
+        if name not in _BACKENDS:
+            raise ValueError("Unknown JSON backend %r, expected one of %s" % (name, list(_BACKENDS)))
+        return _BACKENDS[name]()
+    for factory in _BACKENDS.values():
+        try:
+            return factory()
+        except ImportError:
+            continue
+
+
+backend = load_backend()
+
+
+def set_backend(name_or_backend) -> JSONBackend:
+    """
+    Switches JSON encoding/decoding of all clients, e.g. set_backend("json")
+    or set_backend(JSONBackend("ujson", custom_dumps, ujson.loads)).
+    """
+    global backend
+    if not isinstance(name_or_backend, JSONBackend):
+        name_or_backend = load_backend(name_or_backend)
+    backend = name_or_backend
+    return backend
+
+
+def dumps(obj) -> bytes:
+    return backend.dumps(obj)
+
+
+def loads(data):
+    return backend.loads(data)
+
+
+def response_json(resp: httpx.Response):
+    content = resp.content
+    if not isinstance(content, (bytes, bytearray)):
+        # response doubles without a body: let them decode themselves
+        return resp.json()
+    return backend.loads(content)
+
+
+def encode_json_body(kwargs: dict) -> dict:
+    """
+    Replaces ``json=`` of httpx request kwargs with an encoded body,
+    so retries and 401 resends do not serialize it again.
+    """
+    if "json" not in kwargs:
+        return kwargs
+    kwargs = dict(kwargs)
+    data = kwargs.pop("json")
+    if data is not None:
+        kwargs["content"] = backend.dumps(data)
+        kwargs["headers"] = {**(kwargs.get("headers") or {}), "Content-Type": "application/json"}
+    return kwargs
@@ -0,0 +1,237 @@
+import math
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Literal, Optional, Sequence
+
+from .local_search import AGGREGATIONS
+from .score_calculation import ScoreCalculation
+from .score_matrix import ScoreMatrix
+from .search_types import AggregatedAllField, AggregatedColumnField, AggregatedField, AggregatedResultsCondition
+from .types import Script
+
+Aggregation = Literal["sum", "avg", "min", "max"]
+
+
+@dataclass
+class GroupAggregate:
+    """
+    Statistics of the per-result aggregates of one group, results without
+    scores in the aggregated fields are not counted.
+    """
+    count: int = 0
+    sum: float = 0.0
+    min: float = math.inf
+    max: float = -math.inf
+
+    @property
+    def avg(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+
+class LocalAggregator(object):
+    """
+    Client-side counterpart of AggregatedResultsCondition: the sum / avg /
+    min / max of the fields of every result, computed over a ScoreMatrix,
+    optionally grouped by a data key:
+
+        aggregator = LocalAggregator(script, [AggregatedAllField()], "avg", model_id="model")
+        per_manager = aggregator.group_by(mirrored, "manager")
+        per_manager["Иван"].avg
+
+    Semantics follow LocalFilter: None scores are skipped, results without
+    scores in the fields have no aggregate, with score_calculation scores
+    are modified first (modified=True). Field indexes are positions in the
+    script, as in the results the server returns.
+
+    numpy, when installed, aggregates whole matrix columns at once, the
+    pure Python path gives the same numbers.
+    """
+
+    def __init__(self,
+                 script: Script,
+                 fields: Sequence[AggregatedField | AggregatedColumnField | AggregatedAllField],
+                 aggregation: Aggregation = "sum",
+                 model_id: Optional[str] = None,
+                 score_calculation: Optional[ScoreCalculation] = None,
+                 use_numpy: Optional[bool] = None):
+        if aggregation not in AGGREGATIONS:
+            raise ValueError("Unknown aggregation %r" % (aggregation,))
+        self.script = script
+        self.fields = list(fields)
+        self.aggregation = aggregation
+        self.model_id = model_id
+        self.score_calculation = score_calculation
+        self.use_numpy = use_numpy
+        self.field_idx = _field_indexes(script, self.fields)
+
+    @classmethod
+    def from_condition(cls,
+                       condition: AggregatedResultsCondition,
+                       script: Script,
+                       score_modifiers: Optional[Dict[str, ScoreCalculation]] = None,
+                       use_numpy: Optional[bool] = None) -> "LocalAggregator":
+        """
+        Aggregator of the condition's fields, its bounds are not applied
+        (LocalFilter filters by them).
+        """
+        score_calculation = None
+        if condition.modified:
+            if score_modifiers is None or condition.model_id not in score_modifiers:
+                raise ValueError("Condition %r needs score_modifiers[%r]" % (condition, condition.model_id))
+            score_calculation = score_modifiers[condition.model_id]
+        return cls(script, condition.fields, condition.aggregation,
+                   model_id=condition.model_id,
+                   score_calculation=score_calculation,
+                   use_numpy=use_numpy)
+
+    def values(self, matrix: ScoreMatrix) -> List[Optional[float]]:
+        """
+        Aggregate of every row of matrix, None for rows without scores.
+        """
+        np = self._numpy()
+        if np is not None:
+            values, has_value = self._values_numpy(np, matrix)
+            return [float(value) if has else None for value, has in zip(values.tolist(), has_value.tolist())]
+        return self._values_python(matrix)
+
+    def aggregate(self, matrix: ScoreMatrix, groups: Sequence[Any]) -> Dict[Any, GroupAggregate]:
+        """
+        GroupAggregate per group, groups[i] is the group of row i.
+        """
+        if len(groups) != len(matrix):
+            raise ValueError("Expected %d groups, got %d" % (len(matrix), len(groups)))
+
+        np = self._numpy()
+        if np is None:
+            stats: Dict[Any, GroupAggregate] = {}
+            for group, value in zip(groups, self._values_python(matrix)):
+                group_stats = stats.get(group)
+                if group_stats is None:
+                    group_stats = stats[group] = GroupAggregate()
+                if value is not None:
+                    group_stats.count += 1
+                    group_stats.sum += value
+                    group_stats.min = min(group_stats.min, value)
+                    group_stats.max = max(group_stats.max, value)
+            return stats
+
+        codes: Dict[Any, int] = {}
+        group_codes = np.fromiter((codes.setdefault(group, len(codes)) for group in groups),
+                                  dtype=np.intp, count=len(groups))
+        values, has_value = self._values_numpy(np, matrix)
+        group_codes, values = group_codes[has_value], values[has_value].astype(np.float64)
+        counts = np.bincount(group_codes, minlength=len(codes))
+        sums = np.bincount(group_codes, weights=values, minlength=len(codes))
+        mins = np.full(len(codes), math.inf)
+        maxs = np.full(len(codes), -math.inf)
+        np.minimum.at(mins, group_codes, values)
+        np.maximum.at(maxs, group_codes, values)
+        return {group: GroupAggregate(int(counts[code]), float(sums[code]), float(mins[code]), float(maxs[code]))
+                for group, code in codes.items()}
+
+    def group_by(self,
+                 items: Iterable,
+                 key: str | Callable[[Any], Any]) -> Dict[Any, GroupAggregate]:
+        """
+        GroupAggregate per value of ``data[key]`` (or of ``key(item)``) of
+        StoredAudioData / StoredTextData items, None for items without it.
+        """
+        get_group = key if callable(key) else _data_value(key)
+        matrix = ScoreMatrix(self.script, self.model_id)
+        groups = []
+        for item in items:
+            matrix.append(item)
+            groups.append(get_group(item))
+        return self.aggregate(matrix, groups)
+
+    def _numpy(self):
+        if self.use_numpy is False:
+            return None
+        try:
+            import numpy
+        except ImportError:
+            if self.use_numpy:
+                raise
+            return None
+        return numpy
+
+    def _values_numpy(self, np, matrix: ScoreMatrix):
+        n_rows = len(matrix)
+        if not self.field_idx:
+            return np.zeros(n_rows), np.zeros(n_rows, dtype=np.bool_)
+
+        scores, missing = matrix.to_numpy()
+        scores, missing = scores[:, self.field_idx], missing[:, self.field_idx]
+        if self.score_calculation is not None:
+            scores = self.score_calculation.modify_matrix([matrix.columns[j] for j in self.field_idx], scores)
+
+        present = ~missing
+        counts = present.sum(axis=1)
+        has_value = counts > 0
+        if self.aggregation in ("sum", "avg"):
+            values = np.where(present, scores, 0).sum(axis=1)
+            if self.aggregation == "avg":
+                values = values / np.maximum(counts, 1)
+        elif self.aggregation == "min":
+            values = np.where(present, scores, np.iinfo(np.int64).max).min(axis=1)
+        else:
+            values = np.where(present, scores, np.iinfo(np.int64).min).max(axis=1)
+        return values, has_value
+
+    def _values_python(self, matrix: ScoreMatrix) -> List[Optional[float]]:
+        field_idx = self.field_idx
+        tables = [None] * len(field_idx)
+        if self.score_calculation is not None:
+            by_subcolumn = self.score_calculation.compiled.forward.by_subcolumn
+            tables = [by_subcolumn.get(matrix.columns[j]) for j in field_idx]
+        aggregate = AGGREGATIONS[self.aggregation]
+
+        step = len(matrix.columns)
+        scores, missing = matrix.scores, matrix.missing
+        values = []
+        for base in range(0, len(matrix) * step, step):
+            row = []
+            for j, table in zip(field_idx, tables):
+                if missing[base + j]:
+                    continue
+                score = scores[base + j]
+                if table is not None:
+                    score = table.get(score, score)
+                row.append(score)
+            values.append(float(aggregate(row)) if row else None)
+        return values
+
+
+def _field_indexes(script: Script, fields) -> List[int]:
+    """
+    ScoreMatrix columns of the fields, in the order LocalFilter reads them.
+    """
+    offsets = []
+    offset = 0
+    for column in script.columns:
+        offsets.append(offset)
+        offset += len(column.subcolumns)
+
+    idx = []
+    for field in fields:
+        if isinstance(field, AggregatedField):
+            if field.column_idx < len(offsets) and \
+                    field.subcolumn_idx < len(script.columns[field.column_idx].subcolumns):
+                idx.append(offsets[field.column_idx] + field.subcolumn_idx)
+        elif isinstance(field, AggregatedColumnField):
+            if field.column_idx < len(offsets):
+                start = offsets[field.column_idx]
+                idx.extend(range(start, start + len(script.columns[field.column_idx].subcolumns)))
+        elif isinstance(field, AggregatedAllField):
+            idx.extend(range(offset))
+        else:
+            raise TypeError("Can't aggregate %r locally" % (field,))
+    return idx
+
+
+def _data_value(key: str):
+    def value(item):
+        data = item.data
+        if data is None:
+            return None
+        return data.get(key)
+    return value
@@ -0,0 +1,311 @@
+import operator
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .score_calculation import ScoreCalculation
+from .search_types import (
+    AggregatedAllField,
+    AggregatedColumnField,
+    AggregatedField,
+    AggregatedResultsCondition,
+    ChannelsCondition,
+    DurationCondition,
+    ExistsResultsCondition,
+    IDCondition,
+    ResultsCondition,
+    SearchParams,
+    StoredInfoCondition,
+    TagsCondition,
+    URLCondition,
+)
+from .types import StoredAudioData, StoredTextData
+
+Predicate = Callable[[StoredAudioData | StoredTextData], bool]
+
+_COMPARISONS = {
+    "greater_than": operator.gt,
+    "not_greater_than": operator.le,
+    "less_than": operator.lt,
+    "not_less_than": operator.ge,
+}
+
+
+class LocalFilter(object):
+    """
+    SearchParams compiled once into a predicate over StoredAudioData /
+    StoredTextData (or their raw views), to slice mirrored data without
+    a request per slice:
+
+        matches = LocalFilter(filter)
+        calls = matches.filter(mirrored)
+
+    Semantics follow the search API: ``must`` - all conditions match,
+    ``should`` - at least one matches (when given), ``must_not`` - none
+    matches, ``should_not`` - at least one does not match (when given).
+    Fields of one condition must all match. Objects without the data a
+    condition needs (no info key, no results of the model) do not match it.
+
+    :param score_modifiers: ScoreCalculation per model_id, required by
+        conditions with modified=True
+    :param tags_of: tags of an object, ``data["tags"]`` by default
+    """
+
+    def __init__(self,
+                 filter: Optional[SearchParams] = None,
+                 score_modifiers: Optional[Dict[str, ScoreCalculation]] = None,
+                 tags_of: Optional[Callable[[StoredAudioData | StoredTextData], Iterable[str]]] = None):
+        if filter is None:
+            filter = SearchParams()
+        self.search_params = filter
+        self.score_modifiers = score_modifiers or {}
+        self.tags_of = tags_of or _info_tags
+        self.predicate = self._compile(filter)
+
+    def __call__(self, item) -> bool:
+        return self.predicate(item)
+
+    def filter(self, items: Iterable) -> List:
+        return [item for item in items if self.predicate(item)]
+
+    def mask(self, items: Iterable) -> List[bool]:
+        return [self.predicate(item) for item in items]
+
+    def count(self, items: Iterable) -> int:
+        return sum(map(self.predicate, items))
+
+    def _compile(self, filter: SearchParams) -> Predicate:
+        must = [self._condition(c) for c in filter.must]
+        should = [self._condition(c) for c in filter.should]
+        must_not = [self._condition(c) for c in filter.must_not]
+        should_not = [self._condition(c) for c in filter.should_not]
+
+        def predicate(item) -> bool:
+            for matches in must:
+                if not matches(item):
+                    return False
+            for matches in must_not:
+                if matches(item):
+                    return False
+            if should and not any(matches(item) for matches in should):
+                return False
+            if should_not and all(matches(item) for matches in should_not):
+                return False
+            return True
+        return predicate
+
+    def _condition(self, condition) -> Predicate:
+        if isinstance(condition, IDCondition):
+            return _on_value(_id, _value_checks(condition, match_field="equal"))
+        if isinstance(condition, StoredInfoCondition):
+            return _on_value(_info(condition.key), _value_checks(condition))
+        if isinstance(condition, DurationCondition):
+            return _on_value(_info("duration"), _value_checks(condition))
+        if isinstance(condition, ChannelsCondition):
+            return _on_value(_info("channels"), _value_checks(condition, match_field="equal"))
+        if isinstance(condition, URLCondition):
+            return _on_value(_url, _value_checks(condition))
+        if isinstance(condition, TagsCondition):
+            return self._tags(condition)
+        if isinstance(condition, ExistsResultsCondition):
+            return _exists_results(condition.model_id)
+        if isinstance(condition, ResultsCondition):
+            return self._results(condition)
+        if isinstance(condition, AggregatedResultsCondition):
+            return self._aggregated_results(condition)
+        raise TypeError("Can't evaluate %r locally" % (condition,))
+
+    def _tags(self, condition: TagsCondition) -> Predicate:
+        if condition.in_set is None:
+            return _always
+        in_set = frozenset(condition.in_set)
+        tags_of = self.tags_of
+
+        def matches(item) -> bool:
+            return not in_set.isdisjoint(tags_of(item))
+        return matches
+
+    def _score_mapping(self, condition) -> Optional[Dict[tuple, int]]:
+        if not condition.modified:
+            return None
+        if condition.model_id not in self.score_modifiers:
+            raise ValueError("Condition %r needs score_modifiers[%r]" % (condition, condition.model_id))
+        return self.score_modifiers[condition.model_id].compiled.forward.scores
+
+    def _results(self, condition: ResultsCondition) -> Predicate:
+        model_id, column_idx, subcolumn_idx = condition.model_id, condition.column_idx, condition.subcolumn_idx
+        score_mapping = self._score_mapping(condition)
+        checks = []
+        if condition.score_equal is not None:
+            checks.append((operator.eq, condition.score_equal))
+        for name, compare in _COMPARISONS.items():
+            bound = getattr(condition, "score_" + name)
+            if bound is not None:
+                checks.append((compare, bound))
+        in_set = frozenset(condition.score_in_set) if condition.score_in_set is not None else None
+
+        def matches(item) -> bool:
+            try:
+                column = item.results[model_id][column_idx]
+                subcolumn = column.subcolumns[subcolumn_idx]
+            except (TypeError, KeyError, IndexError):
+                return False
+            score = subcolumn.score
+            if score is None:
+                return False
+            if score_mapping is not None:
+                score = score_mapping.get((column.name, subcolumn.name, score), score)
+            if in_set is not None and score not in in_set:
+                return False
+            for compare, bound in checks:
+                if not compare(score, bound):
+                    return False
+            return True
+        return matches
+
+    def _aggregated_results(self, condition: AggregatedResultsCondition) -> Predicate:
+        model_id = condition.model_id
+        score_mapping = self._score_mapping(condition)
+        aggregate = AGGREGATIONS[condition.aggregation]
+        checks = [(compare, getattr(condition, name)) for name, compare in _COMPARISONS.items()
+                  if getattr(condition, name) is not None]
+        selectors = [_field_selector(field) for field in condition.fields]
+
+        def matches(item) -> bool:
+            try:
+                columns = item.results[model_id]
+            except (TypeError, KeyError):
+                return False
+            if columns is None:
+                return False
+            scores = []
+            for select in selectors:
+                for column, subcolumn in select(columns):
+                    score = subcolumn.score
+                    if score is None:
+                        continue
+                    if score_mapping is not None:
+                        score = score_mapping.get((column.name, subcolumn.name, score), score)
+                    scores.append(score)
+            if not scores:
+                return False
+            value = aggregate(scores)
+            for compare, bound in checks:
+                if not compare(value, bound):
+                    return False
+            return True
+        return matches
+
+
+# AggregatedResultsCondition.aggregation -> function of the scores, shared with LocalAggregator
+AGGREGATIONS = {
+    "sum": sum,
+    "avg": lambda scores: sum(scores) / len(scores),
+    "min": min,
+    "max": max,
+}
+
+
+def _field_selector(field):
+    if isinstance(field, AggregatedField):
+        def select(columns):
+            if field.column_idx < len(columns):
+                column = columns[field.column_idx]
+                if field.subcolumn_idx < len(column.subcolumns):
+                    yield column, column.subcolumns[field.subcolumn_idx]
+    elif isinstance(field, AggregatedColumnField):
+        def select(columns):
+            if field.column_idx < len(columns):
+                column = columns[field.column_idx]
+                for subcolumn in column.subcolumns:
+                    yield column, subcolumn
+    elif isinstance(field, AggregatedAllField):
+        def select(columns):
+            for column in columns:
+                for subcolumn in column.subcolumns:
+                    yield column, subcolumn
+    else:
+        raise TypeError("Can't aggregate %r locally" % (field,))
+    return select
+
+
+_MISSING = object()
+
+
+def _id(item):
+    return item.id
+
+
+def _url(item):
+    return getattr(item, "url", _MISSING)
+
+
+def _info(key: str):
+    def value(item):
+        data = item.data
+        if data is None:
+            return _MISSING
+        return data.get(key, _MISSING)
+    return value
+
+
+def _info_tags(item) -> Iterable[str]:
+    tags = item.data.get("tags") if item.data is not None else None
+    if tags is None:
+        return ()
+    if isinstance(tags, str):
+        return (tags,)
+    return tags
+
+
+def _value_checks(condition, match_field: str = "match") -> List[Callable[[object], bool]]:
+    checks = []
+    match = getattr(condition, match_field, None)
+    if match is not None:
+        checks.append(lambda value: value == match)
+    in_set = getattr(condition, "in_set", None)
+    if in_set is not None:
+        allowed = frozenset(in_set)
+        checks.append(lambda value: value in allowed)
+    starts_with = getattr(condition, "starts_with", None)
+    if starts_with is not None:
+        checks.append(lambda value: isinstance(value, str) and value.startswith(starts_with))
+    ends_with = getattr(condition, "ends_with", None)
+    if ends_with is not None:
+        checks.append(lambda value: isinstance(value, str) and value.endswith(ends_with))
+    for name, compare in _COMPARISONS.items():
+        bound = getattr(condition, name, None)
+        if bound is not None:
+            checks.append(_comparison(compare, bound))
+    return checks
+
+
+def _comparison(compare, bound):
+    def check(value) -> bool:
+        try:
+            return compare(value, bound)
+        except TypeError:
+            # e.g. a string info value against a numeric bound
+            return False
+    return check
+
+
+def _on_value(get_value, checks) -> Predicate:
+    def matches(item) -> bool:
+        value = get_value(item)
+        if value is _MISSING or value is None:
+            return False
+        for check in checks:
+            if not check(value):
+                return False
+        return True
+    return matches
+
+
+def _exists_results(model_id: str) -> Predicate:
+    def matches(item) -> bool:
+        results = item.results
+        return results is not None and results.get(model_id) is not None
+    return matches
+
+
+def _always(item) -> bool:
+    return True
@@ -0,0 +1,74 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+Key = Tuple[str, Optional[str], str]
+
+
+@dataclass
+class CachedMetadata:
+    value: Any
+    etag: Optional[str]
+    fetched_at: float
+
+
+class ModelMetadataCache(object):
+    """
+    Model script, info, score mapping and the list of models, keyed by
+    (client_id, model_id, kind) and shared by a client and its clones,
+    so with_model()/list_models() handles do not fetch them again.
+
+    Entries are served for ``ttl`` seconds, then revalidated with
+    If-None-Match when the server sent an ETag (a 304 keeps the cached
+    value), or fetched again otherwise. Cached values are shared by all
+    handles and must not be modified.
+    """
+
+    def __init__(self,
+                 ttl: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self.entries: Dict[Key, CachedMetadata] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "<ModelMetadataCache(entries=%d, ttl=%s)>" % (len(self.entries), self.ttl)
+
+    def get(self, key: Key) -> Optional[CachedMetadata]:
+        with self._lock:
+            return self.entries.get(key)
+
+    def is_fresh(self, entry: CachedMetadata) -> bool:
+        return self.clock() - entry.fetched_at < self.ttl
+
+    def put(self, key: Key, value: Any, etag: Optional[str] = None) -> Any:
+        with self._lock:
+            self.entries[key] = CachedMetadata(value, etag, self.clock())
+        return value
+
+    def revalidated(self, key: Key, entry: CachedMetadata) -> Any:
+        """
+        Server answered 304 Not Modified: entry is fresh again.
+        """
+        with self._lock:
+            entry.fetched_at = self.clock()
+            self.entries[key] = entry
+        return entry.value
+
+    def invalidate(self, client_id: Optional[str] = None, model_id: Optional[str] = None):
+        """
+        Drops the entries of client_id (and model_id), everything when
+        client_id is None.
+        """
+        with self._lock:
+            for key in list(self.entries):
+                if (client_id is None or key[0] == client_id) and (model_id is None or key[1] == model_id):
+                    del self.entries[key]
+
+    @staticmethod
+    def request_headers(entry: Optional[CachedMetadata]) -> Dict[str, str]:
+        if entry is None or entry.etag is None:
+            return {}
+        return {"If-None-Match": entry.etag}
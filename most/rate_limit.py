@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Optional, Union
+
+import httpx
+
+
+ENDPOINT_FAMILIES = ("apply", "upload", "search", "etl", "anonymize")
+
+_FAMILY_BY_ACTION = {
+    "apply": "apply",
+    "apply_async": "apply",
+    "upload": "upload",
+    "upload_url": "upload",
+    "upload_text": "upload",
+    "upload_dialog": "upload",
+    "search": "search",
+    "count": "search",
+    "distinct": "search",
+    "search_elastic": "search",
+}
+
+
+def endpoint_family(url) -> Optional[str]:
+    """
+    Family of a MOST endpoint: apply, upload, search, etl (``/api/v1/*``
+    of the ETL API) or anonymize. None for everything else.
+    """
+    path = httpx.URL(str(url)).path.rstrip("/")
+    if path.endswith("/anonymize"):
+        return "anonymize"
+    if path.startswith("/api/v1/"):
+        return "etl"
+    return _FAMILY_BY_ACTION.get(path.rsplit("/", 1)[-1])
+
+
+class TokenBucket(object):
+    """
+    Thread-safe token bucket: ``rate`` requests per second with bursts
+    of up to ``capacity`` requests.
+
+    Callers reserve a token and sleep outside of the lock, so waiting
+    callers are served in order and the bucket can be shared by
+    threads and event loops at the same time.
+    """
+
+    def __init__(self, rate: float,
+                 capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1))
+        self.clock = clock
+        self.tokens = self.capacity
+        self.updated_at = clock()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "<TokenBucket(rate=%s, capacity=%s)>" % (self.rate, self.capacity)
+
+    def reserve(self) -> float:
+        """
+        Takes one token and returns how long the caller has to wait for it.
+        """
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class RateLimiter(object):
+    """
+    Client-side rate limits keyed by endpoint family, e.g.::
+
+        RateLimiter({"apply": 10, "upload": TokenBucket(rate=5, capacity=20)})
+
+    A number is a rate in requests per second. ``default`` limits
+    requests that belong to no configured family. Share one instance
+    between clients, clones and threads to split a single tenant quota.
+    """
+
+    def __init__(self,
+                 budgets: Dict[str, Union[float, TokenBucket]],
+                 default: Optional[Union[float, TokenBucket]] = None):
+        unknown = set(budgets) - set(ENDPOINT_FAMILIES)
+        if unknown:
+            raise ValueError("Unknown endpoint families: %s. Expected: %s" % (sorted(unknown), ENDPOINT_FAMILIES))
+        self.buckets: Dict[str, TokenBucket] = {family: self._as_bucket(budget)
+                                                for family, budget in budgets.items()}
+        self.default = self._as_bucket(default) if default is not None else None
+
+    @staticmethod
+    def _as_bucket(budget: Union[float, TokenBucket]) -> TokenBucket:
+        return budget if isinstance(budget, TokenBucket) else TokenBucket(rate=budget)
+
+    def bucket_for(self, url) -> Optional[TokenBucket]:
+        return self.buckets.get(endpoint_family(url), self.default)
+
+    def acquire(self, url):
+        bucket = self.bucket_for(url)
+        if bucket is not None:
+            bucket.acquire()
+
+    async def aacquire(self, url):
+        bucket = self.bucket_for(url)
+        if bucket is not None:
+            await bucket.aacquire()
@@ -1,7 +1,54 @@
-from typing import Dict, Tuple, List, Optional, Literal
+import sys
+from bisect import bisect_left
+from typing import Dict, Tuple, List, Optional, Literal, Sequence
 from dataclasses_json import dataclass_json, DataClassJsonMixin
 from dataclasses import dataclass, replace
-from .types import Result, ScriptScoreMapping, UpdateResult
+from .types import ColumnResult, Result, ScriptScoreMapping, SubcolumnResult, UpdateResult
+
+
+class _ScoreTable(object):
+    """
+    One direction of score_mapping, (column, subcolumn, score) -> score,
+    also indexed by column for results and by (column, subcolumn) for
+    score matrices.
+    """
+    __slots__ = ("scores", "by_column", "by_subcolumn")
+
+    def __init__(self, scores: Dict[Tuple[str, str, int], int]):
+        self.scores = scores
+        self.by_column: Dict[str, Dict[Tuple[str, int], int]] = {}
+        self.by_subcolumn: Dict[Tuple[str, str], Dict[int, int]] = {}
+        for (column, subcolumn, score), to_score in scores.items():
+            self.by_column.setdefault(column, {})[subcolumn, score] = to_score
+            self.by_subcolumn.setdefault((column, subcolumn), {})[score] = to_score
+
+
+class _CompiledMapping(object):
+    """
+    score_mapping indexed once: exact lookups in both directions and
+    per-(column, subcolumn) to_scores sorted for bisect.
+    """
+    __slots__ = ("forward", "backward", "forward_first", "backward_sorted")
+
+    def __init__(self, score_mapping: List[ScriptScoreMapping]):
+        # modify()/unmodify() let the last mapping win,
+        # *_single() return the first one, as they did with linear scans
+        forward: Dict[Tuple[str, str, int], int] = {}
+        backward: Dict[Tuple[str, str, int], int] = {}
+        self.forward_first: Dict[Tuple[str, str, int], int] = {}
+        backward_first: Dict[Tuple[str, str], Dict[int, int]] = {}
+        for sm in score_mapping:
+            forward[sm.column, sm.subcolumn, sm.from_score] = sm.to_score
+            backward[sm.column, sm.subcolumn, sm.to_score] = sm.from_score
+            self.forward_first.setdefault((sm.column, sm.subcolumn, sm.from_score), sm.to_score)
+            backward_first.setdefault((sm.column, sm.subcolumn), {}).setdefault(sm.to_score, sm.from_score)
+        self.forward = _ScoreTable(forward)
+        self.backward = _ScoreTable(backward)
+
+        self.backward_sorted: Dict[Tuple[str, str], Tuple[List[int], List[int]]] = {}
+        for key, from_scores in backward_first.items():
+            to_scores = sorted(from_scores)
+            self.backward_sorted[key] = (to_scores, [from_scores[to_score] for to_score in to_scores])
 
 
 @dataclass_json
@@ -9,96 +56,157 @@ from .types import Result, ScriptScoreMapping, UpdateResult
 class ScoreCalculation(DataClassJsonMixin):
     score_mapping: List[ScriptScoreMapping]
 
-    def modify(self, result: Optional[Result | UpdateResult]) -> Optional[Result | UpdateResult]:
-        score_mapping = {
-            (sm.column, sm.subcolumn, sm.from_score): sm.to_score
-            for sm in self.score_mapping
-        }
-        if result is None:
-            return None
+    @property
+    def compiled(self) -> _CompiledMapping:
+        # built on first use, score_mapping is not expected to change afterwards
+        compiled = self.__dict__.get("_compiled")
+        if compiled is None:
+            compiled = self.__dict__["_compiled"] = _CompiledMapping(self.score_mapping)
+        return compiled
 
-        if isinstance(result, UpdateResult):
-            if result.score is None:
-                return replace(result)
-            score = score_mapping.get((result.column_name,
-                                       result.subcolumn_name,
-                                       result.score),
-                                      result.score)
-            return replace(result, score=score)
-
-        result = replace(result)
-        if result.results is None:
-            return result
-
-        for column_result in result.results:
-            for subcolumn_result in column_result.subcolumns:
-                subcolumn_result.score = score_mapping.get((column_result.name,
-                                                            subcolumn_result.name,
-                                                            subcolumn_result.score),
-                                                           subcolumn_result.score)
-
-        return result
+    def modify(self, result: Optional[Result | UpdateResult]) -> Optional[Result | UpdateResult]:
+        return _remap(result, self.compiled.forward)
 
     def unmodify(self, result: Optional[Result | UpdateResult]) -> Optional[Result | UpdateResult]:
-        score_mapping = {
-            (sm.column, sm.subcolumn, sm.to_score): sm.from_score
-            for sm in self.score_mapping
-        }
-        if result is None:
-            return None
-
-        if isinstance(result, UpdateResult):
-            if result.score is None:
-                return replace(result)
-            score = score_mapping.get((result.column_name,
-                                       result.subcolumn_name,
-                                       result.score),
-                                      result.score)
-            return replace(result, score=score)
-
-        result = replace(result)
-        if result.results is None:
-            return result
-        for column_result in result.results:
-            for subcolumn_result in column_result.subcolumns:
-                subcolumn_result.score = score_mapping.get((column_result.name,
-                                                            subcolumn_result.name,
-                                                            subcolumn_result.score),
-                                                           subcolumn_result.score)
-
-        return result
+        return _remap(result, self.compiled.backward)
+
+    def modify_many(self,
+                    results: Sequence[Optional[Result | UpdateResult]],
+                    copy: bool = True) -> List[Optional[Result | UpdateResult]]:
+        """
+        modify() of every result. With copy=False the results themselves
+        get the remapped scores instead of copies, which saves a copy of
+        every Result on exports; remapped columns are new objects either way.
+        """
+        remap = _remap if copy else _remap_inplace
+        table = self.compiled.forward
+        return [remap(result, table) for result in results]
+
+    def unmodify_many(self,
+                      updates: Sequence[Optional[Result | UpdateResult]],
+                      copy: bool = True) -> List[Optional[Result | UpdateResult]]:
+        remap = _remap if copy else _remap_inplace
+        table = self.compiled.backward
+        return [remap(update, table) for update in updates]
+
+    def modify_matrix(self, columns: Sequence[Tuple[str, str]], scores):
+        """
+        Remaps a score matrix: scores[i][j] is the score of result i in
+        (column, subcolumn) columns[j]. A numpy 2d array is remapped column
+        by column with searchsorted (missing scores as NaN in float arrays),
+        a list of lists - into a new list of lists.
+        """
+        return _remap_matrix(columns, scores, self.compiled.forward)
+
+    def unmodify_matrix(self, columns: Sequence[Tuple[str, str]], scores):
+        return _remap_matrix(columns, scores, self.compiled.backward)
 
     def modify_single(self,
                       column: str, subcolumn: str,
                       from_score: int):
-        for sm in self.score_mapping:
-            if sm.column == column and sm.subcolumn == subcolumn and sm.from_score == from_score:
-                return sm.to_score
+        return self.compiled.forward_first.get((column, subcolumn, from_score))
 
     def unmodify_single(self,
                         column: str, subcolumn: str,
                         to_score: int,
                         bound: Literal["strict", "upper", "lower"] = "strict"):
-        upper_from_score = None
-        lower_from_score = None
-
-        for sm in self.score_mapping:
-            if sm.column == column and sm.subcolumn == subcolumn:
-                if sm.to_score == to_score:
-                    return sm.from_score
-
-                if sm.to_score > to_score:
-                    if upper_from_score is None or sm.to_score < upper_from_score[1]:
-                        upper_from_score = (sm.from_score, sm.to_score)
-                elif sm.to_score < to_score:
-                    if lower_from_score is None or sm.to_score > lower_from_score[1]:
-                        lower_from_score = (sm.from_score, sm.to_score)
-
-        if bound == "strict":
-            return None
-        elif bound == "upper" and upper_from_score is not None:
-            return upper_from_score[0]
-        elif bound == "lower" and lower_from_score is not None:
-            return lower_from_score[0]
+        """
+        from_score mapped to to_score. Otherwise, with bound="upper", the
+        one mapped to the nearest greater score, with bound="lower" - to
+        the nearest smaller one.
+        """
+        to_scores, from_scores = self.compiled.backward_sorted.get((column, subcolumn), ((), ()))
+        i = bisect_left(to_scores, to_score)
+        if i < len(to_scores) and to_scores[i] == to_score:
+            return from_scores[i]
+
+        if bound == "upper" and i < len(to_scores):
+            return from_scores[i]
+        elif bound == "lower" and i > 0:
+            return from_scores[i - 1]
         else:
             return None
+
+
+def _remap(result: Optional[Result | UpdateResult], table: _ScoreTable):
+    """
+    Copy of result with remapped scores. Columns and subcolumns without
+    remapped scores are shared with result, which is never modified.
+    """
+    if result is None:
+        return None
+
+    if isinstance(result, UpdateResult):
+        if result.score is None:
+            return replace(result)
+        return replace(result, score=table.scores.get((result.column_name,
+                                                       result.subcolumn_name,
+                                                       result.score),
+                                                      result.score))
+
+    if result.results is None:
+        return replace(result)
+    return replace(result, results=_remap_columns(result.results, table))
+
+
+def _remap_inplace(result: Optional[Result | UpdateResult], table: _ScoreTable):
+    """
+    Remaps the scores of result itself. Its columns and subcolumns may be
+    shared with copies made by modify() or Result.apply_edits(inplace=False),
+    so the remapped ones are replaced rather than modified.
+    """
+    if result is None:
+        return None
+
+    if isinstance(result, UpdateResult):
+        if result.score is not None:
+            result.score = table.scores.get((result.column_name, result.subcolumn_name, result.score),
+                                            result.score)
+        return result
+
+    if result.results is not None:
+        result.results = _remap_columns(result.results, table)
+    return result
+
+
+def _remap_columns(column_results: List[ColumnResult], table: _ScoreTable) -> List[ColumnResult]:
+    by_column = table.by_column
+    remapped_columns = []
+    for column_result in column_results:
+        column_table = by_column.get(column_result.name)
+        if column_table is not None:
+            subcolumns = column_result.subcolumns
+            remapped = None
+            for i, subcolumn_result in enumerate(subcolumns):
+                score = column_table.get((subcolumn_result.name, subcolumn_result.score))
+                if score is not None and score != subcolumn_result.score:
+                    if remapped is None:
+                        remapped = list(subcolumns)
+                    remapped[i] = SubcolumnResult(subcolumn_result.name, score, subcolumn_result.description)
+            if remapped is not None:
+                column_result = ColumnResult(column_result.name, remapped)
+        remapped_columns.append(column_result)
+    return remapped_columns
+
+
+def _remap_matrix(columns: Sequence[Tuple[str, str]], scores, table: _ScoreTable):
+    # numpy stays optional: an ndarray can only come from an imported numpy
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(scores, np.ndarray):
+        remapped = scores.copy()
+        for j, key in enumerate(columns):
+            subcolumn_table = table.by_subcolumn.get(key)
+            if not subcolumn_table:
+                continue
+            keys = np.array(sorted(subcolumn_table))
+            values = np.array([subcolumn_table[k] for k in keys], dtype=remapped.dtype)
+            column = scores[:, j]
+            idx = np.minimum(np.searchsorted(keys, column), len(keys) - 1)
+            hit = keys[idx] == column
+            remapped[hit, j] = values[idx[hit]]
+        return remapped
+
+    subcolumn_tables = [table.by_subcolumn.get(key, {}) for key in columns]
+    return [[subcolumn_table.get(score, score) if score is not None else None
+             for subcolumn_table, score in zip(subcolumn_tables, row)]
+            for row in scores]
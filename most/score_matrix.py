@@ -0,0 +1,161 @@
+import math
+from array import array
+from datetime import datetime, timezone
+from typing import AsyncIterable, Dict, Iterable, List, Optional, Tuple
+
+from .types import Result, Script, StoredAudioData, StoredTextData, is_valid_objectid, objectid_datetime
+
+
+class ScoreMatrix(object):
+    """
+    Scores of many results as a dense (n_results x n_subcolumns) matrix in
+    the column order of the model's Script, with id and timestamp vectors:
+
+        matrix = ScoreMatrix.from_results(searcher.iter_search(filter), script, model_id=model_id)
+        scores, missing = matrix.to_numpy()
+
+    Accepts Result objects and StoredAudioData / StoredTextData (or their
+    raw views), the latter need model_id. Scores are stored row by row in
+    an int64 array, ``missing`` marks None scores and subcolumns absent
+    from a result. Scores are matched by (column, subcolumn) names, the
+    first score of a pair wins, names missing from the script are skipped.
+    Timestamps are ``created_at`` when known and the ObjectId time of the
+    id otherwise, in seconds since epoch, NaN for other ids.
+
+    numpy and pyarrow are optional: to_numpy() and to_arrow() /
+    write_parquet() import them on use.
+    """
+
+    def __init__(self, script: Script, model_id: Optional[str] = None):
+        self.script = script
+        self.model_id = model_id
+        self.columns: List[Tuple[str, str]] = [(column.name, subcolumn)
+                                               for column in script.columns
+                                               for subcolumn in column.subcolumns]
+        self._index: Dict[str, Dict[str, int]] = {}
+        for j, (column, subcolumn) in enumerate(self.columns):
+            self._index.setdefault(column, {}).setdefault(subcolumn, j)
+
+        self.ids: List[str] = []
+        self.timestamps = array("d")
+        self.scores = array("q")
+        self.missing = bytearray()
+
+    def __repr__(self):
+        return "<ScoreMatrix(shape=%r)>" % (self.shape,)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.ids), len(self.columns)
+
+    @classmethod
+    def from_results(cls, results: Iterable, script: Script, model_id: Optional[str] = None) -> "ScoreMatrix":
+        matrix = cls(script, model_id)
+        matrix.extend(results)
+        return matrix
+
+    @classmethod
+    async def afrom_results(cls, results: AsyncIterable, script: Script, model_id: Optional[str] = None) -> "ScoreMatrix":
+        matrix = cls(script, model_id)
+        async for result in results:
+            matrix.append(result)
+        return matrix
+
+    def extend(self, results: Iterable):
+        for result in results:
+            self.append(result)
+
+    def append(self, result: Result | StoredAudioData | StoredTextData):
+        n_columns = len(self.columns)
+        row = [0] * n_columns
+        missing = [1] * n_columns
+        index = self._index
+        for column_result in self._column_results(result) or ():
+            subcolumn_index = index.get(column_result.name)
+            if subcolumn_index is None:
+                continue
+            for subcolumn_result in column_result.subcolumns:
+                j = subcolumn_index.get(subcolumn_result.name)
+                if j is not None and missing[j] and subcolumn_result.score is not None:
+                    row[j] = subcolumn_result.score
+                    missing[j] = 0
+
+        self.ids.append(result.id)
+        self.timestamps.append(self._timestamp(result))
+        self.scores.extend(row)
+        self.missing.extend(missing)
+
+    def column_index(self, column: str, subcolumn: str) -> int:
+        j = self._index.get(column, {}).get(subcolumn)
+        if j is None:
+            raise KeyError("No %r / %r in the script" % (column, subcolumn))
+        return j
+
+    def column(self, column: str, subcolumn: str) -> List[Optional[int]]:
+        """
+        Scores of one subcolumn, None where missing.
+        """
+        j = self.column_index(column, subcolumn)
+        step = len(self.columns)
+        return [None if missing else score
+                for score, missing in zip(self.scores[j::step], self.missing[j::step])]
+
+    def row(self, i: int) -> List[Optional[int]]:
+        step = len(self.columns)
+        return [None if missing else score
+                for score, missing in zip(self.scores[i * step:(i + 1) * step],
+                                          self.missing[i * step:(i + 1) * step])]
+
+    def to_numpy(self):
+        """
+        (scores, missing): int64 and bool arrays of the matrix shape.
+        """
+        import numpy as np
+
+        scores = np.frombuffer(self.scores, dtype=np.int64).reshape(self.shape).copy()
+        missing = np.frombuffer(self.missing, dtype=np.bool_).reshape(self.shape).copy()
+        return scores, missing
+
+    def to_arrow(self):
+        """
+        pyarrow.Table with "id", "timestamp" and a nullable int64 column
+        per subcolumn, named "column/subcolumn".
+        """
+        import pyarrow as pa
+
+        data = {
+            "id": pa.array(self.ids, type=pa.string()),
+            "timestamp": pa.array([None if math.isnan(ts) else datetime.fromtimestamp(ts, tz=timezone.utc)
+                                   for ts in self.timestamps],
+                                  type=pa.timestamp("us", tz="UTC")),
+        }
+        for column, subcolumn in self.columns:
+            name = "%s/%s" % (column, subcolumn)
+            if name not in data:
+                data[name] = pa.array(self.column(column, subcolumn), type=pa.int64())
+        return pa.table(data)
+
+    def write_parquet(self, path, **kwargs):
+        import pyarrow.parquet as pq
+
+        pq.write_table(self.to_arrow(), str(path), **kwargs)
+
+    def _column_results(self, result):
+        results = result.results
+        if not isinstance(results, dict):
+            return results
+        if self.model_id is None:
+            raise ValueError("ScoreMatrix of stored data needs model_id")
+        return results.get(self.model_id)
+
+    @staticmethod
+    def _timestamp(result) -> float:
+        created_at = getattr(result, "created_at", None)
+        if created_at is not None:
+            return created_at.timestamp()
+        if not is_valid_objectid(result.id):
+            return math.nan
+        return objectid_datetime(result.id).timestamp()
@@ -0,0 +1,130 @@
+import functools
+import inspect
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple, Union
+
+from .search_types import SearchParams
+
+
+class SearchCache(object):
+    """
+    Cache of ``count``/``distinct`` answers of the searchers, shared by a
+    client and its clones (``MostClient(search_cache=SearchCache())``).
+
+    Entries live ``ttl`` seconds in an in-memory LRU of ``maxsize``
+    entries, optionally backed by an sqlite file at ``path`` that outlives
+    the process. Writes made through the client (store_info, add_tags,
+    update_results, uploads, deletes, ...) drop the entries of its
+    client_id. Writes made by other processes are only seen after ``ttl``.
+    """
+
+    def __init__(self,
+                 maxsize: int = 1024,
+                 ttl: float = 60.0,
+                 path: Union[str, Path, None] = None,
+                 clock: Callable[[], float] = time.time):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.entries: OrderedDict[Tuple, Tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+            self._db.execute("CREATE TABLE IF NOT EXISTS search_cache "
+                             "(key TEXT PRIMARY KEY, client_id TEXT, expires_at REAL, value TEXT)")
+
+    def __repr__(self):
+        return "<SearchCache(entries=%d, ttl=%s)>" % (len(self.entries), self.ttl)
+
+    @staticmethod
+    def key(client_id: str, data_source: str, method: str,
+            filter: SearchParams, *args) -> Tuple:
+        return (client_id, data_source, method, filter.cache_key()) + args
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        """
+        Cached value or None when it is missing or expired.
+        """
+        now = self.clock()
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self.entries.move_to_end(key)
+                    return value
+                del self.entries[key]
+
+            if self._db is None:
+                return None
+            row = self._db.execute("SELECT expires_at, value FROM search_cache WHERE key = ?",
+                                   (json.dumps(key),)).fetchone()
+            if row is None or row[0] <= now:
+                return None
+            value = json.loads(row[1])
+            self._remember(key, row[0], value)
+            return value
+
+    def set(self, key: Tuple, value: Any):
+        expires_at = self.clock() + self.ttl
+        with self._lock:
+            self._remember(key, expires_at, value)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO search_cache VALUES (?, ?, ?, ?)",
+                                 (json.dumps(key), key[0], expires_at, json.dumps(value)))
+
+    def invalidate(self, client_id: Optional[str] = None):
+        """
+        Drops the entries of client_id, all entries when it is None.
+        """
+        with self._lock:
+            if client_id is None:
+                self.entries.clear()
+            else:
+                for key in [key for key in self.entries if key[0] == client_id]:
+                    del self.entries[key]
+            if self._db is not None:
+                if client_id is None:
+                    self._db.execute("DELETE FROM search_cache")
+                else:
+                    self._db.execute("DELETE FROM search_cache WHERE client_id = ?", (client_id,))
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _remember(self, key: Tuple, expires_at: float, value: Any):
+        self.entries[key] = (expires_at, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+
+def invalidates_search_cache(method):
+    """
+    Marks a client method that changes stored data: after it succeeds
+    the client's search_cache entries are dropped.
+    """
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            result = await method(self, *args, **kwargs)
+            if self.search_cache is not None:
+                self.search_cache.invalidate(self.client_id)
+            return result
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        if self.search_cache is not None:
+            self.search_cache.invalidate(self.client_id)
+        return result
+    return wrapper
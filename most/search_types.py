@@ -1,8 +1,13 @@
+import dataclasses
+import hashlib
+import json
 from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
 from typing import List, Optional, Literal
 from dataclasses_json import DataClassJsonMixin, dataclass_json
 
-from most.types import ModelInfo
+from most.types import objectid_from_datetime
 
 
 @dataclass_json
@@ -134,7 +139,6 @@ class ResultsCondition(DataClassJsonMixin):
         from .api import MostClient
         client: MostClient
         script = client.get_model_script()
-        model_info: ModelInfo = client.get_model_info()
         column_idx = [column.name for column in script.columns].index(column)
         subcolumn_idx = script.columns[column_idx].subcolumns.index(subcolumn)
 
@@ -177,7 +181,6 @@ class ResultsCondition(DataClassJsonMixin):
         from .async_api import AsyncMostClient
         client: AsyncMostClient
         script = await client.get_model_script()
-        model_info: ModelInfo = await client.get_model_info()
         column_idx = [column.name for column in script.columns].index(column)
         subcolumn_idx = script.columns[column_idx].subcolumns.index(subcolumn)
 
@@ -218,3 +221,106 @@ class SearchParams(DataClassJsonMixin):
     should: List[StoredInfoCondition | AggregatedResultsCondition | ResultsCondition | ExistsResultsCondition | DurationCondition | ChannelsCondition | IDCondition | TagsCondition | URLCondition ] = field(default_factory=list)
     must_not: List[StoredInfoCondition | AggregatedResultsCondition | ResultsCondition | ExistsResultsCondition | DurationCondition | ChannelsCondition | IDCondition | TagsCondition | URLCondition ] = field(default_factory=list)
     should_not: List[StoredInfoCondition | AggregatedResultsCondition | ResultsCondition | ExistsResultsCondition | DurationCondition | ChannelsCondition | IDCondition | TagsCondition | URLCondition ] = field(default_factory=list)
+
+    def with_conditions(self, conditions: list) -> 'SearchParams':
+        """
+        Copy of the filter that must also match conditions.
+        """
+        return dataclasses.replace(self, must=self.must + list(conditions))
+
+    def canonical(self) -> tuple:
+        """
+        Hashable form of the filter: None fields are dropped, conditions
+        of each clause are deduplicated and sorted, so filters that differ
+        only in condition order have the same canonical form.
+        """
+        canonical = []
+        for name in _CLAUSES:
+            conditions = {repr(c): c for c in map(_freeze, getattr(self, name))}
+            canonical.append((name, tuple(conditions[key] for key in sorted(conditions))))
+        return _Object(canonical)
+
+    def canonical_json(self) -> str:
+        """
+        Compact JSON of canonical(), sent by the searchers instead of
+        to_json(). Serialized once per distinct filter.
+        """
+        return _canonical_json(self.canonical())
+
+    def cache_key(self) -> str:
+        """
+        Stable across processes, e.g. for caching results of the filter.
+        """
+        return _cache_key(self.canonical())
+
+
+_CLAUSES = ("must", "should", "must_not", "should_not")
+
+
+class _Object(tuple):
+    """
+    Frozen dataclass: sorted (name, value) pairs without None values.
+    """
+    __slots__ = ()
+
+
+class _Scalar(tuple):
+    """
+    (type name, value) of a scalar: True, 1 and 1.0 are equal and hash
+    alike, but are different filters and must not share cache entries.
+    """
+    __slots__ = ()
+
+
+_SCALARS = frozenset({str, int, float, bool})
+
+
+def _freeze(value):
+    if type(value) in _SCALARS:
+        return _Scalar((type(value).__name__, value))
+    if isinstance(value, list):
+        return tuple(map(_freeze, value))
+    if not dataclasses.is_dataclass(value):
+        return value
+    return _Object(sorted((name, _freeze(v))
+                          for name, v in vars(value).items() if v is not None))
+
+
+def _thaw(value):
+    if isinstance(value, _Object):
+        return {name: _thaw(v) for name, v in value}
+    if isinstance(value, _Scalar):
+        return value[1]
+    if isinstance(value, tuple):
+        return list(map(_thaw, value))
+    return value
+
+
+@lru_cache(maxsize=1024)
+def _canonical_json(canonical: tuple) -> str:
+    return json.dumps(_thaw(canonical), ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+@lru_cache(maxsize=1024)
+def _cache_key(canonical: tuple) -> str:
+    return hashlib.sha256(_canonical_json(canonical).encode("utf-8")).hexdigest()
+
+
+def shard_by_id(filter: SearchParams,
+                since: datetime,
+                until: datetime,
+                shards: int) -> List[SearchParams]:
+    """
+    Splits filter into disjoint filters by ObjectId creation time:
+    [since, until) is cut into equal time ranges, the first and the last
+    shard are open-ended, so together they match exactly what filter does.
+    Shards are ordered by id.
+    """
+    if shards < 1:
+        raise ValueError("shards must be positive, got %d" % shards)
+    step = (until - since) / shards
+    boundaries = sorted({objectid_from_datetime(since + step * i) for i in range(1, shards)})
+    ranges = zip([None] + boundaries, boundaries + [None])
+    return [filter.with_conditions([IDCondition(not_less_than=lower, less_than=upper)])
+            if lower is not None or upper is not None else filter
+            for lower, upper in ranges]
@@ -1,7 +1,9 @@
-from typing import List, Literal, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Literal, Optional
 
 from .api import MostClient
-from .search_types import SearchParams
+from .json_backend import response_json
+from .search_types import IDCondition, SearchParams
 from .types import Audio, Text, StoredAudioData, StoredTextData
 
 
@@ -15,14 +17,23 @@ class MostSearcher(object):
               filter: Optional[SearchParams] = None):
         if filter is None:
             filter = SearchParams()
+        cache = self.client.search_cache
+        if cache is not None:
+            cache_key = cache.key(self.client.client_id, self.data_source, "count", filter)
+            count = cache.get(cache_key)
+            if count is not None:
+                return count
 
         resp = self.client.get(f"/{self.client.client_id}/{self.data_source}/count",
                                params={
-                                   "filter": filter.to_json(),
+                                   "filter": filter.canonical_json(),
                                })
         if resp.status_code >= 400:
             raise RuntimeError("Audio can't be indexed")
-        return resp.json()
+        count = response_json(resp)
+        if cache is not None:
+            cache.set(cache_key, count)
+        return count
 
     def distinct(self,
                  key: str,
@@ -34,24 +45,34 @@ class MostSearcher(object):
         """
         if filter is None:
             filter = SearchParams()
+        cache = self.client.search_cache
+        if cache is not None:
+            cache_key = cache.key(self.client.client_id, self.data_source, "distinct", filter, key)
+            values = cache.get(cache_key)
+            if values is not None:
+                return list(values)
         resp = self.client.get(f"/{self.client.client_id}/{self.data_source}/distinct",
-                               params={"filter": filter.to_json(),
+                               params={"filter": filter.canonical_json(),
                                        "key": key})
         if resp.status_code >= 400:
             raise RuntimeError("Key is not valid")
-        return resp.json()
+        values = response_json(resp)
+        if cache is not None:
+            cache.set(cache_key, list(values))
+        return values
 
     def search(self,
                filter: Optional[SearchParams] = None,
                limit: int = 10,
                include_data: bool = False,
                include_results: Optional[List[str]] = None,
-               jmespath_schema: Optional[str] = None) -> List[StoredAudioData | StoredTextData]:
+               jmespath_schema: Optional[str] = None,
+               raw: Optional[bool] = None) -> List[StoredAudioData | StoredTextData]:
         if filter is None:
             filter = SearchParams()
         resp = self.client.get(f"/{self.client.client_id}/{self.data_source}/search",
                                 params={
-                                    "filter": filter.to_json(),
+                                    "filter": filter.canonical_json(),
                                     "limit": limit,
                                     "include_data": include_data,
                                     "include_results": include_results,
@@ -60,7 +81,86 @@ class MostSearcher(object):
         if resp.status_code >= 400:
             raise RuntimeError("Audio can't be indexed")
         if jmespath_schema is not None:
-            return resp.json()
+            return response_json(resp)
 
-        data_list = resp.json()
-        return self.client.retort.load(data_list, List[StoredAudioData | StoredTextData])
+        return self.client.load_response(resp, List[StoredAudioData | StoredTextData], raw,
+                                         pause_gc=True)
+
+    def iter_search(self,
+                    filter: Optional[SearchParams] = None,
+                    page_size: int = 100,
+                    include_data: bool = False,
+                    include_results: Optional[List[str]] = None,
+                    raw: Optional[bool] = None) -> Iterator[StoredAudioData | StoredTextData]:
+        """
+        Iterates over all objects matching filter, page by page.
+        Pages are requested by id (IDCondition.greater_than the last id of
+        the previous page), the next page is fetched in background while
+        the current one is consumed, so at most two pages are in memory.
+        """
+        if filter is None:
+            filter = SearchParams()
+
+        def fetch(after: Optional[str]):
+            page_filter = filter
+            if after is not None:
+                page_filter = filter.with_conditions([IDCondition(greater_than=after)])
+            return self.search(filter=page_filter,
+                               limit=page_size,
+                               include_data=include_data,
+                               include_results=include_results,
+                               raw=raw)
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            after = None
+            page = fetch(after)
+            while page:
+                after = next_cursor(page, page_size, after)
+                next_page = executor.submit(fetch, after) if after is not None else None
+                yield from page
+                if next_page is None:
+                    return
+                page = next_page.result()
+        finally:
+            # a consumer that stops early does not wait for the prefetched page
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def facet_counts(self,
+                     base_filter: Optional[SearchParams],
+                     facets: Dict[str, list],
+                     max_concurrency: int = 8) -> Dict[str, int]:
+        """
+        Counts of base_filter narrowed by each facet's extra conditions,
+        e.g. {"sales": [TagsCondition(in_set=["sales"])], ...}.
+        At most max_concurrency counts run at once.
+        """
+        if base_filter is None:
+            base_filter = SearchParams()
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            counts = {name: executor.submit(self.count, base_filter.with_conditions(conditions))
+                      for name, conditions in facets.items()}
+            return {name: count.result() for name, count in counts.items()}
+
+    def distinct_many(self,
+                      keys: List[str],
+                      filter: Optional[SearchParams] = None,
+                      max_concurrency: int = 8) -> Dict[str, List[str]]:
+        """
+        Distinct values of each key, at most max_concurrency requests at once.
+        """
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            values = {key: executor.submit(self.distinct, key, filter) for key in keys}
+            return {key: value.result() for key, value in values.items()}
+
+
+def next_cursor(page, page_size: int, after: Optional[str]) -> Optional[str]:
+    """
+    Id to continue after, None when page is the last one.
+    """
+    if len(page) < page_size:
+        return None
+    last_id = page[-1].id
+    if after is not None and last_id <= after:
+        raise RuntimeError("Search results are not ordered by id, can't page after %s" % after)
+    return last_id
@@ -1,4 +1,5 @@
 from .api import MostClient
+from .json_backend import response_json
 
 
 class Teleprompter:
@@ -14,7 +15,7 @@ class Teleprompter:
                                 })
         if resp.status_code >= 400:
             raise RuntimeError("Audio can't be indexed")
-        return resp.json()
+        return response_json(resp)
 
     def suggest(self, phrase: str):
         resp = self.client.get(f"/teleprompter/{self.client.client_id}/prompt",
@@ -23,10 +24,10 @@ class Teleprompter:
                                })
         if resp.status_code >= 400:
             raise RuntimeError("Audio can't be indexed")
-        return resp.json()
+        return response_json(resp)
 
     def drop(self):
         resp = self.client.post(f"/teleprompter/{self.client.client_id}/drop")
         if resp.status_code >= 400:
             raise RuntimeError("Audio can't be indexed")
-        return resp.json()
+        return response_json(resp)
@@ -1,5 +1,7 @@
 from typing import List
 from .api import MostClient
+from .decoders import decode
+from .json_backend import response_json
 from .types import HumanFeedback
 
 
@@ -21,5 +23,5 @@ class Trainer(object):
 
     def get_data_points(self) -> List[HumanFeedback]:
         resp = self.client.get(f"/{self.client.client_id}/model/{self.client.model_id}/data")
-        audio_list = resp.json()
-        return self.client.retort.load(audio_list, List[HumanFeedback])
+        audio_list = response_json(resp)
+        return decode(audio_list, List[HumanFeedback])
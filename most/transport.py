@@ -0,0 +1,201 @@
+import random
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, FrozenSet, Generic, Optional, TypeVar, Union
+
+import httpx
+
+from most._constrants import (
+    DEFAULT_CONNECTION_LIMITS,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_MAX_RETRY_DELAY,
+    DEFAULT_MAX_STATUS_RETRIES,
+    DEFAULT_RETRY_DELAY,
+    DEFAULT_TIMEOUT,
+)
+
+
+@dataclass
+class RetryPolicy(object):
+    """
+    Retries of throttled / temporarily unavailable responses.
+
+    Only idempotent requests are retried: GET/HEAD/OPTIONS/PUT/DELETE, or
+    a POST explicitly sent with ``idempotent=True``. The delay is taken
+    from ``Retry-After`` when the server sends it, otherwise it is an
+    exponential backoff with full jitter: uniform(0, delay * 2 ** attempt),
+    both capped by ``max_delay``.
+    """
+    max_retries: int = DEFAULT_MAX_STATUS_RETRIES
+    delay: float = DEFAULT_RETRY_DELAY
+    max_delay: float = DEFAULT_MAX_RETRY_DELAY
+    statuses: FrozenSet[int] = frozenset({429, 502, 503, 504})
+    idempotent_methods: FrozenSet[str] = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+    def should_retry(self, method: str,
+                     resp: httpx.Response,
+                     attempt: int,
+                     idempotent: Optional[bool] = None) -> bool:
+        if attempt >= self.max_retries or resp.status_code not in self.statuses:
+            return False
+        if idempotent is None:
+            idempotent = method.upper() in self.idempotent_methods
+        return idempotent
+
+    def get_delay(self, attempt: int,
+                  resp: Optional[httpx.Response] = None) -> float:
+        retry_after = parse_retry_after(resp.headers.get("Retry-After")) if resp is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.delay * 2 ** attempt))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After is either delta-seconds or an HTTP-date.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass
+class TransportConfig(object):
+    """
+    Connection settings shared by MostClient and AsyncMostClient.
+
+    :param timeout: per-request timeout (connect/read/write/pool)
+    :param limits: connection pool size and keep-alive tuning
+    :param max_retries: connection-level retries (connect errors only)
+    :param retry: retries of 429/5xx responses of idempotent requests
+    :param http2: multiplex requests over a few HTTP/2 connections,
+        requires ``pip install most-client[http2]``
+    :param http1: set to False together with http2 to speak HTTP/2
+        over plain http:// (prior knowledge, no TLS negotiation)
+    """
+    timeout: Union[float, httpx.Timeout] = field(default_factory=lambda: DEFAULT_TIMEOUT)
+    limits: httpx.Limits = field(default_factory=lambda: DEFAULT_CONNECTION_LIMITS)
+    max_retries: int = DEFAULT_MAX_RETRIES
+    retry: RetryPolicy = field(default_factory=RetryPolicy)
+    follow_redirects: bool = True
+    http2: bool = False
+    http1: bool = True
+
+    def build_client(self, base_url: str | httpx.URL) -> httpx.Client:
+        # limits must go to the transport: httpx ignores Client(limits=...)
+        # as soon as an explicit transport is passed
+        return httpx.Client(base_url=base_url,
+                            timeout=self.timeout,
+                            follow_redirects=self.follow_redirects,
+                            transport=httpx.HTTPTransport(retries=self.max_retries,
+                                                          limits=self.limits,
+                                                          http1=self.http1,
+                                                          http2=self.http2))
+
+    def build_async_client(self, base_url: str | httpx.URL) -> httpx.AsyncClient:
+        return httpx.AsyncClient(base_url=base_url,
+                                 timeout=self.timeout,
+                                 follow_redirects=self.follow_redirects,
+                                 transport=httpx.AsyncHTTPTransport(retries=self.max_retries,
+                                                                    limits=self.limits,
+                                                                    http1=self.http1,
+                                                                    http2=self.http2))
+
+
+SessionT = TypeVar("SessionT")
+
+
+class LazySession(Generic[SessionT]):
+    """
+    Holds the HTTP client of a MostClient and all of its clones.
+    The client is built on first use, so constructing and cloning
+    MostClient does not create connection pools or SSL contexts.
+    ``built`` tells a client built from TransportConfig from one
+    supplied by the user.
+    """
+
+    def __init__(self,
+                 factory: Callable[[], SessionT],
+                 session: Optional[SessionT] = None):
+        self._factory = factory
+        self._session = session
+        self.built = session is None
+        self._lock = threading.Lock()
+
+    def get(self) -> SessionT:
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._factory()
+        return self._session
+
+    def set(self, session: SessionT):
+        self._session = session
+        self.built = False
+
+
+def is_json_response(resp: httpx.Response) -> bool:
+    return resp.headers.get("Content-Type") == "application/json"
+
+
+def raise_for_api_error(resp: httpx.Response,
+                        fallback: str = "Something went wrong."):
+    """
+    Raises RuntimeError for a failed response of the main API.
+    """
+    if resp.status_code < 400:
+        return
+    if is_json_response(resp):
+        error_data = resp.json()
+        if isinstance(error_data, dict) and "message" in error_data:
+            raise RuntimeError(error_data["message"])
+        raise RuntimeError(f"Error: {error_data}")
+    raise RuntimeError(fallback)
+
+
+def raise_for_etl_error(resp: httpx.Response,
+                        detail_prefix: str = ""):
+    """
+    Raises RuntimeError for a failed response of the ETL API.
+
+    ETL answers with FastAPI errors: ``detail`` is either a string or
+    a list of validation errors. ``detail_prefix`` is prepended to the
+    detail message, except for "client is not registered" errors.
+    """
+    if resp.status_code < 400:
+        return
+    if is_json_response(resp):
+        try:
+            error_data = resp.json()
+        except Exception:
+            error_data = None
+        if isinstance(error_data, dict):
+            if "detail" in error_data:
+                detail = error_data["detail"]
+                if isinstance(detail, list) and len(detail) > 0:
+                    error_msg = "; ".join([f"{err.get('loc', [])}: {err.get('msg', '')}"
+                                           for err in detail])
+                else:
+                    error_msg = str(detail)
+                error_msg_lower = error_msg.lower()
+                if "не зарегистрирован" in error_msg_lower or "not registered" in error_msg_lower:
+                    raise RuntimeError(error_msg)
+                raise RuntimeError(detail_prefix + error_msg)
+            if "message" in error_data:
+                raise RuntimeError(error_data["message"])
+        if error_data is not None:
+            raise RuntimeError(f"Error: {error_data}")
+    error_msg = resp.content.decode() if resp.content else f"HTTP {resp.status_code}"
+    raise RuntimeError(error_msg)
@@ -4,14 +4,16 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Dict, List, Literal, Optional, Union
 
-import aiofiles
-import httpx
 from dataclasses_json import DataClassJsonMixin, dataclass_json
 
 
+# Result types are slotted: they are kept in memory by the million.
+# DataClassJsonMixin has no __slots__, so instead of inheriting from it
+# they get its methods from @dataclass_json and are registered with it.
+@DataClassJsonMixin.register
 @dataclass_json
-@dataclass
-class StoredAudioData(DataClassJsonMixin):
+@dataclass(slots=True)
+class StoredAudioData:
     id: str
     url: str
     data: Optional[Dict[str, Union[str, int, float]]] = None
@@ -25,6 +27,8 @@ class Audio(DataClassJsonMixin):
     url: str
 
     async def download_async(self, cached_path):
+        import aiofiles
+        import httpx
         print(f"Downloading {self.url} -> {cached_path}")
         async with httpx.AsyncClient() as client:
             async with aiofiles.open(cached_path, "wb") as f:
@@ -32,6 +36,7 @@ class Audio(DataClassJsonMixin):
                 await f.write(resp.content)
 
     def download(self, cached_path):
+        import httpx
         print(f"Downloading {self.url} -> {cached_path}")
         with httpx.Client() as client:
             with open(cached_path, "wb") as f:
@@ -45,25 +50,28 @@ class Text(DataClassJsonMixin):
     id: str
 
 
+@DataClassJsonMixin.register
 @dataclass_json
-@dataclass
-class StoredTextData(DataClassJsonMixin):
+@dataclass(slots=True)
+class StoredTextData:
     id: str
     data: Optional[Dict[str, Union[str, int, float]]] = None
     results: Optional[Dict[str, List["ColumnResult"]]] = None
 
 
+@DataClassJsonMixin.register
 @dataclass_json
-@dataclass
-class SubcolumnResult(DataClassJsonMixin):
+@dataclass(slots=True)
+class SubcolumnResult:
     name: str
     score: Optional[int] = None
     description: str = ""
 
 
+@DataClassJsonMixin.register
 @dataclass_json
-@dataclass
-class ColumnResult(DataClassJsonMixin):
+@dataclass(slots=True)
+class ColumnResult:
     name: str
     subcolumns: List[SubcolumnResult]
 
@@ -122,9 +130,10 @@ class UpdateResult(DataClassJsonMixin):
     timestamp: Optional[int] = None
 
 
+@DataClassJsonMixin.register
 @dataclass_json
-@dataclass
-class Result(DataClassJsonMixin):
+@dataclass(slots=True)
+class Result:
     id: str
     text: Optional[str] = None
     url: Optional[str] = None
@@ -144,37 +153,71 @@ class Result(DataClassJsonMixin):
                                for column_result in self.results])
 
     def apply_edits(self, inplace=True):
-        result = self
-        if not inplace:
-            result = copy.deepcopy(self)
-
-        if result.edits is None:
-            return result
+        """
+        Applies edits in timestamp order to the scores and descriptions of
+        results. With inplace=False this result is not modified and a copy
+        is returned. Edited columns and subcolumns are replaced, never
+        modified: the others are shared with the copies of this result.
+        """
+        if self.edits is None or self.results is None:
+            return self if inplace else copy.copy(self)
+
+        # edits of a subcolumn collapse into its final score and description
+        edited: Dict[str, Dict[str, List]] = {}
+        for edit in sorted(self.edits, key=lambda x: x.timestamp):
+            values = edited.setdefault(edit.column_name, {}).setdefault(edit.subcolumn_name, [None, None])
+            if edit.score is not None:
+                values[0] = edit.score
+            if edit.description is not None:
+                values[1] = edit.description
 
-        if result.results is None:
-            return result
+        column_idx = {}
+        for i, column in enumerate(self.results):
+            column_idx.setdefault(column.name, i)
 
-        edits = sorted(result.edits, key=lambda x: x.timestamp)
-        for edit in edits:
-            column = next((c for c in result.results
-                           if c.name == edit.column_name), None)
-            if column is None:
+        results = list(self.results)
+        for column_name, subcolumn_edits in edited.items():
+            i = column_idx.get(column_name)
+            if i is None:
                 continue
-            subcolumn = next((s for s in column.subcolumns
-                              if s.name == edit.subcolumn_name), None)
-            if subcolumn is None:
-                continue
-            if edit.score is not None:
-                subcolumn.score = edit.score
-            if edit.description is not None:
-                subcolumn.description = edit.description
+            column = results[i]
+            subcolumn_idx = {}
+            for j, subcolumn in enumerate(column.subcolumns):
+                subcolumn_idx.setdefault(subcolumn.name, j)
+
+            subcolumns = None
+            for subcolumn_name, (score, description) in subcolumn_edits.items():
+                j = subcolumn_idx.get(subcolumn_name)
+                if j is None:
+                    continue
+                subcolumn = column.subcolumns[j]
+                if subcolumns is None:
+                    subcolumns = list(column.subcolumns)
+                subcolumns[j] = SubcolumnResult(subcolumn.name,
+                                                subcolumn.score if score is None else score,
+                                                subcolumn.description if description is None else description)
+            if subcolumns is not None:
+                results[i] = ColumnResult(column.name, subcolumns)
+
+        result = self if inplace else copy.copy(self)
+        result.results = results
         result.edits = None
         return result
 
+    @staticmethod
+    def apply_edits_many(results: List["Result"], *, inplace: bool) -> List["Result"]:
+        """
+        apply_edits() of every result. inplace has no default: with
+        inplace=True the given results are edited, with inplace=False
+        they are left as they are and copies are returned.
+        """
+        return [result.apply_edits(inplace) for result in results]
+
 
+@DataClassJsonMixin.register
 @dataclass_json
-@dataclass
-class DialogSegment(DataClassJsonMixin):
+@dataclass(slots=True)
+class DialogSegment:
     start_time_ms: int
     end_time_ms: int
     text: str
@@ -233,7 +276,7 @@ class Item(DataClassJsonMixin):
     image_urls: List[str] = field(default_factory=list)
     available: bool = True
 
-    metadata: Dict[str, Union[str, int, float, bool]] = field(default_factory=dict)
+    metadata: Dict[str, Optional[Union[str, int, float, bool]]] = field(default_factory=dict)
     id: Optional[str] = None
 
 
@@ -294,6 +337,18 @@ def is_valid_objectid(oid: str) -> bool:
     return bool(re.fullmatch(r"^[0-9a-fA-F]{24}$", oid))
 
 
+def objectid_from_datetime(dt: datetime) -> str:
+    """
+    Smallest ObjectId created at dt: ids are ordered by creation time,
+    so it bounds IDCondition ranges by time.
+    """
+    return "%08x" % int(dt.timestamp()) + "0" * 16
+
+
+def objectid_datetime(oid: str) -> datetime:
+    return datetime.fromtimestamp(int(oid[:8], 16), tz=timezone.utc)
+
+
 def is_valid_english_word(text: str) -> bool:
     """
     Returns True if the text starts with a letter and contains only English letters and digits.
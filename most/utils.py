@@ -1,6 +1,4 @@
 import base64
-from cryptography.hazmat.primitives.asymmetric import ed25519
-from cryptography.hazmat.primitives import serialization
 
 
 def generate_ed25519_keypair():
@@ -33,6 +31,9 @@ def generate_ed25519_keypair():
 
     :return:
     """
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ed25519
+
     private_key = ed25519.Ed25519PrivateKey.generate()
 
     private_raw = private_key.private_bytes(
@@ -53,6 +54,8 @@ def generate_ed25519_keypair():
 
 
 def sign_ed25519(private_key_b64: str, message: str) -> str:
+    from cryptography.hazmat.primitives.asymmetric import ed25519
+
     key = ed25519.Ed25519PrivateKey.from_private_bytes(
         base64.b64decode(private_key_b64)
     )
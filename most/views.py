@@ -0,0 +1,215 @@
+import dataclasses
+import types
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, List, Union, get_args, get_origin, get_type_hints
+
+from .decoders import decode, decoder_for
+
+
+class View(object):
+    """
+    Read-only lazy view of a JSON object as dataclass ``tp``.
+
+    Fields are decoded on first access and cached; nested objects and
+    lists of objects become views too, so reading one score of a Result
+    does not build the whole Result -> ColumnResult -> SubcolumnResult
+    tree. Read-only methods of ``tp`` work on the view
+    (e.g. ``Result.get_script``, ``Dialog.to_text``).
+    """
+    __slots__ = ("_type", "_data", "_cache")
+
+    def __init__(self, tp, data: dict):
+        if type(data) is not dict:
+            raise TypeError("Expected %s object, got %r" % (tp.__name__, data))
+        object.__setattr__(self, "_type", tp)
+        object.__setattr__(self, "_data", data)
+        object.__setattr__(self, "_cache", None)
+
+    def __getattr__(self, name):
+        cache = self._cache
+        if cache is not None and name in cache:
+            return cache[name]
+        field = _fields_of(self._type).get(name)
+        if field is None:
+            attr = getattr(self._type, name)
+            if isinstance(attr, types.FunctionType):
+                return types.MethodType(attr, self)
+            return attr
+
+        load, default = field
+        if name in self._data:
+            value = load(self._data[name])
+        elif default is _REQUIRED:
+            raise AttributeError("%s has no %r in the response" % (self._type.__name__, name))
+        else:
+            value = default()
+        if cache is None:
+            cache = {}
+            object.__setattr__(self, "_cache", cache)
+        cache[name] = value
+        return value
+
+    def __setattr__(self, name, value):
+        raise AttributeError("%s view is read-only, use materialize() to get a %s"
+                             % (self._type.__name__, self._type.__name__))
+
+    __delattr__ = __setattr__
+
+    def __eq__(self, other):
+        if isinstance(other, View):
+            return self._type is other._type and self._data == other._data
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        shown = ", ".join("%s=%r" % (key, value) for key, value in self._data.items()
+                          if not isinstance(value, (list, dict)))
+        return "%sView(%s)" % (self._type.__name__, shown)
+
+    @property
+    def raw(self) -> dict:
+        """
+        Response JSON behind the view, must not be modified.
+        """
+        return self._data
+
+    def materialize(self):
+        return decode(self._data, self._type)
+
+    def to_dict(self, encode_json=False) -> dict:
+        return self.materialize().to_dict(encode_json=encode_json)
+
+
+class ListView(Sequence):
+    """
+    Read-only list of views, each item is wrapped on first access.
+    """
+    __slots__ = ("_load", "_items", "_views")
+
+    def __init__(self, load: Callable[[Any], Any], items: list):
+        if type(items) is not list:
+            raise TypeError("Expected list, got %r" % (items,))
+        self._load = load
+        self._items = items
+        self._views = [None] * len(items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._items)))]
+        view = self._views[index]
+        if view is None:
+            view = self._views[index] = self._load(self._items[index])
+        return view
+
+    def __eq__(self, other):
+        if isinstance(other, ListView):
+            return self._items == other._items
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "ListView(%d items)" % len(self._items)
+
+    @property
+    def raw(self) -> list:
+        return self._items
+
+    def materialize(self) -> list:
+        return [item.materialize() if isinstance(item, (View, ListView)) else item
+                for item in self]
+
+
+def view(data, tp):
+    """
+    Lazy counterpart of ``decode(data, tp)``.
+    """
+    return loader_for(tp)(data)
+
+
+_REQUIRED = object()
+_loaders: Dict[Any, Callable[[Any], Any]] = {}
+_fields: Dict[type, Dict[str, tuple]] = {}
+
+
+def loader_for(tp) -> Callable[[Any], Any]:
+    try:
+        return _loaders[tp]
+    except KeyError:
+        pass
+    loader = _loaders[tp] = _build_loader(tp)
+    return loader
+
+
+def _build_loader(tp) -> Callable[[Any], Any]:
+    if dataclasses.is_dataclass(tp):
+        return lambda data: View(tp, data)
+
+    origin, args = get_origin(tp), get_args(tp)
+    if origin in (Union, types.UnionType):
+        variants = [arg for arg in args if arg is not type(None)]
+        if not any(dataclasses.is_dataclass(arg) or get_origin(arg) is not None for arg in variants):
+            return decoder_for(tp)
+        if len(variants) == 1:
+            inner = loader_for(variants[0])
+            return lambda data: None if data is None else inner(data)
+        return _union_loader(variants)
+    if origin in (list, List) and _is_lazy(args[0]):
+        item_loader = loader_for(args[0])
+        return lambda data: ListView(item_loader, data)
+    if origin in (dict, Dict) and _is_lazy(args[1]):
+        value_loader = loader_for(args[1])
+        return lambda data: {key: value_loader(value) for key, value in data.items()}
+    return decoder_for(tp)
+
+
+def _is_lazy(tp) -> bool:
+    if dataclasses.is_dataclass(tp):
+        return True
+    return any(_is_lazy(arg) for arg in get_args(tp))
+
+
+def _union_loader(variants):
+    """
+    Picks the first variant whose required fields are all present,
+    like decode() that tries the variants in order.
+    """
+    candidates = [(loader_for(variant),
+                   [f.name for f in dataclasses.fields(variant)
+                    if f.default is dataclasses.MISSING and f.default_factory is dataclasses.MISSING]
+                   if dataclasses.is_dataclass(variant) else None)
+                  for variant in variants]
+
+    def load(data):
+        if data is None:
+            return None
+        for loader, required in candidates:
+            if required is None or type(data) is dict and all(data.get(name) is not None for name in required):
+                return loader(data)
+        raise TypeError("No variant of %s matches %r" % (variants, data))
+    return load
+
+
+def _fields_of(tp) -> Dict[str, tuple]:
+    try:
+        return _fields[tp]
+    except KeyError:
+        pass
+    hints = get_type_hints(tp)
+    fields = {}
+    for f in dataclasses.fields(tp):
+        if f.default is not dataclasses.MISSING:
+            default = (lambda value: lambda: value)(f.default)
+        elif f.default_factory is not dataclasses.MISSING:
+            default = f.default_factory
+        else:
+            default = _REQUIRED
+        fields[f.name] = (loader_for(hints[f.name]), default)
+    _fields[tp] = fields
+    return fields
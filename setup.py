@@ -17,6 +17,10 @@ setup(
     license='',
     packages=find_packages(include=['most', 'most.*']),
     install_requires=requirements,
+    extras_require={'http2': ['h2>=3,<5'],
+                    'orjson': ['orjson'],
+                    'numpy': ['numpy'],
+                    'arrow': ['pyarrow']},
     zip_safe=True,
     include_package_data=True,
     exclude_package_data={'': ['notebooks']},
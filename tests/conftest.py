@@ -1,10 +1,18 @@
+import asyncio
 import os
+import threading
+import time
 from pathlib import Path
+from typing import Optional
 
 import httpx
 import pytest
 
 from most.api import MostClient
+from most.async_api import AsyncMostClient
+from most.transport import RetryPolicy, TransportConfig
+
+BASE_URL = "https://api.test.ai/api/external"
 
 
 DEFAULT_STAGE_CONFIG = {
@@ -15,9 +23,7 @@ DEFAULT_STAGE_CONFIG = {
 
 
 @pytest.fixture()
-def most_client_e2e(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> MostClient:
-    monkeypatch.setattr(Path, "home", staticmethod(lambda: tmp_path))
-
+def most_client_e2e(tmp_home: Path) -> MostClient:
     client_id = os.environ.get("MOST_CLIENT_ID") or DEFAULT_STAGE_CONFIG["MOST_CLIENT_ID"]
     client_secret = (
         os.environ.get("MOST_CLIENT_SECRET") or DEFAULT_STAGE_CONFIG["MOST_CLIENT_SECRET"]
@@ -46,3 +52,112 @@ def most_client_e2e(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> MostClie
         yield client
     finally:
         client.session.close()
+
+
+@pytest.fixture()
+def tmp_home(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    """
+    Home directory of credentials.json, needed by clients built without client_id.
+    """
+    monkeypatch.setattr(Path, "home", staticmethod(lambda: tmp_path))
+    return tmp_path
+
+
+class FakeClock(object):
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+def make_client(handler,
+                base_url: str = BASE_URL,
+                access_token: Optional[str] = "test_token",
+                **kwargs) -> MostClient:
+    """
+    MostClient sending its requests to handler through httpx.MockTransport.
+    """
+    client = MostClient(client_id="test_client_id",
+                        client_secret="test_client_secret",
+                        base_url=base_url,
+                        http_client=httpx.Client(base_url=base_url,
+                                                 transport=httpx.MockTransport(handler)),
+                        **kwargs)
+    client.access_token = access_token
+    return client
+
+
+def make_async_client(handler,
+                      base_url: str = BASE_URL,
+                      access_token: Optional[str] = "test_token",
+                      **kwargs) -> AsyncMostClient:
+    """
+    AsyncMostClient sending its requests to an async handler, throttled
+    responses are not retried unless a transport is given.
+    """
+    kwargs.setdefault("transport", TransportConfig(retry=RetryPolicy(max_retries=0)))
+    client = AsyncMostClient(client_id="test_client_id",
+                             client_secret="test_client_secret",
+                             base_url=base_url,
+                             http_client=httpx.AsyncClient(base_url=base_url,
+                                                           transport=httpx.MockTransport(handler)),
+                             **kwargs)
+    client.access_token = access_token
+    return client
+
+
+class MockServer(object):
+    """
+    In-process API of unit tests: subclasses answer requests in answer(),
+    sync_client()/async_client() send them there after ``latency`` seconds.
+    Keeps the requests and the peak number of requests in flight.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.requests = []
+        self.in_flight = self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def answer(self, request: httpx.Request) -> httpx.Response:
+        raise NotImplementedError
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self._enter(request)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            return self.answer(request)
+        finally:
+            self._leave()
+
+    async def ahandle(self, request: httpx.Request) -> httpx.Response:
+        self._enter(request)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            return self.answer(request)
+        finally:
+            self._leave()
+
+    def sync_client(self, **kwargs) -> MostClient:
+        return make_client(self.handle, **kwargs)
+
+    def async_client(self, **kwargs) -> AsyncMostClient:
+        return make_async_client(self.ahandle, **kwargs)
+
+    def _enter(self, request: httpx.Request):
+        with self.lock:
+            self.requests.append(request)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _leave(self):
+        with self.lock:
+            self.in_flight -= 1
@@ -0,0 +1,117 @@
+import asyncio
+import base64
+import json
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from most.api import MostClient
+from most.async_api import AsyncMostClient
+from most.auth import AccessToken, decode_token_expiry
+from tests.conftest import make_async_client, make_client
+
+
+def _make_client(token_requests: list) -> AsyncMostClient:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/access_token"):
+            token_requests.append(request)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json="token-%d" % len(token_requests))
+        if request.headers["Authorization"] != "Bearer token-1":
+            return httpx.Response(401, json={"message": "expired"})
+        return httpx.Response(200, json=["tag"])
+
+    return make_async_client(handler, access_token=None)
+
+
+def test_concurrent_401_refreshes_token_once() -> None:
+    token_requests = []
+    client = _make_client(token_requests)
+    client.access_token = "expired"
+
+    async def run():
+        return await asyncio.gather(*[client.get_tags("67239029570a08554fc1f5a6")
+                                      for _ in range(50)])
+
+    results = asyncio.run(run())
+
+    assert results == [["tag"]] * 50
+    assert len(token_requests) == 1
+    assert client.access_token == "token-1"
+
+
+def test_clones_share_token_state() -> None:
+    token_requests = []
+    client = _make_client(token_requests)
+    models = [client.with_model("most-model-%d" % i) for i in range(5)]
+
+    async def run():
+        return await asyncio.gather(*[model.get_tags("67239029570a08554fc1f5a6")
+                                      for model in models])
+
+    asyncio.run(run())
+
+    assert len(token_requests) == 1
+    assert all(model.access_token == "token-1" for model in models)
+
+
+def _make_jwt(expires_in: float) -> str:
+    def encode(data: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+    return ".".join([encode({"alg": "HS256"}), encode({"exp": time.time() + expires_in}), "sig"])
+
+
+def test_decode_token_expiry() -> None:
+    token = _make_jwt(100)
+    assert decode_token_expiry(token) == pytest.approx(time.time() + 100, abs=2)
+    assert decode_token_expiry("opaque-token") is None
+    assert decode_token_expiry("a.b.c") is None
+    assert decode_token_expiry(None) is None
+
+
+def test_access_token_ttl_fallback() -> None:
+    token = AccessToken(ttl=10, min_validity=30)
+    token.value = "opaque-token"
+    assert token.needs_refresh()
+    assert AccessToken("opaque-token").expires_in() is None
+
+
+def _make_sync_client(issued_tokens: list, sent: list) -> MostClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/access_token"):
+            issued_tokens.append(_make_jwt(3600))
+            return httpx.Response(200, json=issued_tokens[-1])
+        sent.append(request.headers["Authorization"])
+        return httpx.Response(200, json={"id": "67239029570a08554fc1f5a6", "url": "https://cdn.test.ai/a.mp3"})
+
+    return make_client(handler, access_token=None)
+
+
+def test_expiring_token_is_renewed_before_upload(tmp_path: Path) -> None:
+    issued_tokens, sent = [], []
+    client = _make_sync_client(issued_tokens, sent)
+    client.access_token = _make_jwt(5)
+    audio_path = tmp_path / "call.mp3"
+    audio_path.write_bytes(b"\0" * 1024)
+
+    client.upload_audio(audio_path)
+
+    assert sent == ["Bearer %s" % issued_tokens[-1]]
+
+
+def test_token_is_renewed_in_background() -> None:
+    issued_tokens, sent = [], []
+    client = _make_sync_client(issued_tokens, sent)
+    old_token = _make_jwt(60)
+    client.access_token = old_token
+
+    client.get_tags("67239029570a08554fc1f5a6")
+
+    assert len(sent) == 1
+    deadline = time.time() + 5
+    while client.access_token == old_token and time.time() < deadline:
+        time.sleep(0.01)
+    assert client.access_token == issued_tokens[-1]
+    assert len(issued_tokens) == 1
@@ -0,0 +1,121 @@
+import asyncio
+
+import httpx
+import pytest
+
+from most.circuit_breaker import CircuitBreaker, CircuitOpenError, host_of
+from tests.conftest import make_async_client, make_client
+
+
+def test_host_of() -> None:
+    assert host_of("/client/audio/list", "https://api.test.ai/api/external") == "api.test.ai"
+    assert host_of("https://etl.test.ai:8443/api/v1/communications", "https://api.test.ai") == "etl.test.ai:8443"
+
+
+def test_circuit_opens_probes_and_closes(clock) -> None:
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10, clock=clock)
+
+    for _ in range(3):
+        breaker.before_request("etl")
+        breaker.record_failure("etl")
+    assert breaker.state("etl") == "open"
+    with pytest.raises(CircuitOpenError, match="retry in 10.0s"):
+        breaker.before_request("etl")
+    breaker.before_request("api")
+
+    clock.now = 10
+    assert breaker.state("etl") == "half_open"
+    breaker.before_request("etl")
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request("etl")
+
+    breaker.record_failure("etl")
+    assert breaker.report()["etl"] == {"state": "open", "failures": 4, "retry_in": 10.0}
+
+    clock.now = 20
+    breaker.before_request("etl")
+    breaker.record_success("etl")
+    assert breaker.report()["etl"] == {"state": "closed", "failures": 0, "retry_in": 0.0}
+
+
+def test_degraded_etl_host_fails_fast() -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.host)
+        if request.url.host == "etl.test.ai":
+            raise httpx.ConnectTimeout("timed out", request=request)
+        return httpx.Response(200, json=["tag"])
+
+    breaker = CircuitBreaker(failure_threshold=2)
+    client = make_client(handler, etl_base_url="https://etl.test.ai", circuit_breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectTimeout):
+            client.upload_communications([])
+    with pytest.raises(CircuitOpenError):
+        client.with_model("most-model").upload_communications([])
+
+    assert calls == ["etl.test.ai", "etl.test.ai"]
+    assert client.get_tags("67239029570a08554fc1f5a6") == ["tag"]
+    assert breaker.state("etl.test.ai") == "open"
+    assert breaker.state("api.test.ai") == "closed"
+
+
+def test_async_client_counts_5xx_as_failures() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503, json={"message": "down"})
+
+    breaker = CircuitBreaker(failure_threshold=3)
+    client = make_async_client(handler, circuit_breaker=breaker)
+
+    async def run():
+        for _ in range(3):
+            with pytest.raises(RuntimeError, match="down"):
+                await client.get_tags("67239029570a08554fc1f5a6")
+        with pytest.raises(CircuitOpenError):
+            await client.get_tags("67239029570a08554fc1f5a6")
+
+    asyncio.run(run())
+    assert breaker.report()["api.test.ai"]["state"] == "open"
+
+
+def test_token_fetch_goes_through_breaker() -> None:
+    token_requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        token_requests.append(request.url.path)
+        raise httpx.ConnectError("connection refused", request=request)
+
+    breaker = CircuitBreaker(failure_threshold=2)
+    client = make_client(handler, access_token=None, circuit_breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            client.get_tags("67239029570a08554fc1f5a6")
+    with pytest.raises(CircuitOpenError):
+        client.clone().refresh_access_token()
+
+    assert len(token_requests) == 2
+    assert breaker.state("api.test.ai") == "open"
+
+
+def test_async_token_fetch_goes_through_breaker() -> None:
+    token_requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        token_requests.append(request.url.path)
+        raise httpx.ConnectError("connection refused", request=request)
+
+    breaker = CircuitBreaker(failure_threshold=2)
+    client = make_async_client(handler, access_token=None, circuit_breaker=breaker)
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(httpx.ConnectError):
+                await client.refresh_access_token()
+        with pytest.raises(CircuitOpenError):
+            await client.get_tags("67239029570a08554fc1f5a6")
+
+    asyncio.run(run())
+    assert len(token_requests) == 2
@@ -0,0 +1,89 @@
+from pathlib import Path
+
+import httpx
+
+from most.api import MostClient
+from most.async_api import AsyncMostClient
+from most.transport import TransportConfig
+from tests.conftest import make_client
+
+
+def test_construction_and_cloning_do_no_io(tmp_home: Path) -> None:
+    client = MostClient(client_id="test_client_id",
+                        client_secret="test_client_secret")
+    models = [client.with_model("most-model-%d" % i) for i in range(100)]
+
+    assert not (tmp_home / ".most" / "credentials.json").exists()
+    assert client._session._session is None
+    assert client.access_token is None
+    assert all(model._session is client._session for model in models)
+    assert all(model._token is client._token for model in models)
+    assert models[3].model_id == "most-model-3"
+    assert client.model_id is None
+
+
+def test_async_clone_does_not_build_http_client() -> None:
+    client = AsyncMostClient(client_id="test_client_id",
+                             client_secret="test_client_secret")
+    model = client.with_model("most-model")
+
+    assert client._session._session is None
+    assert model._session is client._session
+
+
+def test_token_is_fetched_on_first_request_only() -> None:
+    token_requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/access_token"):
+            token_requests.append(request)
+            return httpx.Response(200, json="token")
+        return httpx.Response(200, json=[])
+
+    client = make_client(handler, access_token=None)
+    assert token_requests == []
+
+    for model in [client.with_model("most-model-%d" % i) for i in range(10)]:
+        model.get_tags("67239029570a08554fc1f5a6")
+
+    assert len(token_requests) == 1
+
+
+def test_user_http_client_keeps_its_timeout() -> None:
+    timeouts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        timeouts.append(request.extensions["timeout"])
+        return httpx.Response(200, json=[])
+
+    client = MostClient(client_id="test_client_id",
+                        client_secret="test_client_secret",
+                        transport=TransportConfig(timeout=1.0),
+                        http_client=httpx.Client(base_url="https://api.test.ai",
+                                                 timeout=42.0,
+                                                 transport=httpx.MockTransport(handler)))
+    client.access_token = "test_token"
+    client.get_tags("67239029570a08554fc1f5a6")
+
+    assert timeouts[-1]["read"] == 42.0
+
+
+def test_transport_config_timeout_is_sent_with_requests() -> None:
+    timeouts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        timeouts.append(request.extensions["timeout"])
+        return httpx.Response(200, json=[])
+
+    class MockTransportConfig(TransportConfig):
+        def build_client(self, base_url) -> httpx.Client:
+            return httpx.Client(base_url=base_url, transport=httpx.MockTransport(handler))
+
+    client = MostClient(client_id="test_client_id",
+                        client_secret="test_client_secret",
+                        base_url="https://api.test.ai",
+                        transport=MockTransportConfig(timeout=7.0))
+    client.access_token = "test_token"
+    client.get_tags("67239029570a08554fc1f5a6")
+
+    assert timeouts[-1]["read"] == 7.0
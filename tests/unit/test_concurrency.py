@@ -0,0 +1,100 @@
+import asyncio
+
+import httpx
+import pytest
+
+from most.concurrency import AdaptiveConcurrencyLimiter, route_of
+from tests.conftest import make_async_client
+
+
+def test_limit_grows_additively_and_shrinks_multiplicatively() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=10, latency_tolerance=None)
+
+    for _ in range(10):
+        limiter.observe(0.01, overloaded=False)
+    assert limiter.limit == pytest.approx(11, abs=0.1)
+
+    limiter.observe(0.01, overloaded=True)
+    assert limiter.limit == pytest.approx(5.5, abs=0.1)
+
+    # failures of the same round-trip count as one signal
+    limiter.observe(10.0, overloaded=True)
+    assert limiter.limit == pytest.approx(5.5, abs=0.1)
+
+
+def test_latency_is_compared_per_route() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=10, latency_tolerance=3.0)
+    limiter.observe(0.01, overloaded=False, route="GET /tags")
+    limiter.observe(5.0, overloaded=False, route="POST /apply")
+    assert limiter.limit > 10
+
+    limiter.observe(0.5, overloaded=False, route="GET /tags")
+    assert limiter.limit < 10
+
+
+def test_route_masks_ids() -> None:
+    assert route_of("post", "/67239029570a08554fc1f5a6/audio/67239029570a08554fc1f5a7/model/most-67239029570a08554fc1f5a8/apply") == \
+        "POST /{id}/audio/{id}/model/{id}/apply"
+
+
+def test_overloaded_responses_do_not_set_latency_baseline() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=10)
+    limiter.observe(0.0001, overloaded=True, route="GET /tags")
+    assert limiter.min_latency == {}
+
+    limiter.observe(0.01, overloaded=False, route="GET /tags")
+    limiter.observe(0.01, overloaded=False, route="GET /tags")
+    assert limiter.min_latency == {"GET /tags": 0.01}
+    assert limiter.limit > 5
+
+
+def test_limiter_is_reusable_across_event_loops() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, latency_tolerance=None)
+    peak = []
+
+    async def request():
+        async with limiter.slot("GET", "/tags"):
+            peak.append(limiter.in_flight)
+            await asyncio.sleep(0.001)
+
+    async def run():
+        await asyncio.gather(*[request() for _ in range(10)])
+
+    asyncio.run(run())
+    asyncio.run(run())
+
+    assert len(peak) == 20
+    assert max(peak) <= limiter.limit
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.parametrize("limiter_kwargs", [{"latency_tolerance": None}, {}])
+def test_client_converges_to_server_capacity(limiter_kwargs) -> None:
+    capacity = 8
+    state = {"in_flight": 0, "throttled": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/access_token"):
+            return httpx.Response(200, json="token")
+        state["in_flight"] += 1
+        try:
+            if state["in_flight"] > capacity:
+                state["throttled"] += 1
+                return httpx.Response(429)
+            await asyncio.sleep(0.005)
+            return httpx.Response(200, json=[])
+        finally:
+            state["in_flight"] -= 1
+
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=64, **limiter_kwargs)
+    client = make_async_client(handler, concurrency_limiter=limiter)
+
+    async def run():
+        return await asyncio.gather(*[client.request("GET", "/tags") for _ in range(1500)])
+
+    responses = asyncio.run(run())
+
+    assert len(responses) == 1500
+    assert limiter.in_flight == 0
+    assert capacity / 2 <= limiter.limit <= 2 * capacity + 1
+    assert state["throttled"] < 300
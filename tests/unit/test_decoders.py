@@ -0,0 +1,121 @@
+import gc
+from typing import List
+
+import httpx
+import pytest
+
+from most.api import MostClient
+from most.decoders import DecodeError, decode, decoder_for
+from most.searcher import MostSearcher
+from most.types import (
+    Audio,
+    DialogResult,
+    Item,
+    JobStatus,
+    Result,
+    StoredAudioData,
+    StoredTextData,
+)
+from tests.conftest import make_client
+
+
+COLUMN = {"name": "Приветствие",
+          "subcolumns": [{"name": "Назвал имя", "score": "3", "description": "ok"},
+                         {"name": "Назвал компанию"}]}
+
+
+@pytest.mark.parametrize("data, tp", [
+    ({"id": "r1", "text": "t", "url": None, "results": [COLUMN],
+      "created_at": 1700000000, "applied_at": "2024-01-01T10:00:00+00:00",
+      "edits": [{"column_name": "Приветствие", "subcolumn_name": "Назвал имя", "score": 1,
+                 "data": {"a": True, "b": 1.5, "c": "x"}, "timestamp": 5}],
+      "unknown_key": 1}, Result),
+    ({"id": "r2"}, Result),
+    ({"id": "d1", "results": [COLUMN],
+      "dialog": {"segments": [{"start_time_ms": 0, "end_time_ms": 10, "text": "Алло",
+                               "speaker": "Оператор", "intensity": 1}]}}, DialogResult),
+    ([{"id": "a1", "url": "https://cdn.test.ai/a1.mp3", "data": {"manager": "Иван", "duration": 61},
+       "results": {"most-model": [COLUMN]}},
+      {"id": "t1", "data": {"manager": "Пётр"}},
+      {"id": "t2", "url": None}], List[StoredAudioData | StoredTextData]),
+    ({"id": "a1", "url": "https://cdn.test.ai/a1.mp3"}, Audio),
+    ({"status": "pending"}, JobStatus),
+])
+def test_decoders_match_retort(data, tp) -> None:
+    assert decode(data, tp) == MostClient.retort.load(data, tp)
+
+
+def test_union_picks_first_matching_variant() -> None:
+    audio, text = decode([{"id": "a", "url": "u"}, {"id": "t"}], List[StoredAudioData | StoredTextData])
+    assert type(audio) is StoredAudioData
+    assert type(text) is StoredTextData
+
+
+@pytest.mark.parametrize("data, tp", [
+    ({"url": "u"}, Audio),
+    ({"id": 1, "url": "u"}, Audio),
+    ({"status": "unknown"}, JobStatus),
+    ([{"id": "a", "results": [1]}], List[Result]),
+])
+def test_invalid_data_is_rejected(data, tp) -> None:
+    with pytest.raises(DecodeError):
+        decode(data, tp)
+
+
+def test_item_decoder_matches_from_dict() -> None:
+    data = {"title": "Чайник", "pronunciation": "чайник", "price": 1990,
+            "image_urls": ["https://cdn.test.ai/1.png"], "metadata": {"color": "red", "new": True},
+            "id": "i1"}
+    assert decode(data, Item) == Item.from_dict(data)
+    assert decode({"title": "t", "pronunciation": "p"}, Item).image_urls == []
+    with_null = {"title": "t", "pronunciation": "p", "metadata": {"color": None, "size": 42}}
+    assert decode(with_null, Item) == Item.from_dict(with_null)
+    assert decode([with_null], List[Item])[0].metadata == {"color": None, "size": 42}
+
+
+def test_decoders_are_built_once() -> None:
+    assert decoder_for(List[Result]) is decoder_for(List[Result])
+    assert decoder_for(Result) is decoder_for(Result)
+
+
+def test_decode_leaves_gc_alone_by_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    def disable():
+        raise AssertionError("decode() paused gc without pause_gc=True")
+
+    monkeypatch.setattr(gc, "disable", disable)
+    assert decode([{"id": "r"}], List[Result]) == [Result(id="r")]
+
+
+def test_decode_pause_gc_restores_gc_state() -> None:
+    assert gc.isenabled()
+    decode([{"id": "r"}], List[Result], pause_gc=True)
+    assert gc.isenabled()
+
+    gc.disable()
+    try:
+        decode([{"id": "r"}], List[Result], pause_gc=True)
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
+
+    with pytest.raises(DecodeError):
+        decode([{"id": 1}], List[Result], pause_gc=True)
+    assert gc.isenabled()
+
+
+def test_bulk_responses_are_decoded_with_gc_paused(monkeypatch: pytest.MonkeyPatch) -> None:
+    disabled = []
+    monkeypatch.setattr(gc, "disable", lambda: disabled.append(True))
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/results"):
+            return httpx.Response(200, json={"id": "r", "results": [COLUMN]})
+        return httpx.Response(200, json=[{"id": "a", "url": "https://cdn.test.ai/a.mp3"}])
+
+    client = make_client(handler, model_id="most-67239029570a08554fc1f5a7")
+    client.list_audios()
+    client.fetch_results("67239029570a08554fc1f5a6")
+    MostSearcher(client, "audio").search()
+
+    assert len(disabled) == 3
+    assert gc.isenabled()
@@ -0,0 +1,56 @@
+import asyncio
+import json
+
+import httpx
+
+from most.async_searcher import AsyncMostSearcher
+from most.search_types import SearchParams, StoredInfoCondition, TagsCondition
+from most.searcher import MostSearcher
+from tests.conftest import MockServer
+
+FACETS = {"tag %d" % i: [TagsCondition(in_set=["tag %d" % i])] for i in range(30)}
+
+
+class Server(MockServer):
+    """
+    count answers with the tag of the last condition, distinct with the key.
+    """
+    def answer(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/distinct"):
+            return httpx.Response(200, json=[request.url.params["key"]])
+        must = json.loads(request.url.params["filter"])["must"]
+        tags = [cond for cond in must if cond["type"] == "TagsCondition"]
+        assert {"key": "manager", "match": "Иван", "type": "StoredInfoCondition"} in must
+        return httpx.Response(200, json=int(tags[0]["in_set"][0].split()[1]))
+
+
+BASE_FILTER = SearchParams(must=[StoredInfoCondition(key="manager", match="Иван")])
+
+
+def test_facet_counts_run_concurrently() -> None:
+    server = Server(latency=0.01)
+    searcher = MostSearcher(server.sync_client(), "audio")
+
+    counts = searcher.facet_counts(BASE_FILTER, FACETS, max_concurrency=5)
+
+    assert counts == {"tag %d" % i: i for i in range(30)}
+    assert list(counts) == list(FACETS)
+    assert 1 < server.max_in_flight <= 5
+    assert BASE_FILTER.must == [StoredInfoCondition(key="manager", match="Иван")]
+    assert searcher.distinct_many(["manager", "branch"], BASE_FILTER) == {"manager": ["manager"],
+                                                                          "branch": ["branch"]}
+
+
+def test_async_facet_counts_are_bounded() -> None:
+    server = Server(latency=0.01)
+    searcher = AsyncMostSearcher(server.async_client(), "audio")
+
+    async def run():
+        return (await searcher.facet_counts(BASE_FILTER, FACETS, max_concurrency=6),
+                await searcher.distinct_many(["manager", "branch", "city"]))
+
+    counts, values = asyncio.run(run())
+
+    assert counts == {"tag %d" % i: i for i in range(30)}
+    assert server.max_in_flight == 6
+    assert values == {"manager": ["manager"], "branch": ["branch"], "city": ["city"]}
@@ -0,0 +1,102 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from most import json_backend
+from most.admin.async_tuner import AsyncTuner
+from most.admin.tuner import Tuner
+from most.json_backend import JSONBackend, encode_json_body, load_backend, response_json
+from tests.conftest import make_async_client, make_client
+
+
+@pytest.fixture
+def restore_backend():
+    backend = json_backend.backend
+    yield
+    json_backend.set_backend(backend)
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "msgspec"])
+def test_backends_agree_with_stdlib(name) -> None:
+    pytest.importorskip(name)
+    backend = load_backend(name)
+    data = {"text": "Иван Иванов", "scores": [1, 2.5, None, True], "nested": {"a": []}}
+
+    assert backend.name == name
+    assert json.loads(backend.dumps(data)) == data
+    assert backend.loads(json.dumps(data).encode()) == data
+    assert json.loads(backend.dumps({1: "a"})) == {"1": "a"}
+
+
+def test_unknown_backend() -> None:
+    with pytest.raises(ValueError, match="Unknown JSON backend"):
+        load_backend("yaml")
+
+
+def test_encode_json_body() -> None:
+    kwargs = encode_json_body({"json": {"a": 1}, "headers": {"X-Test": "1"}, "params": {"p": 2}})
+
+    assert json.loads(kwargs["content"]) == {"a": 1}
+    assert kwargs["headers"] == {"X-Test": "1", "Content-Type": "application/json"}
+    assert kwargs["params"] == {"p": 2}
+    assert encode_json_body({"json": None}) == {}
+    assert response_json(httpx.Response(200, content=b'{"a": [1]}')) == {"a": [1]}
+
+
+def test_body_is_encoded_once_across_401_resend(restore_backend) -> None:
+    encoded = []
+
+    def dumps(obj):
+        encoded.append(obj)
+        return json.dumps(obj).encode()
+
+    json_backend.set_backend(JSONBackend("counting", dumps, json.loads))
+    bodies = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/access_token"):
+            return httpx.Response(200, json="fresh")
+        bodies.append(json.loads(request.content))
+        if request.headers["Authorization"] != "Bearer fresh":
+            return httpx.Response(401)
+        return httpx.Response(200, json={"status_per_communication": {}, "total_saved": 0})
+
+    client = make_client(handler, access_token="expired", etl_base_url="https://etl.test.ai")
+
+    assert client.upload_communications([], overwrite=True).total_saved == 0
+    assert len(bodies) == 2
+    assert bodies[0] == bodies[1] == {"communications": [], "overwrite": True}
+    assert len(encoded) == 1
+
+
+def test_tuners_use_backend(restore_backend) -> None:
+    calls = []
+
+    def dumps(obj):
+        calls.append("dumps")
+        return json.dumps(obj).encode()
+
+    def loads(data):
+        calls.append("loads")
+        return json.loads(data)
+
+    json_backend.set_backend(JSONBackend("counting", dumps, loads))
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert json.loads(request.content)["model_name"] == "copy"
+        return httpx.Response(200, content=b'{"model": "most-67239029570a08554fc1f5a7"}',
+                              headers={"Content-Type": "application/json"})
+
+    async def ahandler(request: httpx.Request) -> httpx.Response:
+        return handler(request)
+
+    tuner = Tuner(make_client(handler), "admin", "secret")
+    assert tuner.clone_model("copy", "whisper", "llm").model_id == "most-67239029570a08554fc1f5a7"
+    assert calls == ["dumps", "loads"]
+
+    async_tuner = AsyncTuner(make_async_client(ahandler), "admin", "secret")
+    model = asyncio.run(async_tuner.clone_model("copy", "whisper", "llm"))
+    assert model.model_id == "most-67239029570a08554fc1f5a7"
+    assert calls == ["dumps", "loads"] * 2
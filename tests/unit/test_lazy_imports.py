@@ -0,0 +1,55 @@
+import subprocess
+import sys
+
+import pytest
+
+import most
+
+
+def imported_after(statement: str) -> set:
+    code = "import sys; %s; print(' '.join(sorted(sys.modules)))" % statement
+    out = subprocess.run([sys.executable, "-c", code], check=True,
+                         capture_output=True, text=True).stdout
+    return set(out.split())
+
+
+def test_import_most_is_lazy():
+    modules = imported_after("import most")
+    assert "most.api" not in modules
+    assert not {"httpx", "adaptix", "pydub", "cryptography", "json5"} & modules
+
+
+def test_client_does_not_import_optional_dependencies():
+    modules = imported_after("from most import MostClient")
+    assert "most.api" in modules
+    assert not {"adaptix", "pydub", "cryptography", "json5"} & modules
+
+
+def test_lazy_attributes():
+    from most.api import MostClient
+    from most.types import CommunicationRequest
+
+    assert most.MostClient is MostClient
+    assert most.CommunicationRequest is CommunicationRequest
+    assert set(most.__all__) <= set(dir(most))
+    with pytest.raises(AttributeError):
+        most.NoSuchClient
+
+
+def test_submodules_are_attributes():
+    code = ("import most; "
+            "print(most.types.Audio.__module__, most.api.MostClient.__name__, most.search_types.__name__)")
+    out = subprocess.run([sys.executable, "-c", code], check=True,
+                         capture_output=True, text=True).stdout
+    assert out.split() == ["most.types", "MostClient", "most.search_types"]
+    with pytest.raises(AttributeError):
+        most.no_such_module
+
+
+def test_retort_is_built_on_first_access():
+    from most.api import MostClient
+    from most.async_api import AsyncMostClient
+
+    assert MostClient.retort is MostClient.retort
+    assert MostClient.retort.load({"id": "1", "url": "u"}, most.types.Audio).id == "1"
+    assert AsyncMostClient.retort.load("42", int) == 42
@@ -0,0 +1,130 @@
+import functools
+from typing import List
+
+import pytest
+
+from most.local_aggregation import LocalAggregator
+from most.score_calculation import ScoreCalculation
+from most.score_matrix import ScoreMatrix
+from most.search_types import (
+    AggregatedAllField,
+    AggregatedColumnField,
+    AggregatedField,
+    AggregatedResultsCondition,
+)
+from most.types import Column, Script, ScriptScoreMapping, StoredAudioData
+from most.views import view
+
+SCRIPT = Script(columns=[Column(name="Приветствие", subcolumns=["Имя", "Компания"]),
+                         Column(name="Итог", subcolumns=["Результат"])])
+MODIFIERS = {"model": ScoreCalculation(score_mapping=[
+    ScriptScoreMapping(column="Итог", subcolumn="Результат", from_score=4, to_score=100),
+    ScriptScoreMapping(column="Приветствие", subcolumn="Имя", from_score=0, to_score=-1),
+])}
+FIELDS = [
+    [AggregatedAllField()],
+    [AggregatedColumnField(column_idx=0)],
+    [AggregatedField(column_idx=1, subcolumn_idx=0), AggregatedField(column_idx=0, subcolumn_idx=1)],
+    [AggregatedField(column_idx=5, subcolumn_idx=0)],
+]
+
+
+def make_item(i: int) -> dict:
+    return {"id": "%024x" % i,
+            "url": "https://cdn.test.ai/%d.mp3" % i,
+            "data": {"manager": ["Иван", "Мария", "Пётр"][i % 3]} if i % 11 else None,
+            "results": None if i % 7 == 0 else
+            {"model": [{"name": "Приветствие",
+                        "subcolumns": [{"name": "Имя", "score": i % 3},
+                                       {"name": "Компания", "score": None if i % 4 == 0 else i % 2}]},
+                       {"name": "Итог",
+                        "subcolumns": [{"name": "Результат", "score": i % 5}]}]}}
+
+
+@functools.lru_cache(maxsize=None)
+def items() -> List[StoredAudioData]:
+    return [StoredAudioData.from_dict(make_item(i)) for i in range(200)]
+
+
+def expected_values(fields, aggregation, modified) -> List:
+    # per item, the way the server (and LocalFilter) aggregate positional results
+    mapping = {(sm.column, sm.subcolumn, sm.from_score): sm.to_score for sm in MODIFIERS["model"].score_mapping}
+    values = []
+    for item in items():
+        columns = item.results["model"] if item.results else []
+        scores = []
+        for field in fields:
+            if isinstance(field, AggregatedField):
+                pairs = [(c, s) for ci, c in enumerate(columns) if ci == field.column_idx
+                         for si, s in enumerate(c.subcolumns) if si == field.subcolumn_idx]
+            elif isinstance(field, AggregatedColumnField):
+                pairs = [(c, s) for ci, c in enumerate(columns) if ci == field.column_idx for s in c.subcolumns]
+            else:
+                pairs = [(c, s) for c in columns for s in c.subcolumns]
+            for column, subcolumn in pairs:
+                if subcolumn.score is not None:
+                    score = subcolumn.score
+                    if modified:
+                        score = mapping.get((column.name, subcolumn.name, score), score)
+                    scores.append(score)
+        if not scores:
+            values.append(None)
+        elif aggregation == "avg":
+            values.append(sum(scores) / len(scores))
+        else:
+            values.append(float({"sum": sum, "min": min, "max": max}[aggregation](scores)))
+    return values
+
+
+@pytest.mark.parametrize("fields", FIELDS)
+@pytest.mark.parametrize("aggregation", ["sum", "avg", "min", "max"])
+@pytest.mark.parametrize("modified", [False, True])
+def test_values_match_condition_semantics(fields, aggregation, modified) -> None:
+    condition = AggregatedResultsCondition(fields=fields, model_id="model", aggregation=aggregation, modified=modified)
+    aggregator = LocalAggregator.from_condition(condition, SCRIPT, MODIFIERS, use_numpy=False)
+    matrix = ScoreMatrix.from_results(items(), SCRIPT, model_id="model")
+
+    assert aggregator.values(matrix) == pytest.approx(expected_values(fields, aggregation, modified))
+
+
+def test_group_by_data_key() -> None:
+    aggregator = LocalAggregator(SCRIPT, [AggregatedAllField()], "avg", model_id="model", use_numpy=False)
+    values = expected_values([AggregatedAllField()], "avg", False)
+
+    stats = aggregator.group_by([view(make_item(i), StoredAudioData) for i in range(200)], "manager")
+
+    managers = [make_item(i)["data"]["manager"] if make_item(i)["data"] else None for i in range(200)]
+    assert set(stats) == {"Иван", "Мария", "Пётр", None}
+    for manager, group_stats in stats.items():
+        group_values = [v for m, v in zip(managers, values) if m == manager and v is not None]
+        assert group_stats.count == len(group_values)
+        assert group_stats.sum == pytest.approx(sum(group_values))
+        assert group_stats.avg == pytest.approx(sum(group_values) / len(group_values))
+        assert group_stats.min == min(group_values)
+        assert group_stats.max == max(group_values)
+
+
+def test_modified_condition_needs_score_modifier() -> None:
+    condition = AggregatedResultsCondition(fields=[AggregatedAllField()], model_id="model", modified=True)
+
+    with pytest.raises(ValueError):
+        LocalAggregator.from_condition(condition, SCRIPT)
+
+
+@pytest.mark.parametrize("fields", FIELDS)
+@pytest.mark.parametrize("aggregation", ["sum", "avg", "min", "max"])
+def test_numpy_matches_python(fields, aggregation) -> None:
+    pytest.importorskip("numpy")
+    condition = AggregatedResultsCondition(fields=fields, model_id="model", aggregation=aggregation, modified=True)
+    vectorized = LocalAggregator.from_condition(condition, SCRIPT, MODIFIERS, use_numpy=True)
+    python = LocalAggregator.from_condition(condition, SCRIPT, MODIFIERS, use_numpy=False)
+    matrix = ScoreMatrix.from_results(items(), SCRIPT, model_id="model")
+
+    assert vectorized.values(matrix) == pytest.approx(python.values(matrix))
+    vectorized_stats = vectorized.group_by(items(), "manager")
+    python_stats = python.group_by(items(), "manager")
+    assert set(vectorized_stats) == set(python_stats)
+    for manager, stats in python_stats.items():
+        assert vectorized_stats[manager].count == stats.count
+        assert vectorized_stats[manager].sum == pytest.approx(stats.sum)
+        assert (vectorized_stats[manager].min, vectorized_stats[manager].max) == (stats.min, stats.max)
@@ -0,0 +1,133 @@
+from typing import List
+
+import pytest
+
+from most.local_search import LocalFilter
+from most.score_calculation import ScoreCalculation
+from most.search_types import (
+    AggregatedAllField,
+    AggregatedColumnField,
+    AggregatedField,
+    AggregatedResultsCondition,
+    ChannelsCondition,
+    DurationCondition,
+    ExistsResultsCondition,
+    IDCondition,
+    ResultsCondition,
+    SearchParams,
+    StoredInfoCondition,
+    TagsCondition,
+    URLCondition,
+)
+from most.types import ScriptScoreMapping, StoredAudioData, StoredTextData
+from most.views import view
+
+
+def make_item(i: int) -> dict:
+    return {"id": "%024x" % i,
+            "url": "https://cdn.test.ai/%s/%d.mp3" % ("sales" if i % 2 else "support", i),
+            "data": {"manager": ["Иван", "Мария", "Пётр"][i % 3],
+                     "duration": 30 * i,
+                     "channels": 1 + i % 2,
+                     "tags": ["vip"] if i % 5 == 0 else "new",
+                     "branch": i % 4},
+            "results": None if i % 7 == 0 else
+            {"model": [{"name": "Приветствие",
+                        "subcolumns": [{"name": "Имя", "score": i % 3},
+                                       {"name": "Компания", "score": None if i % 4 == 0 else i % 2}]},
+                       {"name": "Итог",
+                        "subcolumns": [{"name": "Результат", "score": i % 5}]}]}}
+
+
+ITEMS = [StoredAudioData.from_dict(make_item(i)) for i in range(1, 60)]
+
+
+def matching(filter: SearchParams, items=ITEMS, **kwargs) -> List[int]:
+    return [int(item.id, 16) for item in LocalFilter(filter, **kwargs).filter(items)]
+
+
+def expected(predicate) -> List[int]:
+    return [int(item.id, 16) for item in ITEMS if predicate(item)]
+
+
+def scores(item) -> List[int]:
+    return [s.score for column in item.results["model"] for s in column.subcolumns if s.score is not None]
+
+
+@pytest.mark.parametrize("condition, predicate", [
+    (IDCondition(equal="%024x" % 5), lambda item: item.id == "%024x" % 5),
+    (IDCondition(in_set=["%024x" % 5, "%024x" % 7, "missing"]), lambda item: int(item.id, 16) in (5, 7)),
+    (IDCondition(greater_than="%024x" % 10, not_greater_than="%024x" % 20), lambda item: 10 < int(item.id, 16) <= 20),
+    (StoredInfoCondition(key="manager", match="Мария"), lambda item: item.data["manager"] == "Мария"),
+    (StoredInfoCondition(key="manager", starts_with="П", ends_with="р"), lambda item: item.data["manager"] == "Пётр"),
+    (StoredInfoCondition(key="branch", not_less_than=2), lambda item: item.data["branch"] >= 2),
+    (StoredInfoCondition(key="manager", greater_than=1), lambda item: False),
+    (StoredInfoCondition(key="missing"), lambda item: False),
+    (DurationCondition(greater_than=300, less_than=600), lambda item: 300 < item.data["duration"] < 600),
+    (ChannelsCondition(equal=2), lambda item: item.data["channels"] == 2),
+    (URLCondition(starts_with="https://cdn.test.ai/sales"), lambda item: "sales" in item.url),
+    (TagsCondition(in_set=["vip", "other"]), lambda item: item.data["tags"] == ["vip"]),
+    (TagsCondition(in_set=["new"]), lambda item: item.data["tags"] == "new"),
+    (ExistsResultsCondition(model_id="model"), lambda item: item.results is not None),
+    (ExistsResultsCondition(model_id="other"), lambda item: False),
+    (ResultsCondition(column_idx=0, subcolumn_idx=1, model_id="model", score_equal=1),
+     lambda item: item.results and item.results["model"][0].subcolumns[1].score == 1),
+    (ResultsCondition(column_idx=1, subcolumn_idx=0, model_id="model", score_in_set=[0, 4], score_greater_than=0),
+     lambda item: item.results and item.results["model"][1].subcolumns[0].score == 4),
+    (ResultsCondition(column_idx=3, subcolumn_idx=0, model_id="model", score_greater_than=0), lambda item: False),
+    (AggregatedResultsCondition(fields=[AggregatedAllField()], model_id="model", aggregation="sum", greater_than=5),
+     lambda item: item.results and sum(scores(item)) > 5),
+    (AggregatedResultsCondition(fields=[AggregatedColumnField(column_idx=0), AggregatedField(column_idx=1, subcolumn_idx=0)],
+                                model_id="model", aggregation="avg", not_greater_than=1),
+     lambda item: item.results and sum(scores(item)) / len(scores(item)) <= 1),
+    (AggregatedResultsCondition(fields=[AggregatedColumnField(column_idx=0)], model_id="model", aggregation="max", less_than=1),
+     lambda item: item.results and max(s.score for s in item.results["model"][0].subcolumns if s.score is not None) < 1),
+])
+def test_conditions(condition, predicate) -> None:
+    assert matching(SearchParams(must=[condition])) == expected(predicate)
+    assert matching(SearchParams(must_not=[condition])) == expected(lambda item: not predicate(item))
+
+
+def test_clauses() -> None:
+    vip = TagsCondition(in_set=["vip"])
+    ivan = StoredInfoCondition(key="manager", match="Иван")
+    long = DurationCondition(greater_than=900)
+
+    assert matching(SearchParams()) == expected(lambda item: True)
+    assert matching(SearchParams(must=[ivan, long])) == \
+        expected(lambda item: item.data["manager"] == "Иван" and item.data["duration"] > 900)
+    assert matching(SearchParams(should=[vip, ivan])) == \
+        expected(lambda item: item.data["tags"] == ["vip"] or item.data["manager"] == "Иван")
+    assert matching(SearchParams(should_not=[vip, ivan])) == \
+        expected(lambda item: not (item.data["tags"] == ["vip"] and item.data["manager"] == "Иван"))
+    assert matching(SearchParams(must=[long], should=[vip, ivan], must_not=[IDCondition(equal="%024x" % 45)])) == \
+        expected(lambda item: item.data["duration"] > 900 and item.id != "%024x" % 45
+                 and (item.data["tags"] == ["vip"] or item.data["manager"] == "Иван"))
+
+
+def test_modified_scores() -> None:
+    condition = ResultsCondition(column_idx=1, subcolumn_idx=0, model_id="model", score_equal=10, modified=True)
+    modifier = ScoreCalculation(score_mapping=[ScriptScoreMapping(column="Итог", subcolumn="Результат",
+                                                                  from_score=4, to_score=10)])
+
+    assert matching(SearchParams(must=[condition]), score_modifiers={"model": modifier}) == \
+        expected(lambda item: item.results and item.results["model"][1].subcolumns[0].score == 4)
+    with pytest.raises(ValueError):
+        LocalFilter(SearchParams(must=[condition]))
+
+
+def test_views_text_data_and_helpers() -> None:
+    raw_items = [make_item(i) for i in range(1, 60)]
+    views = [view(item, StoredAudioData) for item in raw_items]
+    filter = SearchParams(must=[ResultsCondition(column_idx=0, subcolumn_idx=0, model_id="model", score_equal=2),
+                                StoredInfoCondition(key="manager", match="Мария")])
+    local = LocalFilter(filter)
+
+    assert matching(filter, items=views) == matching(filter)
+    assert local.mask(ITEMS) == [local(item) for item in ITEMS]
+    assert local.count(views) == len(local.filter(ITEMS))
+
+    texts = [StoredTextData(id=item["id"], data=item["data"]) for item in raw_items]
+    assert LocalFilter(SearchParams(must=[URLCondition(starts_with="https")])).filter(texts) == []
+    assert len(LocalFilter(SearchParams(must=[ChannelsCondition(equal=1)])).filter(texts)) == len(
+        [item for item in raw_items if item["data"]["channels"] == 1])
@@ -0,0 +1,111 @@
+import asyncio
+from collections import Counter
+
+import httpx
+
+from most.model_cache import ModelMetadataCache
+from most.search_types import ResultsCondition
+from tests.conftest import MockServer
+
+MODEL_ID = "65b0a7600000000000000000"
+SCRIPT = {"columns": [{"name": "Приветствие", "subcolumns": ["Имя", "Компания"]}]}
+
+
+class Server(MockServer):
+    def __init__(self):
+        super().__init__()
+        self.etag = '"v1"'
+        self.not_modified = 0
+
+    @property
+    def calls(self) -> Counter:
+        return Counter(request.url.path.rsplit("/", 1)[-1] for request in self.requests)
+
+    def answer(self, request: httpx.Request) -> httpx.Response:
+        kind = request.url.path.rsplit("/", 1)[-1]
+        if request.headers.get("If-None-Match") == self.etag:
+            self.not_modified += 1
+            return httpx.Response(304, headers={"ETag": self.etag})
+        if kind == "list_models":
+            body = [{"model": MODEL_ID, "alias": "sales"}, {"model": "65b0a7600000000000000001"}]
+        elif kind == "script":
+            body = SCRIPT
+        elif kind == "info":
+            body = {"model_id": MODEL_ID, "secondary_model_ids": [], "script": SCRIPT}
+        elif kind == "score_mapping":
+            body = [{"column": "Приветствие", "subcolumn": "Имя", "from_score": 1, "to_score": 5}]
+        else:
+            raise AssertionError(request.url)
+        return httpx.Response(200, json=body, headers={"ETag": self.etag})
+
+
+def test_metadata_is_shared_by_model_handles() -> None:
+    server = Server()
+    client = server.sync_client(model_cache=ModelMetadataCache())
+
+    for _ in range(3):
+        model = client.list_models()[0]
+        assert model.model_alias == "sales"
+        assert model.get_model_script().columns[0].subcolumns == ["Имя", "Компания"]
+        assert model.get_model_info().model_id == MODEL_ID
+        assert model.get_score_modifier().modify_single("Приветствие", "Имя", 1) == 5
+        assert model.with_model(MODEL_ID).get_score_modifier() is model.get_score_modifier()
+
+    assert server.calls == {"list_models": 1, "script": 1, "info": 1, "score_mapping": 1}
+    client.with_model("65b0a7600000000000000001").get_model_script()
+    assert server.calls["script"] == 2
+
+
+def test_create_from_uses_cached_script_only() -> None:
+    server = Server()
+    model = server.sync_client(model_cache=ModelMetadataCache()).with_model(MODEL_ID)
+
+    for _ in range(5):
+        condition = ResultsCondition.create_from(None, model, "Приветствие", "Компания", score_equal=1)
+        assert (condition.column_idx, condition.subcolumn_idx) == (0, 1)
+    modified = ResultsCondition.create_from(None, model, "Приветствие", "Имя", score_equal=5, modified_scores=True)
+
+    assert modified.score_equal == 1
+    assert server.calls == {"script": 1, "score_mapping": 1}
+
+
+def test_stale_entries_are_revalidated_by_etag(clock) -> None:
+    server = Server()
+    cache = ModelMetadataCache(ttl=60, clock=clock)
+    model = server.sync_client(model_cache=cache).with_model(MODEL_ID)
+    script = model.get_model_script()
+
+    clock.now = 59
+    assert model.get_model_script() is script
+    clock.now = 61
+    assert model.get_model_script() is script
+    assert (server.calls["script"], server.not_modified) == (2, 1)
+    clock.now = 100
+    assert model.get_model_script() is script
+    assert server.calls["script"] == 2
+
+    server.etag = '"v2"'
+    clock.now = 200
+    assert model.get_model_script() is not script
+    assert server.calls["script"] == 3
+
+    cache.invalidate("test_client_id", MODEL_ID)
+    model.get_model_script()
+    assert server.calls["script"] == 4
+
+
+def test_async_clones_share_metadata() -> None:
+    server = Server()
+    client = server.async_client()
+
+    async def run():
+        for _ in range(3):
+            model = (await client.list_models())[0]
+            await model.get_model_script()
+            await model.get_model_info()
+            await model.without_model().with_model(MODEL_ID).get_score_modifier()
+            await ResultsCondition.acreate_from(None, model, "Приветствие", "Имя", score_equal=1)
+
+    asyncio.run(run())
+
+    assert server.calls == {"list_models": 1, "script": 1, "info": 1, "score_mapping": 1}
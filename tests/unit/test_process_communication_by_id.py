@@ -1,3 +1,4 @@
+import json
 from unittest.mock import Mock
 import pytest
 import httpx
@@ -59,7 +60,7 @@ def test_process_communication_by_id_success(mock_client):
         "https://etl.test.ai/api/v1/process_communication_by_id"
     )
     assert call_args[1]["headers"]["Authorization"] == "Bearer test_token"
-    assert call_args[1]["json"] == {"most_communication_id": "most-abc123"}
+    assert json.loads(call_args[1]["content"]) == {"most_communication_id": "most-abc123"}
 
 
 def test_process_communication_by_id_success_with_kwargs(mock_client):
@@ -86,7 +87,7 @@ def test_process_communication_by_id_success_with_kwargs(mock_client):
     assert result.most_communication_id == "most-xyz789"
 
     call_args = mock_client.session.post.call_args
-    body = call_args[1]["json"]
+    body = json.loads(call_args[1]["content"])
     assert body["most_communication_id"] == "most-xyz789"
     assert body["source_entity_id"] == "ent-1"
     assert body["custom_flag"] is True
@@ -0,0 +1,75 @@
+import threading
+
+import httpx
+import pytest
+
+from most.rate_limit import RateLimiter, TokenBucket, endpoint_family
+from tests.conftest import make_client
+
+
+@pytest.mark.parametrize("url, family", [
+    ("/67239029570a08554fc1f5a6/audio/67239029570a08554fc1f5a7/model/most-x/apply", "apply"),
+    ("/67239029570a08554fc1f5a6/text/67239029570a08554fc1f5a7/model/most-x/apply_async", "apply"),
+    ("/67239029570a08554fc1f5a6/upload", "upload"),
+    ("/67239029570a08554fc1f5a6/upload_url", "upload"),
+    ("/67239029570a08554fc1f5a6/audio/search", "search"),
+    ("/67239029570a08554fc1f5a6/audio/count", "search"),
+    ("https://etl.the-most.ai/api/v1/communications", "etl"),
+    ("https://api-anon.the-most.ai/anonymize", "anonymize"),
+    ("/67239029570a08554fc1f5a6/audio/67239029570a08554fc1f5a7/tags", None),
+])
+def test_endpoint_family(url, family) -> None:
+    assert endpoint_family(url) == family
+
+
+def test_token_bucket_allows_burst_then_paces(clock) -> None:
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+    clock.now = 10.0
+    assert bucket.reserve() == 0.0
+
+
+def test_token_bucket_is_thread_safe(clock) -> None:
+    bucket = TokenBucket(rate=10, capacity=1, clock=clock)
+    waits = []
+
+    def worker():
+        for _ in range(100):
+            waits.append(bucket.reserve())
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 800 reservations at 10/s: the last one waits for 799 refills
+    assert max(waits) == pytest.approx(79.9)
+
+
+def test_rate_limiter_routes_by_family() -> None:
+    limiter = RateLimiter({"apply": 5}, default=TokenBucket(rate=100))
+
+    assert limiter.bucket_for("/c/audio/a/model/m/apply").rate == 5
+    assert limiter.bucket_for("/c/audio/a/tags").rate == 100
+    assert RateLimiter({"upload": 1}).bucket_for("/c/audio/a/tags") is None
+    with pytest.raises(ValueError):
+        RateLimiter({"uploads": 1})
+
+
+def test_clones_share_rate_limiter(monkeypatch: pytest.MonkeyPatch) -> None:
+    limiter = RateLimiter({"search": 1000})
+    acquired = []
+    monkeypatch.setattr(limiter.buckets["search"], "acquire", lambda: acquired.append(1))
+
+    client = make_client(lambda request: httpx.Response(200, json=[]), rate_limiter=limiter)
+
+    for model in [client.with_model("most-model-%d" % i) for i in range(3)]:
+        model.get_tags("67239029570a08554fc1f5a6")
+        model.request("POST", "/test_client_id/audio/count", json={})
+
+    assert acquired == [1, 1, 1]
@@ -1,3 +1,5 @@
+from dataclasses import replace
+
 import pytest
 
 from most.score_calculation import ScoreCalculation
@@ -146,3 +148,99 @@ def test_unmodify_single_returns_none_when_no_bound_matches() -> None:
     assert calc.unmodify_single("quality", "tone", 12, bound="upper") is None
     assert calc.unmodify_single("quality", "tone", 5, bound="lower") is None
     assert calc.unmodify_single("quality", "tone", 12, bound="strict") is None
+
+
+def test_modify_does_not_change_original_result() -> None:
+    calc = _build_score_calculation()
+    original = _build_result()
+
+    modified = calc.modify(original)
+
+    assert original.results[0].subcolumns[0].score == 0
+    assert original.results[1].subcolumns[0].score == 5
+    # unchanged subcolumns are shared with the original
+    assert modified.results[0].subcolumns[1] is original.results[0].subcolumns[1]
+
+
+def test_duplicate_mappings_keep_previous_semantics() -> None:
+    calc = ScoreCalculation(
+        score_mapping=[
+            ScriptScoreMapping(column="quality", subcolumn="tone", from_score=0, to_score=2),
+            ScriptScoreMapping(column="quality", subcolumn="tone", from_score=0, to_score=4),
+            ScriptScoreMapping(column="quality", subcolumn="tone", from_score=1, to_score=4),
+        ]
+    )
+    update = UpdateResult(column_name="quality", subcolumn_name="tone", score=0)
+
+    assert calc.modify(update).score == 4
+    assert calc.modify_single("quality", "tone", 0) == 2
+    assert calc.unmodify(replace(update, score=4)).score == 1
+    assert calc.unmodify_single("quality", "tone", 4) == 0
+    assert calc.unmodify_single("quality", "tone", 3, bound="upper") == 0
+    assert calc.unmodify_single("quality", "tone", 3, bound="lower") == 0
+
+
+def test_modify_many_and_unmodify_many() -> None:
+    calc = _build_score_calculation()
+    updates = [
+        UpdateResult(column_name="quality", subcolumn_name="tone", score=1),
+        UpdateResult(column_name="quality", subcolumn_name="tone", score=None),
+        None,
+    ]
+
+    modified = calc.modify_many([_build_result(), *updates])
+
+    assert modified[0].results[1].subcolumns[0].score == 7
+    assert [m.score if m else m for m in modified[1:]] == [3, None, None]
+    assert [u.score if u else u for u in calc.unmodify_many(modified[1:])] == [1, None, None]
+
+
+def test_modify_matrix_with_lists() -> None:
+    calc = _build_score_calculation()
+    columns = [("quality", "tone"), ("quality", "speed"), ("compliance", "script")]
+    scores = [[0, 4, 5], [1, None, 6]]
+
+    modified = calc.modify_matrix(columns, scores)
+
+    assert modified == [[2, 4, 7], [3, None, 6]]
+    assert calc.unmodify_matrix(columns, modified) == [[0, 4, 5], [1, None, 6]]
+    assert scores == [[0, 4, 5], [1, None, 6]]
+
+
+def test_modify_matrix_with_numpy() -> None:
+    np = pytest.importorskip("numpy")
+    calc = _build_score_calculation()
+    columns = [("quality", "tone"), ("quality", "speed"), ("compliance", "script")]
+    scores = np.array([[0, 4, 5], [1, np.nan, 6], [9, 4, -1]])
+
+    modified = calc.modify_matrix(columns, scores)
+
+    np.testing.assert_array_equal(modified, [[2, 4, 7], [3, np.nan, 6], [9, 4, -1]])
+    np.testing.assert_array_equal(calc.unmodify_matrix(columns, modified)[:2],
+                                  [[0, 4, 5], [1, np.nan, 6]])
+    assert scores[0, 0] == 0
+
+
+def test_modify_many_in_place() -> None:
+    calc = _build_score_calculation()
+    original = _build_result()
+
+    modified = calc.modify_many([original], copy=False)
+
+    assert modified[0] is original
+    assert original.results[0].subcolumns[0].score == 2
+    assert calc.unmodify_many(modified, copy=False)[0].results[0].subcolumns[0].score == 0
+
+
+def test_modify_many_in_place_leaves_shared_columns_alone() -> None:
+    calc = _build_score_calculation()
+    original = _build_result()
+    # without edits the copy shares every column with the original
+    shared = original.apply_edits(inplace=False)
+
+    modified = calc.modify_many([shared], copy=False)
+
+    assert modified[0] is shared
+    assert [c.subcolumns[0].score for c in shared.results] == [2, 7]
+    assert [c.subcolumns[0].score for c in original.results] == [0, 5]
+    assert shared.results[0].subcolumns[1] is original.results[0].subcolumns[1]
@@ -0,0 +1,95 @@
+import asyncio
+import math
+from datetime import datetime, timezone
+
+import pytest
+
+from most.score_matrix import ScoreMatrix
+from most.types import (
+    Column,
+    ColumnResult,
+    Result,
+    Script,
+    StoredAudioData,
+    SubcolumnResult,
+    objectid_from_datetime,
+)
+from most.views import view
+
+SCRIPT = Script(columns=[Column(name="Приветствие", subcolumns=["Имя", "Компания"]),
+                         Column(name="Итог", subcolumns=["Результат"])])
+
+
+def _result(i: int, created_at=None) -> Result:
+    return Result(id="r%d" % i,
+                  created_at=created_at,
+                  results=[ColumnResult(name="Итог", subcolumns=[SubcolumnResult(name="Результат", score=i)]),
+                           ColumnResult(name="Приветствие",
+                                        subcolumns=[SubcolumnResult(name="Компания", score=None),
+                                                    SubcolumnResult(name="Имя", score=i + 1),
+                                                    SubcolumnResult(name="Лишний", score=9)]),
+                           ColumnResult(name="Нет в скрипте", subcolumns=[SubcolumnResult(name="Имя", score=9)])])
+
+
+def test_results_follow_script_column_order() -> None:
+    created_at = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    matrix = ScoreMatrix.from_results([_result(1, created_at), Result(id="r2"), _result(3)], SCRIPT)
+
+    assert matrix.shape == (3, 3)
+    assert matrix.columns == [("Приветствие", "Имя"), ("Приветствие", "Компания"), ("Итог", "Результат")]
+    assert matrix.ids == ["r1", "r2", "r3"]
+    assert matrix.row(0) == [2, None, 1]
+    assert matrix.row(1) == [None, None, None]
+    assert matrix.column("Итог", "Результат") == [1, None, 3]
+    assert matrix.timestamps[0] == created_at.timestamp()
+    assert math.isnan(matrix.timestamps[1])
+    with pytest.raises(KeyError):
+        matrix.column("Итог", "Лишний")
+
+
+def test_stored_data_and_views_need_model_id() -> None:
+    created_at = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    item = StoredAudioData(id=objectid_from_datetime(created_at), url="https://cdn.test.ai/1.mp3",
+                           results={"model": _result(4).results})
+
+    with pytest.raises(ValueError):
+        ScoreMatrix.from_results([item], SCRIPT)
+
+    matrix = ScoreMatrix.from_results([item, view(item.to_dict(), StoredAudioData),
+                                       StoredAudioData(id="a2", url="https://cdn.test.ai/2.mp3")],
+                                      SCRIPT, model_id="model")
+    assert matrix.row(0) == matrix.row(1) == [5, None, 4]
+    assert matrix.row(2) == [None, None, None]
+    assert matrix.timestamps[0] == matrix.timestamps[1] == created_at.timestamp()
+
+
+def test_afrom_results() -> None:
+    async def results():
+        for i in range(3):
+            yield _result(i)
+
+    matrix = asyncio.run(ScoreMatrix.afrom_results(results(), SCRIPT))
+
+    assert matrix.column("Приветствие", "Имя") == [1, 2, 3]
+
+
+def test_to_numpy() -> None:
+    np = pytest.importorskip("numpy")
+    matrix = ScoreMatrix.from_results([_result(1), Result(id="r2")], SCRIPT)
+
+    scores, missing = matrix.to_numpy()
+
+    np.testing.assert_array_equal(np.ma.array(scores, mask=missing).filled(-1), [[2, -1, 1], [-1, -1, -1]])
+    matrix.append(_result(3))
+    assert matrix.shape == (3, 3)
+
+
+def test_write_parquet(tmp_path) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    matrix = ScoreMatrix.from_results([_result(1), Result(id="r2")], SCRIPT)
+
+    matrix.write_parquet(tmp_path / "scores.parquet")
+
+    table = pq.read_table(tmp_path / "scores.parquet")
+    assert table.column_names == ["id", "timestamp", "Приветствие/Имя", "Приветствие/Компания", "Итог/Результат"]
+    assert table.column("Приветствие/Имя").to_pylist() == [2, None]
@@ -0,0 +1,112 @@
+import asyncio
+import json
+from pathlib import Path
+
+import httpx
+
+from most.async_searcher import AsyncMostSearcher
+from most.search_cache import SearchCache
+from most.search_types import SearchParams, StoredInfoCondition, TagsCondition
+from most.searcher import MostSearcher
+from tests.conftest import FakeClock, MockServer
+
+
+class Server(MockServer):
+    def answer(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/count"):
+            return httpx.Response(200, json=len(self.requests))
+        if request.url.path.endswith("/distinct"):
+            return httpx.Response(200, json=[request.url.params["key"], str(len(self.requests))])
+        return httpx.Response(200, json={"id": "65b0a7600000000000000000", "url": "https://cdn.test.ai/1.mp3"})
+
+    def reads(self) -> int:
+        return sum(request.method == "GET" for request in self.requests)
+
+
+def test_count_and_distinct_are_cached_by_canonical_filter() -> None:
+    server = Server()
+    searcher = MostSearcher(server.sync_client(search_cache=SearchCache()), "audio")
+    filter = SearchParams(must=[StoredInfoCondition(key="manager", match="Иван"), TagsCondition(in_set=["sales"])])
+    same = SearchParams(must=list(reversed(filter.must)))
+
+    assert searcher.count(filter) == searcher.count(same) == 1
+    assert searcher.count() == 2
+    assert searcher.distinct("manager", filter) == searcher.distinct("manager", same) == ["manager", "3"]
+    assert searcher.distinct("branch", filter) == ["branch", "4"]
+    assert MostSearcher(searcher.client, "text").count(filter) == 5
+    assert server.reads() == 5
+
+    searcher.distinct("manager", filter).append("mutated")
+    assert searcher.distinct("manager", filter) == ["manager", "3"]
+
+
+def test_entries_expire_and_are_evicted() -> None:
+    server = Server()
+    clock = FakeClock(1000.0)
+    searcher = MostSearcher(server.sync_client(search_cache=SearchCache(maxsize=2, ttl=10, clock=clock)), "audio")
+    filters = [SearchParams(must=[TagsCondition(in_set=[str(i)])]) for i in range(3)]
+
+    searcher.count(filters[0])
+    clock.now += 9
+    searcher.count(filters[0])
+    assert server.reads() == 1
+    clock.now += 1
+    searcher.count(filters[0])
+    assert server.reads() == 2
+
+    searcher.count(filters[1])
+    searcher.count(filters[2])
+    assert len(searcher.client.search_cache.entries) == 2
+    searcher.count(filters[0])
+    assert server.reads() == 5
+
+
+def test_local_writes_invalidate_client_entries() -> None:
+    server = Server()
+    cache = SearchCache()
+    client = server.sync_client(search_cache=cache)
+    searcher = MostSearcher(client, "audio")
+    other = MostSearcher(server.sync_client(search_cache=cache), "audio")
+    other.client.client_id = "other_client_id"
+
+    searcher.count()
+    other.count()
+    client.store_info("65b0a7600000000000000000", {"manager": "Иван"})
+    assert len(cache.entries) == 1
+    searcher.count()
+    client.clone().add_tags("65b0a7600000000000000000", "sales")
+    searcher.count()
+    other.count()
+    assert server.reads() == 4
+
+
+def test_disk_cache_outlives_process(tmp_path: Path) -> None:
+    clock = FakeClock(1000.0)
+    path = tmp_path / "search_cache.sqlite"
+    server = Server()
+    MostSearcher(server.sync_client(search_cache=SearchCache(path=path, clock=clock)), "audio").distinct("manager")
+
+    cache = SearchCache(path=path, clock=clock)
+    searcher = MostSearcher(server.sync_client(search_cache=cache), "audio")
+    assert searcher.distinct("manager") == ["manager", "1"]
+    assert server.reads() == 1
+
+    cache.invalidate("test_client_id")
+    assert SearchCache(path=path, clock=clock).get(
+        SearchCache.key("test_client_id", "audio", "distinct", SearchParams(), "manager")) is None
+    assert json.loads(json.dumps(searcher.distinct("manager"))) == ["manager", "2"]
+    cache.close()
+
+
+def test_async_searcher_uses_cache() -> None:
+    server = Server()
+    client = server.async_client(search_cache=SearchCache())
+    searcher = AsyncMostSearcher(client, "audio")
+
+    async def run():
+        counts = [await searcher.count(), await searcher.count()]
+        await client.store_text_info("65b0a7600000000000000000", {"manager": "Иван"})
+        counts.append(await searcher.count())
+        return counts
+
+    assert asyncio.run(run()) == [1, 1, 3]
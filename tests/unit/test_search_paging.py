@@ -0,0 +1,137 @@
+import asyncio
+import json
+import operator
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from most.async_searcher import AsyncMostSearcher
+from most.search_types import IDCondition, SearchParams, StoredInfoCondition, shard_by_id
+from most.searcher import MostSearcher
+from tests.conftest import MockServer
+
+# hourly objects from 2023-11-14
+IDS = ["%08x%016x" % (1700000000 + 3600 * i, i) for i in range(250)]
+ID_OPERATORS = {"greater_than": operator.gt, "not_less_than": operator.ge, "less_than": operator.lt}
+
+
+class SearchServer(MockServer):
+    """
+    /audio/search over IDS, sorted by id, honouring IDCondition ranges.
+    """
+    @property
+    def filters(self):
+        return [json.loads(request.url.params["filter"]) for request in self.requests]
+
+    def answer(self, request: httpx.Request) -> httpx.Response:
+        filter = json.loads(request.url.params["filter"])
+        limit = int(request.url.params["limit"])
+        bounds = [(ID_OPERATORS[key], value) for cond in filter["must"] if cond["type"] == "IDCondition"
+                  for key, value in cond.items() if key in ID_OPERATORS and value is not None]
+        ids = [i for i in IDS if all(op(i, value) for op, value in bounds)][:limit]
+        return httpx.Response(200, json=[{"id": i, "url": "https://cdn.test.ai/%s.mp3" % i} for i in ids])
+
+
+@pytest.mark.parametrize("page_size", [1, 50, 100, 250, 1000])
+def test_iter_search_walks_all_pages(page_size) -> None:
+    server = SearchServer()
+    searcher = MostSearcher(server.sync_client(), "audio")
+    filter = SearchParams(must=[StoredInfoCondition(key="manager", match="Иван")])
+
+    ids = [audio.id for audio in searcher.iter_search(filter, page_size=page_size)]
+
+    assert ids == IDS
+    assert len(server.requests) == len(IDS) // page_size + 1
+    assert all({"key": "manager", "match": "Иван", "type": "StoredInfoCondition"} in request["must"]
+               for request in server.filters)
+    assert filter.must == [StoredInfoCondition(key="manager", match="Иван")]
+
+
+def test_iter_search_stops_early() -> None:
+    server = SearchServer()
+    searcher = MostSearcher(server.sync_client(), "audio")
+
+    for i, audio in enumerate(searcher.iter_search(page_size=10, raw=True)):
+        if i == 14:
+            break
+
+    assert audio.id == IDS[14]
+    # second page was being consumed, the third one was prefetched at most
+    assert len(server.requests) <= 3
+
+
+def test_iter_search_requires_ordered_pages() -> None:
+    server = SearchServer()
+    server.answer = lambda request: httpx.Response(200, json=[{"id": IDS[0], "url": ""}])
+    searcher = MostSearcher(server.sync_client(), "audio")
+
+    with pytest.raises(RuntimeError, match="not ordered"):
+        list(searcher.iter_search(page_size=1))
+
+
+def test_aiter_search_walks_all_pages() -> None:
+    server = SearchServer()
+    searcher = AsyncMostSearcher(server.async_client(), "audio")
+
+    async def collect():
+        return [audio.id async for audio in searcher.aiter_search(SearchParams(must=[StoredInfoCondition(key="manager")]),
+                                                                   page_size=30)]
+
+    ids = asyncio.run(collect())
+
+    assert ids == IDS
+    assert len(server.requests) == len(IDS) // 30 + 1
+
+
+def test_shard_by_id_covers_id_space() -> None:
+    filter = SearchParams(must=[StoredInfoCondition(key="manager")])
+    since = datetime(2023, 11, 14, tzinfo=timezone.utc)
+    until = datetime(2023, 11, 24, tzinfo=timezone.utc)
+
+    shards = shard_by_id(filter, since, until, 4)
+
+    ranges = [shard.must[-1] for shard in shards]
+    assert all(shard.must[0] == filter.must[0] for shard in shards)
+    assert ranges[0].not_less_than is None and ranges[-1].less_than is None
+    assert [r.less_than for r in ranges[:-1]] == [r.not_less_than for r in ranges[1:]]
+    assert shard_by_id(filter, since, until, 1) == [filter]
+    assert len(shard_by_id(filter, since, since, 4)) == 2
+    with pytest.raises(ValueError):
+        shard_by_id(filter, since, until, 0)
+
+
+@pytest.mark.parametrize("ordered", [False, True])
+def test_ascan_returns_every_object_once(ordered) -> None:
+    server = SearchServer(latency=0.01)
+    searcher = AsyncMostSearcher(server.async_client(), "audio")
+
+    async def collect():
+        return [audio.id async for audio in searcher.ascan(shards=5, page_size=10, ordered=ordered)]
+
+    ids = asyncio.run(collect())
+
+    assert sorted(ids) == IDS
+    if ordered:
+        assert ids == IDS
+    assert server.max_in_flight >= 3
+
+
+def test_ascan_propagates_shard_errors() -> None:
+    server = SearchServer()
+    answer = server.answer
+
+    def failing(request):
+        if "not_less_than" in request.url.params["filter"]:
+            return httpx.Response(400, json={"detail": "bad shard"})
+        return answer(request)
+
+    server.answer = failing
+    searcher = AsyncMostSearcher(server.async_client(), "audio")
+
+    async def collect():
+        return [audio async for audio in searcher.ascan(filter=SearchParams(must=[IDCondition(less_than=IDS[-1])]),
+                                                         shards=3, page_size=10)]
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(collect())
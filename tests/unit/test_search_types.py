@@ -0,0 +1,78 @@
+import hashlib
+import json
+
+from most.search_types import (
+    AggregatedAllField,
+    AggregatedField,
+    AggregatedResultsCondition,
+    IDCondition,
+    ResultsCondition,
+    SearchParams,
+    StoredInfoCondition,
+    TagsCondition,
+)
+
+
+def without_none(value):
+    if isinstance(value, dict):
+        return {key: without_none(v) for key, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [without_none(v) for v in value]
+    return value
+
+
+def make_filter() -> SearchParams:
+    return SearchParams(must=[StoredInfoCondition(key="manager", match="Иван"),
+                              ResultsCondition(column_idx=1, subcolumn_idx=2, model_id="m", score_greater_than=2),
+                              AggregatedResultsCondition(fields=[AggregatedField(column_idx=1, subcolumn_idx=2),
+                                                                 AggregatedAllField()],
+                                                         model_id="m", greater_than=3)],
+                        must_not=[TagsCondition(in_set=["b", "a"])])
+
+
+def test_canonical_json_matches_to_json_without_nones() -> None:
+    filter = make_filter()
+
+    canonical = json.loads(filter.canonical_json())
+    expected = without_none(json.loads(filter.to_json()))
+
+    for clause in ("must", "should", "must_not", "should_not"):
+        assert sorted(json.dumps(c, sort_keys=True) for c in canonical[clause]) == \
+            sorted(json.dumps(c, sort_keys=True) for c in expected[clause])
+    assert canonical["must_not"] == [{"in_set": ["b", "a"], "type": "TagsCondition"}]
+
+
+def test_condition_order_and_duplicates_do_not_matter() -> None:
+    filter = make_filter()
+    shuffled = make_filter()
+    shuffled.must = list(reversed(shuffled.must)) + [StoredInfoCondition(key="manager", match="Иван")]
+
+    assert shuffled.canonical() == filter.canonical()
+    assert shuffled.canonical_json() == filter.canonical_json()
+    assert shuffled.cache_key() == filter.cache_key()
+
+
+def test_cache_key_distinguishes_filters() -> None:
+    filter = make_filter()
+    key = filter.cache_key()
+
+    filter.must.append(IDCondition(greater_than="65b0a7600000000000000000"))
+    assert filter.cache_key() != key
+    assert make_filter().cache_key() == key
+    assert SearchParams(should=make_filter().must).cache_key() != SearchParams(must=make_filter().must).cache_key()
+
+
+def test_scalar_types_are_distinguished() -> None:
+    filters = [SearchParams(must=[StoredInfoCondition(key="flag", match=value)]) for value in (True, 1, 1.0)]
+
+    assert len({f.canonical() for f in filters}) == 3
+    assert [json.loads(f.canonical_json())["must"][0]["match"] for f in filters] == [True, 1, 1.0]
+    assert [type(json.loads(f.canonical_json())["must"][0]["match"]) for f in filters] == [bool, int, float]
+    assert len({f.cache_key() for f in filters}) == 3
+
+
+def test_cache_key_is_stable() -> None:
+    empty = '{"must":[],"must_not":[],"should":[],"should_not":[]}'
+
+    assert SearchParams().canonical_json() == empty
+    assert SearchParams().cache_key() == hashlib.sha256(empty.encode()).hexdigest()
@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import Mock
+
+import httpx
+import pytest
+
+from most.badge import Badge
+from most.transport import (
+    RetryPolicy,
+    TransportConfig,
+    parse_retry_after,
+    raise_for_api_error,
+    raise_for_etl_error,
+)
+from tests.conftest import make_client
+
+
+def _response(status_code, json_data=None, content=b""):
+    resp = Mock(spec=httpx.Response)
+    resp.status_code = status_code
+    resp.headers = {"Content-Type": "application/json"} if json_data is not None else {}
+    resp.json.return_value = json_data
+    resp.content = content
+    return resp
+
+
+def test_build_client_applies_pool_limits() -> None:
+    limits = httpx.Limits(max_connections=7, max_keepalive_connections=3, keepalive_expiry=11.0)
+    config = TransportConfig(limits=limits, max_retries=1)
+
+    client = config.build_client("https://api.test.ai")
+    try:
+        pool = client._transport._pool
+        assert pool._max_connections == 7
+        assert pool._max_keepalive_connections == 3
+        assert pool._keepalive_expiry == 11.0
+        assert pool._retries == 1
+    finally:
+        client.close()
+
+
+def test_http2_mode_is_passed_to_transports() -> None:
+    pytest.importorskip("h2")
+    config = TransportConfig(http2=True)
+
+    client = config.build_client("https://api.test.ai")
+    async_client = config.build_async_client("https://api.test.ai")
+    badge = Badge("sn", "key", http2=True)
+    try:
+        assert client._transport._pool._http2
+        assert async_client._transport._pool._http2
+        assert badge.session._transport._pool._http2
+        assert not TransportConfig().build_client("https://api.test.ai")._transport._pool._http2
+    finally:
+        client.close()
+        badge.session.close()
+
+
+def test_raise_for_api_error_uses_message() -> None:
+    raise_for_api_error(_response(200, {"ok": True}))
+    with pytest.raises(RuntimeError, match="boom"):
+        raise_for_api_error(_response(500, {"message": "boom"}))
+    with pytest.raises(RuntimeError, match="Something went wrong"):
+        raise_for_api_error(_response(502))
+
+
+def test_raise_for_etl_error_formats_validation_details() -> None:
+    resp = _response(422, {"detail": [{"loc": ["body", "manager"], "msg": "field required"}]})
+    with pytest.raises(RuntimeError, match=r"Validation error: \['body', 'manager'\]: field required"):
+        raise_for_etl_error(resp, detail_prefix="Validation error: ")
+
+    resp = _response(403, {"detail": "Client is not registered"})
+    with pytest.raises(RuntimeError, match="^Client is not registered$"):
+        raise_for_etl_error(resp, detail_prefix="Validation error: ")
+
+    with pytest.raises(RuntimeError, match="HTTP 504"):
+        raise_for_etl_error(_response(504))
+
+
+def test_retry_policy_retries_only_idempotent_requests() -> None:
+    policy = RetryPolicy(max_retries=2)
+
+    assert policy.should_retry("GET", _response(429), attempt=0)
+    assert policy.should_retry("PUT", _response(503), attempt=1)
+    assert not policy.should_retry("GET", _response(503), attempt=2)
+    assert not policy.should_retry("GET", _response(500), attempt=0)
+    assert not policy.should_retry("POST", _response(429), attempt=0)
+    assert policy.should_retry("POST", _response(429), attempt=0, idempotent=True)
+
+
+def test_retry_delay_honors_retry_after() -> None:
+    policy = RetryPolicy(delay=1.0, max_delay=30.0)
+
+    resp = _response(429)
+    resp.headers = {"Retry-After": "7"}
+    assert policy.get_delay(0, resp) == 7.0
+    resp.headers = {"Retry-After": "3600"}
+    assert policy.get_delay(0, resp) == 30.0
+
+    for attempt in range(6):
+        assert 0 <= policy.get_delay(attempt, _response(503)) <= min(30.0, 2 ** attempt)
+
+
+def test_parse_retry_after_http_date() -> None:
+    retry_at = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=120), usegmt=True)
+    assert parse_retry_after(retry_at) == pytest.approx(120, abs=2)
+    assert parse_retry_after("garbage") is None
+    assert parse_retry_after(None) is None
+
+
+def test_etl_upload_is_retried_after_throttling(monkeypatch) -> None:
+    delays = []
+    monkeypatch.setattr("most.api.time.sleep", delays.append)
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if len(calls) < 3:
+            return httpx.Response(429, headers={"Retry-After": "2"})
+        if request.url.path.endswith("/communications"):
+            return httpx.Response(200, json={"status_per_communication": {}, "total_saved": 0})
+        return httpx.Response(503, json={"detail": "Prefect is down"})
+
+    client = make_client(handler, etl_base_url="https://etl.test.ai")
+
+    assert client.upload_communications([]).total_saved == 0
+    assert delays == [2.0, 2.0]
+
+    # not idempotent: a 503 from the n8n hook is not repeated
+    calls.clear()
+    calls.extend(["-", "-"])
+    with pytest.raises(RuntimeError, match="Prefect"):
+        client.process_communication_by_id("most-abc123")
+    assert len(calls) == 3
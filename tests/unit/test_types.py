@@ -0,0 +1,128 @@
+import copy
+import pickle
+import random
+
+import pytest
+from dataclasses_json import DataClassJsonMixin
+
+from most.types import (
+    ColumnResult,
+    DialogSegment,
+    Result,
+    StoredAudioData,
+    StoredTextData,
+    SubcolumnResult,
+    UpdateResult,
+)
+
+
+def _result() -> Result:
+    return Result(id="r1",
+                  results=[ColumnResult(name="Приветствие",
+                                        subcolumns=[SubcolumnResult(name="Назвал имя", score=1)])],
+                  edits=[UpdateResult(column_name="Приветствие", subcolumn_name="Назвал имя",
+                                      score=5, timestamp=1)])
+
+
+@pytest.mark.parametrize("obj", [
+    _result(),
+    StoredAudioData(id="a1", url="https://cdn.test.ai/a1.mp3", data={"manager": "Иван"}),
+    StoredTextData(id="t1"),
+    DialogSegment(start_time_ms=0, end_time_ms=900, text="Алло", speaker="Оператор"),
+])
+def test_result_types_are_slotted(obj) -> None:
+    assert not hasattr(obj, "__dict__")
+    assert isinstance(obj, DataClassJsonMixin)
+    assert type(obj).from_dict(obj.to_dict()) == obj
+    assert type(obj).from_json(obj.to_json()) == obj
+    assert pickle.loads(pickle.dumps(obj)) == obj
+    with pytest.raises(AttributeError):
+        obj.unknown_attribute = 1
+
+
+def test_apply_edits_on_slotted_result() -> None:
+    result = _result()
+    edited = result.apply_edits(inplace=False)
+
+    assert edited.results[0].subcolumns[0].score == 5
+    assert result.results[0].subcolumns[0].score == 1
+    assert copy.deepcopy(edited) == edited
+
+
+def _apply_edits_by_scan(result: Result) -> Result:
+    # previous implementation: linear search for every edit
+    result = copy.deepcopy(result)
+    for edit in sorted(result.edits, key=lambda x: x.timestamp):
+        column = next((c for c in result.results if c.name == edit.column_name), None)
+        if column is None:
+            continue
+        subcolumn = next((s for s in column.subcolumns if s.name == edit.subcolumn_name), None)
+        if subcolumn is None:
+            continue
+        if edit.score is not None:
+            subcolumn.score = edit.score
+        if edit.description is not None:
+            subcolumn.description = edit.description
+    result.edits = None
+    return result
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_apply_edits_matches_linear_scan(seed) -> None:
+    rng = random.Random(seed)
+    names = ["a", "b", "c", "a"]  # duplicated names: the first one is edited
+    result = Result(id="r1",
+                    results=[ColumnResult(name=column,
+                                          subcolumns=[SubcolumnResult(name=subcolumn, score=0)
+                                                      for subcolumn in names])
+                             for column in names],
+                    edits=[UpdateResult(column_name=rng.choice(names + ["missing"]),
+                                        subcolumn_name=rng.choice(names + ["missing"]),
+                                        score=rng.choice([None, 1, 2, 3]),
+                                        description=rng.choice([None, "x", "y"]),
+                                        timestamp=rng.randint(0, 10))
+                           for _ in range(50)])
+    original = copy.deepcopy(result)
+
+    expected = _apply_edits_by_scan(result)
+
+    assert result.apply_edits(inplace=False) == expected
+    assert result == original
+    assert result.apply_edits() == expected
+    assert result.edits is None
+
+
+def test_apply_edits_copy_shares_unedited_columns() -> None:
+    result = _result()
+    result.results.append(ColumnResult(name="Прощание", subcolumns=[SubcolumnResult(name="Попрощался", score=0)]))
+
+    edited = result.apply_edits(inplace=False)
+
+    assert edited is not result
+    assert edited.results is not result.results
+    assert edited.results[1] is result.results[1]
+    assert result.edits is not None
+
+
+def test_apply_edits_many() -> None:
+    results = [_result(), Result(id="r2"), _result()]
+
+    edited = Result.apply_edits_many(results, inplace=False)
+
+    assert [r.results[0].subcolumns[0].score if r.results else None for r in edited] == [5, None, 5]
+    assert results[0].results[0].subcolumns[0].score == 1
+    with pytest.raises(TypeError):
+        Result.apply_edits_many(results)
+    assert Result.apply_edits_many(results, inplace=True) == edited
+    assert results[0].results[0].subcolumns[0].score == 5
+
+
+def test_apply_edits_in_place_leaves_shared_columns_alone() -> None:
+    result = _result()
+    shared = copy.copy(result)
+
+    shared.apply_edits()
+
+    assert shared.results[0].subcolumns[0].score == 5
+    assert result.results[0].subcolumns[0].score == 1
+    assert result.edits is not None
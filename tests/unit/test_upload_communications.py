@@ -1,3 +1,4 @@
+import json
 from unittest.mock import Mock, patch
 import pytest
 import httpx
@@ -202,7 +203,7 @@ def test_upload_communications_with_overwrite(mock_client):
 
     # Проверяем, что overwrite был передан в запросе
     call_args = mock_client.session.post.call_args
-    request_data = call_args[1]["json"]
+    request_data = json.loads(call_args[1]["content"])
     assert request_data["overwrite"] is True
 
 
@@ -359,7 +360,7 @@ def test_upload_communications_with_optional_fields(mock_client):
     assert result.total_saved == 1
     # Проверяем, что опциональные поля были переданы
     call_args = mock_client.session.post.call_args
-    request_data = call_args[1]["json"]
+    request_data = json.loads(call_args[1]["content"])
     comm_data = request_data["communications"][0]
     assert comm_data["client_phone"] == "+79991234567"
     assert comm_data["wait_duration"] == 30
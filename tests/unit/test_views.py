@@ -0,0 +1,97 @@
+from datetime import datetime
+from typing import List
+
+import httpx
+import pytest
+
+from most.decoders import decode
+from most.types import DialogResult, Result, StoredAudioData, StoredTextData
+from most.views import ListView, View, view
+from tests.conftest import make_client
+
+
+RESULT = {"id": "67239029570a08554fc1f5a6",
+          "created_at": 1700000000,
+          "results": [{"name": "Приветствие",
+                       "subcolumns": [{"name": "Назвал имя", "score": 3},
+                                      {"name": "Назвал компанию", "score": "1", "description": "ok"}]}]}
+
+
+def test_view_decodes_fields_on_access() -> None:
+    result = view(RESULT, Result)
+
+    assert isinstance(result, View)
+    assert result._cache is None
+    assert result.id == "67239029570a08554fc1f5a6"
+    assert isinstance(result.results, ListView)
+    assert result.results[0].subcolumns[1].score == 1
+    assert result.results[0].subcolumns[1].description == "ok"
+    assert result.results[0].subcolumns[0].description == ""
+    assert isinstance(result.created_at, datetime)
+    assert result.text is None
+    assert result.results is result.results
+
+    assert result.materialize() == decode(RESULT, Result)
+    assert result.get_script() == decode(RESULT, Result).get_script()
+
+
+def test_view_is_read_only() -> None:
+    result = view(RESULT, Result)
+    with pytest.raises(AttributeError, match="read-only"):
+        result.id = "x"
+    edited = view({**RESULT, "edits": [{"column_name": "Приветствие", "subcolumn_name": "Назвал имя",
+                                        "score": 5, "timestamp": 1}]}, Result)
+    with pytest.raises(AttributeError, match="read-only"):
+        edited.apply_edits()
+    assert edited.materialize().apply_edits().results[0].subcolumns[0].score == 5
+    with pytest.raises(AttributeError):
+        view({}, Result).id
+
+
+def test_dialog_view_methods() -> None:
+    data = {"id": "d", "dialog": {"segments": [{"start_time_ms": 0, "end_time_ms": 10, "text": "Алло", "speaker": "A"},
+                                               {"start_time_ms": 10, "end_time_ms": 20, "text": "Да", "speaker": "B"}]}}
+    dialog = view(data, DialogResult).dialog
+
+    assert dialog.to_text() == decode(data, DialogResult).dialog.to_text()
+    assert sorted(dialog.get_speaker_names()) == ["A", "B"]
+
+
+def test_search_union_view() -> None:
+    data = [{"id": "a", "url": "https://cdn.test.ai/a.mp3", "results": {"most-model": RESULT["results"]}},
+            {"id": "t", "url": None}]
+    items = view(data, List[StoredAudioData | StoredTextData])
+
+    assert [item._type for item in items] == [StoredAudioData, StoredTextData]
+    assert items[0].results["most-model"][0].subcolumns[0].score == 3
+    assert items.materialize() == decode(data, List[StoredAudioData | StoredTextData])
+
+
+def test_client_raw_mode() -> None:
+    client = make_client(lambda request: httpx.Response(200, json=RESULT),
+                         model_id="most-67239029570a08554fc1f5a7")
+
+    assert type(client.fetch_results(RESULT["id"])) is Result
+    assert isinstance(client.fetch_results(RESULT["id"], raw=True), View)
+
+    raw_client = client.clone()
+    raw_client.raw = True
+    assert isinstance(raw_client.fetch_results(RESULT["id"]), View)
+    assert type(raw_client.fetch_results(RESULT["id"], raw=False)) is Result
+    assert client.raw is False
+
+
+def test_modified_results_are_never_views() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/score_mapping"):
+            return httpx.Response(200, json=[{"column": "Приветствие", "subcolumn": "Назвал имя",
+                                              "from_score": 3, "to_score": 5}])
+        return httpx.Response(200, json=RESULT)
+
+    client = make_client(handler, model_id="most-67239029570a08554fc1f5a7")
+    client.raw = True
+
+    result = client.fetch_results(RESULT["id"], modify_scores=True, raw=True)
+
+    assert type(result) is Result
+    assert [s.score for s in result.results[0].subcolumns] == [5, 1]